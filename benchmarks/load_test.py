@@ -0,0 +1,553 @@
+"""
+Нагрузочный прогон игровых сервисов скриптовыми ботами.
+
+Боты играют через сервисы без UI: детективные комнаты (GameRoomManagement:
+вход в комнату и перемещения по локациям) и комнаты мини-игр (вход,
+готовность, голосование в Шпионе, описания и голосование в Хамелеоне,
+подсказки и угадывание в Codenames, пары в Лучших парах). Комнаты играются
+одновременно, каждый бот действует со своим временем на обдумывание.
+
+Прогон идёт во временном рабочем каталоге (копия файлов контента), поэтому
+данные репозитория не затрагиваются. По умолчанию операции выполняются в
+цикле событий, как в обработчиках NiceGUI; с --workers N - в пуле потоков,
+что показывает потерянные обновления при одновременной записи файлов.
+
+Отчёт: перцентили задержек по операциям, пропускная способность, ошибки,
+потерянные обновления (успешные записи, которых нет в итоговом состоянии)
+и рост файлов и базы логов.
+
+Запуск из корня репозитория:
+    python -m benchmarks.load_test --rooms 50 --players 6 --think 0.05
+    python -m benchmarks.load_test --games codenames --rooms 200 --workers 8 --json load.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+GAMES = ('detective', 'spy', 'chameleon', 'codenames', 'best_pairs')
+CONTENT_FILES = (
+    'src/minigame/spy/categories.json',
+    'src/minigame/chameleon/categories.json',
+    'src/minigame/codenames/emoji.json',
+    'src/minigame/best_pairs/best_pairs_data.json',
+)
+
+
+class BotRequest:
+    """Минимальный запрос с сессией: сервисы читают app.storage.user вне страницы."""
+
+    def __init__(self, session_id):
+        self.session = {'id': session_id}
+
+
+def enter_bot_session(bot_id):
+    """Подставляет боту собственную пользовательскую сессию NiceGUI в текущем контексте."""
+    from nicegui import app
+    from nicegui.storage import request_contextvar
+
+    session_id = f'load-{bot_id}'
+    app.storage._users.setdefault(session_id, {'user_id': bot_id})
+    request_contextvar.set(BotRequest(session_id))
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[index]
+
+
+class LoadMetrics:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.failures = Counter()
+        self.errors = Counter()
+        self.error_samples = {}
+        self.lost_updates = Counter()
+
+    def record(self, op, seconds, ok):
+        self.latencies[op].append(seconds)
+        if not ok:
+            self.failures[op] += 1
+
+    def record_error(self, op, seconds, error):
+        self.latencies[op].append(seconds)
+        self.errors[op] += 1
+        self.error_samples.setdefault(op, f'{type(error).__name__}: {error}')
+
+    def lost(self, game, count):
+        if count > 0:
+            self.lost_updates[game] += count
+
+    def report(self, elapsed):
+        operations = {}
+        for op in sorted(self.latencies):
+            values = sorted(self.latencies[op])
+            operations[op] = {
+                'count': len(values),
+                'failed': self.failures[op],
+                'errors': self.errors[op],
+                'p50_ms': round(percentile(values, 50) * 1000, 3),
+                'p90_ms': round(percentile(values, 90) * 1000, 3),
+                'p99_ms': round(percentile(values, 99) * 1000, 3),
+                'max_ms': round(values[-1] * 1000, 3),
+            }
+        total = sum(len(values) for values in self.latencies.values())
+        return {
+            'elapsed_s': round(elapsed, 3),
+            'operations_total': total,
+            'throughput_ops_s': round(total / elapsed, 1) if elapsed else 0.0,
+            'errors_total': sum(self.errors.values()),
+            'failed_total': sum(self.failures.values()),
+            'lost_updates': dict(self.lost_updates),
+            'error_samples': self.error_samples,
+            'operations': operations,
+        }
+
+
+class LoadRunner:
+    """Сценарии ботов для каждой игры."""
+
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.metrics = LoadMetrics()
+        self.threaded = args.workers > 0
+        self.services = {}
+
+    def setup(self, games):
+        from src.game.game_room_management import GameRoomManagement
+        from src.minigame.best_pairs.best_pairs_data_service import BestPairsDataService
+        from src.minigame.best_pairs.best_pairs_room_service import BestPairsRoomService
+        from src.minigame.chameleon.chameleon_data_service import ChameleonDataService
+        from src.minigame.chameleon.chameleon_room_service import ChameleonRoomService
+        from src.minigame.codenames.codenames_data_service import CodenamesDataService
+        from src.minigame.codenames.codenames_room_service import CodenamesRoomService
+        from src.minigame.spy.spy_data_service import SpyDataService
+        from src.minigame.spy.spy_room_service import SpyRoomService
+
+        in_memory = True if self.args.in_memory else None
+        factories = {
+            'detective': lambda: (GameRoomManagement(), None),
+            'spy': lambda: (SpyRoomService(in_memory=in_memory), SpyDataService()),
+            'chameleon': lambda: (ChameleonRoomService(in_memory=in_memory), ChameleonDataService()),
+            'codenames': lambda: (CodenamesRoomService(in_memory=in_memory), CodenamesDataService()),
+            'best_pairs': lambda: (BestPairsRoomService(in_memory=in_memory), BestPairsDataService()),
+        }
+        for game in games:
+            self.services[game] = factories[game]()
+
+    def bots(self, game, room_index):
+        return [f'{game}-{room_index}-{n}' for n in range(self.args.players)]
+
+    async def think(self):
+        if self.args.think > 0:
+            await asyncio.sleep(self.rng.expovariate(1 / self.args.think))
+        else:
+            await asyncio.sleep(0)
+
+    async def op(self, name, fn, *args):
+        """Выполняет операцию сервиса и записывает её задержку."""
+        start = time.perf_counter()
+        try:
+            if self.threaded:
+                result = await asyncio.to_thread(fn, *args)
+            else:
+                result = fn(*args)
+        except Exception as e:
+            self.metrics.record_error(name, time.perf_counter() - start, e)
+            return None
+        self.metrics.record(name, time.perf_counter() - start, result is not False and result is not None)
+        return result
+
+    async def each(self, bot_ids, action):
+        """
+        Все боты выполняют действие одновременно.
+
+        :return: Список ботов, у которых действие прошло успешно
+        """
+        async def run(bot_id):
+            enter_bot_session(bot_id)
+            await self.think()
+            result = await action(bot_id)
+            return bot_id if result not in (False, None) else None
+
+        results = await asyncio.gather(*(run(bot_id) for bot_id in bot_ids))
+        return [bot_id for bot_id in results if bot_id is not None]
+
+    async def poll(self, game, room_id):
+        service, _ = self.services[game]
+        return await self.op(f'{game}.poll', service.get_room, room_id) or {}
+
+    async def join(self, game, room_id, bot_ids):
+        service, _ = self.services[game]
+        joined = await self.each(bot_ids, lambda bot_id: self.op(
+            f'{game}.join', service.add_player, room_id, bot_id, f'Бот {bot_id}'))
+        room = await self.poll(game, room_id)
+        present = {player['id'] for player in room.get('players', [])}
+        self.metrics.lost(game, len(set(joined) - present))
+        return joined
+
+    async def create(self, game, host):
+        service, _ = self.services[game]
+        enter_bot_session(host)
+        return await self.op(f'{game}.create', service.create_room, host, f'Бот {host}')
+
+    # --- Детектив ---
+
+    def seed_detective_rooms(self, rooms):
+        manager, _ = self.services['detective']
+        now = int(time.time())
+        data = manager.load()
+        for index in range(rooms):
+            data[f'load-{index}'] = {
+                'game_id': 'load-game', 'users': [], 'status': 'playing', 'last_visited_at': now,
+                'move': 0, 'location_history': [], 'current_location': None
+            }
+        manager.save(data)
+
+    async def detective_room(self, index):
+        manager, _ = self.services['detective']
+        room_id = f'load-{index}'
+        bot_ids = self.bots('detective', index)
+
+        async def enter(bot_id):
+            if await self.op('detective.join', manager.add_user_for_room, bot_id, room_id):
+                await self.op('detective.user_state', manager.update_user_game_state, bot_id, room_id)
+                return True
+            return False
+
+        joined = await self.each(bot_ids, enter)
+
+        travels = Counter()
+
+        async def travel(bot_id):
+            for _ in range(self.args.moves):
+                await self.think()
+                location_id = str(self.rng.randint(1, 300))
+                if await self.op('detective.travel', manager.add_location_to_history, room_id, location_id):
+                    travels[bot_id] += 1
+                await self.op('detective.poll', manager.get_game_state, room_id)
+            return True
+
+        await self.each(joined, travel)
+
+        room = await self.op('detective.poll', manager.get_game_state, room_id) or {}
+        self.metrics.lost('detective', len(joined) - len(set(room.get('users', [])) & set(joined)))
+        self.metrics.lost('detective', sum(travels.values()) - len(room.get('location_history', [])))
+
+    # --- Шпион ---
+
+    async def spy_room(self, index):
+        service, data = self.services['spy']
+        host, *players = self.bots('spy', index)
+        room_id = await self.create('spy', host)
+        if not room_id:
+            return
+        await self.join('spy', room_id, players)
+        await self.each(players, lambda bot_id: self.op('spy.ready', service.set_player_ready, room_id, bot_id))
+
+        for _ in range(self.args.rounds):
+            enter_bot_session(host)
+            decks = (await self.poll('spy', room_id)).get('decks', {})
+            category, location = data.get_random_category_and_location(decks)
+            await self.op('spy.start', service.start_game, room_id, category, location, decks)
+            await self.think()
+            await self.op('spy.voting', service.start_voting_round, room_id)
+
+            room = await self.poll('spy', room_id)
+            members = [player['id'] for player in room.get('players', [])]
+            voted = await self.each(members, lambda bot_id: self.op(
+                'spy.vote', service.add_vote, room_id, bot_id,
+                self.rng.choice([member for member in members if member != bot_id] or [bot_id])))
+            room = await self.poll('spy', room_id)
+            self.metrics.lost('spy', len(set(voted) - set(room.get('game_data', {}).get('votes', {}))))
+
+            enter_bot_session(host)
+            await self.op('spy.results', service.get_vote_results, room_id)
+            await self.op('spy.finish', service.finish_game, room_id)
+            await self.op('spy.reset', service.reset_game, room_id)
+
+    # --- Хамелеон ---
+
+    async def chameleon_room(self, index):
+        service, data = self.services['chameleon']
+        host, *players = self.bots('chameleon', index)
+        room_id = await self.create('chameleon', host)
+        if not room_id:
+            return
+        await self.join('chameleon', room_id, players)
+        await self.each(players, lambda bot_id: self.op(
+            'chameleon.ready', service.set_player_ready, room_id, bot_id))
+
+        for _ in range(self.args.rounds):
+            enter_bot_session(host)
+            decks = (await self.poll('chameleon', room_id)).get('decks', {})
+            category, word = data.get_random_category_and_word(decks)
+            await self.op('chameleon.start', service.start_game, room_id, category, word, None, decks)
+
+            room = await self.poll('chameleon', room_id)
+            members = [player['id'] for player in room.get('players', [])]
+            described = await self.each(members, lambda bot_id: self.op(
+                'chameleon.describe', service.add_description, room_id, bot_id, f'описание {bot_id}'))
+            room = await self.poll('chameleon', room_id)
+            recorded = {entry['player_id'] for entry in room.get('game_data', {}).get('descriptions', [])}
+            self.metrics.lost('chameleon', len(set(described) - recorded))
+
+            voted = await self.each(members, lambda bot_id: self.op(
+                'chameleon.vote', service.add_vote, room_id, bot_id,
+                self.rng.choice([member for member in members if member != bot_id] or [bot_id])))
+            room = await self.poll('chameleon', room_id)
+            self.metrics.lost('chameleon', len(set(voted) - set(room.get('game_data', {}).get('votes', {}))))
+
+            enter_bot_session(host)
+            await self.op('chameleon.results', service.get_vote_results, room_id)
+            await self.op('chameleon.finish', service.finish_game, room_id)
+            await self.op('chameleon.reset', service.reset_game, room_id)
+
+    # --- Codenames ---
+
+    async def codenames_room(self, index):
+        from src.minigame.codenames.codenames_board import CodenamesBoard
+        from src.services.rng_provider import RngProvider
+
+        service, data = self.services['codenames']
+        host, *players = self.bots('codenames', index)
+        room_id = await self.create('codenames', host)
+        if not room_id or not players:
+            return
+        await self.join('codenames', room_id, players)
+
+        # Второй капитан создаёт вторую команду, остальные расходятся по командам
+        enter_bot_session(players[0])
+        await self.op('codenames.team', service.join_team, room_id, players[0], '2', 'captain')
+        members = players[1:]
+        teamed = await self.each(members, lambda bot_id: self.op(
+            'codenames.team', service.join_team, room_id, bot_id, str(1 + members.index(bot_id) % 2), 'member'))
+        room = await self.poll('codenames', room_id)
+        in_teams = {member for team in room.get('teams', {}).values() for member in team.get('members', [])}
+        self.metrics.lost('codenames', len(set(teamed) - in_teams))
+
+        for _ in range(self.args.rounds):
+            enter_bot_session(host)
+            decks = room.get('decks', {})
+            field = data.generate_game_field(2, decks, RngProvider.for_room_content(room, 'field'))
+            await self.op('codenames.start', service.start_game, room_id, field, decks)
+
+            for _ in range(self.args.moves):
+                room = await self.poll('codenames', room_id)
+                if room.get('status') != 'playing':
+                    break
+                team_id = str(room['game_data']['current_team'])
+                team = room['teams'].get(team_id)
+                if not team:
+                    break
+                captain = team['captain']
+                guesser = (team['members'] or [captain])[0]
+
+                enter_bot_session(captain)
+                await self.think()
+                await self.op('codenames.hint', service.set_hint, room_id, captain, 'бот', 1)
+
+                room = await self.poll('codenames', room_id)
+                board = CodenamesBoard.of(room)
+                if not board:
+                    break
+                hidden = [i for i in range(len(board)) if not board.is_revealed(i)]
+                enter_bot_session(guesser)
+                await self.think()
+                await self.op('codenames.guess', service.make_guess, room_id, guesser, self.rng.choice(hidden))
+                room = await self.poll('codenames', room_id)
+                if room.get('status') == 'playing' and str(room['game_data']['current_team']) == team_id:
+                    await self.op('codenames.end_turn', service.end_turn, room_id, guesser)
+
+            enter_bot_session(host)
+            await self.op('codenames.finish', service.finish_game, room_id)
+            await self.op('codenames.reset', service.reset_game, room_id)
+            room = await self.poll('codenames', room_id)
+
+    # --- Лучшие пары ---
+
+    async def best_pairs_room(self, index):
+        service, data = self.services['best_pairs']
+        host, *players = self.bots('best_pairs', index)
+        room_id = await self.create('best_pairs', host)
+        if not room_id:
+            return
+        await self.join('best_pairs', room_id, players)
+        await self.each(players, lambda bot_id: self.op(
+            'best_pairs.ready', service.set_player_ready, room_id, bot_id, True))
+
+        for _ in range(self.args.rounds):
+            enter_bot_session(host)
+            decks = (await self.poll('best_pairs', room_id)).get('decks', {})
+            cards = data.get_random_cards(5, decks)
+            nouns, adjectives = cards['nouns'], cards['adjectives']
+            await self.op('best_pairs.start', service.start_round, room_id, nouns, adjectives, decks)
+
+            room = await self.poll('best_pairs', room_id)
+            round_host = room.get('game_data', {}).get('current_round_host')
+            enter_bot_session(round_host)
+            await self.think()
+            pairing = dict(zip(nouns, self.rng.sample(adjectives, len(adjectives))))
+            await self.op('best_pairs.pair', service.set_host_pairings, room_id, round_host, pairing)
+
+            guessers = [player['id'] for player in room.get('players', []) if player['id'] != round_host]
+            guessed = await self.each(guessers, lambda bot_id: self.op(
+                'best_pairs.guess', service.submit_player_guess, room_id, bot_id,
+                dict(zip(nouns, self.rng.sample(adjectives, len(adjectives))))))
+            room = await self.poll('best_pairs', room_id)
+            self.metrics.lost('best_pairs',
+                              len(set(guessed) - set(room.get('game_data', {}).get('player_guesses', {}))))
+
+            enter_bot_session(host)
+            await self.op('best_pairs.scores', service.apply_round_scores, room_id)
+            await self.op('best_pairs.end_round', service.end_round, room_id)
+            await self.op('best_pairs.next_round', service.next_round, room_id)
+
+    async def run(self, games):
+        scenarios = {
+            'detective': self.detective_room,
+            'spy': self.spy_room,
+            'chameleon': self.chameleon_room,
+            'codenames': self.codenames_room,
+            'best_pairs': self.best_pairs_room,
+        }
+        await asyncio.gather(*(scenarios[game](index) for game in games for index in range(self.args.rooms)))
+
+
+def prepare_workspace(workdir, games, players, rooms):
+    """Копирует файлы контента и создаёт пользователей-ботов в рабочем каталоге."""
+    for relative in CONTENT_FILES:
+        target = os.path.join(workdir, relative)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(os.path.join(REPO_ROOT, relative), target)
+
+    if 'detective' in games:
+        from src.models.user import User
+
+        users = [
+            User(f'detective-{index}-{n}', 'Бот', str(n), f'bot_{index}_{n}', '', '').to_dict()
+            for index in range(rooms) for n in range(players)
+        ]
+        os.makedirs(os.path.join(workdir, 'data'), exist_ok=True)
+        with open(os.path.join(workdir, 'data', 'data.json'), 'w', encoding='utf-8') as file:
+            json.dump({'users': users}, file, ensure_ascii=False, indent=4)
+
+
+def file_sizes(workdir):
+    sizes = {}
+    for directory, _, files in os.walk(workdir):
+        for name in files:
+            path = os.path.join(directory, name)
+            relative = os.path.relpath(path, workdir)
+            if relative.replace(os.sep, '/') in CONTENT_FILES:
+                continue
+            sizes[relative] = os.path.getsize(path)
+    return sizes
+
+
+def print_report(report, growth, args):
+    print(f"Игры: {', '.join(args.games)}; комнат на игру: {args.rooms}, ботов в комнате: {args.players}, "
+          f"думать: {args.think} с, потоков: {args.workers or 'нет (цикл событий)'}")
+    print(f"Время: {report['elapsed_s']:.2f} с, операций: {report['operations_total']}, "
+          f"{report['throughput_ops_s']:.1f} оп/с")
+    print(f"Ошибок: {report['errors_total']}, отказов сервиса: {report['failed_total']}, "
+          f"потерянных обновлений: {sum(report['lost_updates'].values())} {report['lost_updates'] or ''}")
+    print()
+    print(f"{'операция':28} {'число':>7} {'отказ':>6} {'ошиб':>5} {'p50 мс':>9} {'p90 мс':>9} "
+          f"{'p99 мс':>9} {'max мс':>9}")
+    for op, stats in report['operations'].items():
+        print(f"{op:28} {stats['count']:7d} {stats['failed']:6d} {stats['errors']:5d} {stats['p50_ms']:9.2f} "
+              f"{stats['p90_ms']:9.2f} {stats['p99_ms']:9.2f} {stats['max_ms']:9.2f}")
+    for op, sample in report['error_samples'].items():
+        print(f"  {op}: {sample}")
+    print()
+    print("Рост файлов (байт):")
+    for path, delta in sorted(growth.items()):
+        print(f"  {path:48} {delta:+12d}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочный прогон игровых сервисов ботами")
+    parser.add_argument('--games', nargs='+', choices=GAMES, default=list(GAMES))
+    parser.add_argument('--rooms', type=int, default=20, help="Комнат каждой игры")
+    parser.add_argument('--players', type=int, default=5, help="Ботов в комнате (включая создателя)")
+    parser.add_argument('--rounds', type=int, default=1, help="Раундов в комнате мини-игры")
+    parser.add_argument('--moves', type=int, default=5, help="Перемещений бота-детектива / ходов Codenames")
+    parser.add_argument('--think', type=float, default=0.05, help="Среднее время на обдумывание, с (0 - без пауз)")
+    parser.add_argument('--workers', type=int, default=0, help="Потоков для операций (0 - цикл событий)")
+    parser.add_argument('--in-memory', action='store_true', help="Комнаты мини-игр в RoomStore")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--workdir', help="Рабочий каталог (по умолчанию временный)")
+    parser.add_argument('--keep', action='store_true', help="Не удалять рабочий каталог")
+    parser.add_argument('--json', help="Записать отчёт в JSON файл")
+    args = parser.parse_args()
+    args.players = max(args.players, 3)
+
+    json_path = os.path.abspath(args.json) if args.json else None
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix='detective-load-'))
+    os.makedirs(workdir, exist_ok=True)
+    sys.path.insert(0, REPO_ROOT)
+    previous_cwd = os.getcwd()
+
+    from src.services.rng_provider import RngProvider
+    RngProvider.seed(args.seed)
+
+    os.chdir(workdir)
+    try:
+        prepare_workspace(workdir, args.games, args.players, args.rooms)
+        runner = LoadRunner(args)
+        runner.setup(args.games)
+        if 'detective' in args.games:
+            runner.seed_detective_rooms(args.rooms)
+        before = file_sizes(workdir)
+
+        if args.workers:
+            asyncio_executor = ThreadPoolExecutor(max_workers=args.workers)
+        else:
+            asyncio_executor = None
+
+        async def run():
+            if asyncio_executor:
+                asyncio.get_running_loop().set_default_executor(asyncio_executor)
+            await runner.run(args.games)
+
+        start = time.perf_counter()
+        asyncio.run(run())
+        elapsed = time.perf_counter() - start
+
+        for service, _ in runner.services.values():
+            store = getattr(service, 'store', None)
+            if store is not None:
+                store.flush_now()
+        after = file_sizes(workdir)
+    finally:
+        os.chdir(previous_cwd)
+
+    growth = {path: after.get(path, 0) - before.get(path, 0) for path in set(before) | set(after)}
+    report = runner.metrics.report(elapsed)
+    report['config'] = {key: value for key, value in vars(args).items() if key not in ('json', 'workdir')}
+    report['file_growth_bytes'] = growth
+    print_report(report, growth, args)
+
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    if args.keep or args.workdir:
+        print(f"\nРабочий каталог: {workdir}")
+    else:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
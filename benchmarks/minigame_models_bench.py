@@ -0,0 +1,104 @@
+"""
+Микро-бенчмарк моделей комнат мини-игр.
+
+Сравнивает комнаты в JSON-формате (вложенные словари, игроки списком)
+с MinigameRoom/RoomPlayer (слоты, игроки в словаре по ID): память на
+живую комнату, время поиска игрока по ID и копирования комнаты
+(RoomStore выдаёт сервису копию изменяемой комнаты).
+
+Запуск из корня репозитория:
+    python -m benchmarks.minigame_models_bench --rooms 2000 --players 8
+"""
+import argparse
+import copy
+import time
+import tracemalloc
+
+from src.models.minigame_room import MinigameRoom, find_player
+
+
+def make_room_dict(index, player_count):
+    now = 1700000000
+    players = [
+        {
+            "id": f"user-{index}-{n}",
+            "name": f"Игрок {n}",
+            "is_host": n == 0,
+            "joined_at": now,
+            "last_action": now,
+            "is_ready": n == 0
+        }
+        for n in range(player_count)
+    ]
+    return {
+        "room_id": f"spy_{index}",
+        "created_at": now,
+        "last_activity": now,
+        "status": "waiting",
+        "host_id": players[0]["id"],
+        "players": players,
+        "game_data": {"category": None, "location": None, "spy_index": -1, "votes": {}, "round": 0}
+    }
+
+
+def measure_memory(factory, count):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    rooms = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return rooms, size
+
+
+def measure_lookups(rooms, player_ids, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for room, player_id in zip(rooms, player_ids):
+            find_player(room, player_id)
+    elapsed = time.perf_counter() - start
+    return elapsed / (repeat * len(rooms))
+
+
+def measure_copies(rooms, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for room in rooms:
+            copy.deepcopy(room)
+    elapsed = time.perf_counter() - start
+    return elapsed / (repeat * len(rooms))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк моделей комнат мини-игр")
+    parser.add_argument('--rooms', type=int, default=2000)
+    parser.add_argument('--players', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    dict_rooms, dict_bytes = measure_memory(lambda i: make_room_dict(i, args.players), args.rooms)
+    model_rooms, model_bytes = measure_memory(
+        lambda i: MinigameRoom.from_dict(make_room_dict(i, args.players)), args.rooms)
+
+    # Преобразование должно быть без потерь
+    assert all(model.to_dict() == room for model, room in zip(model_rooms, dict_rooms))
+
+    # Ищем последнего игрока - худший случай для перебора списка
+    last_ids = [room["players"][-1]["id"] for room in dict_rooms]
+    dict_lookup = measure_lookups(dict_rooms, last_ids, args.repeat)
+    model_lookup = measure_lookups(model_rooms, last_ids, args.repeat)
+    dict_copy = measure_copies(dict_rooms, args.repeat)
+    model_copy = measure_copies(model_rooms, args.repeat)
+
+    print(f"Комнат: {args.rooms}, игроков в комнате: {args.players}")
+    print(f"Память, JSON-словари:  {dict_bytes / args.rooms:8.0f} байт на комнату")
+    print(f"Память, MinigameRoom:  {model_bytes / args.rooms:8.0f} байт на комнату "
+          f"({model_bytes / dict_bytes:.0%})")
+    print(f"Поиск игрока, словари: {dict_lookup * 1e9:8.0f} нс")
+    print(f"Поиск игрока, модель:  {model_lookup * 1e9:8.0f} нс")
+    print(f"Копия комнаты, словари: {dict_copy * 1e6:7.1f} мкс")
+    print(f"Копия комнаты, модель:  {model_copy * 1e6:7.1f} мкс")
+
+
+if __name__ == '__main__':
+    main()
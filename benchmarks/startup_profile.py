@@ -0,0 +1,271 @@
+"""
+Профиль холодного старта: стоимость импорта модулей и время до первой страницы.
+
+Каждый замер выполняется в новом интерпретаторе, как при запуске или
+перезапуске воркера:
+
+- импорт: python -X importtime для набора импортов src/main.py (app) и для
+  одного src.models.user (models); печатается время по пакетам, самые
+  дорогие модули проекта и какие из отложенных модулей (почта, экраны
+  администратора, мини-игры) загрузились при старте;
+- первая страница: дочерний процесс импортирует модули src/main.py,
+  запускает приложение NiceGUI и открывает "/" (UserUI) симулированным
+  пользователем; замеряются запуск интерпретатора, импорты, старт
+  приложения и построение первой страницы.
+
+Запуск из корня репозитория:
+    python -m benchmarks.startup_profile --json startup.json
+    python -m benchmarks.startup_profile --workdir /tmp/bench-data --compare startup.json --skip-page
+"""
+import argparse
+import ast
+import asyncio
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.storage_bench import REPO_ROOT, environment
+from benchmarks.storage_datasets import SIZES, generate_dataset
+
+MAIN_FILE = os.path.join(REPO_ROOT, 'src', 'main.py')
+# Модули, которые должны загружаться при первом использовании, а не при старте
+DEFERRED_MODULES = ('smtplib', 'email.mime', 'src.services.email_service', 'src.game.admin_game_ui',
+                    'src.game.game_room_management_ui', 'src.minigame')
+
+
+def app_modules():
+    """Модули проекта, которые импортирует src/main.py (без самого ui.run)."""
+    with open(MAIN_FILE, 'r', encoding='utf-8') as file:
+        tree = ast.parse(file.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.module and node.module.startswith('src.'):
+            modules.append(node.module)
+        elif isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names if alias.name.startswith('src.'))
+    return modules
+
+
+def child_env(workdir=None):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    if workdir:
+        env['NICEGUI_STORAGE_PATH'] = os.path.join(workdir, '.nicegui')
+    return env
+
+
+def parse_importtime(stderr):
+    """Строки -X importtime -> {модуль: (собственное время, накопленное время) в секундах}."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(self_us) / 1e6, int(cumulative_us) / 1e6)
+    return modules
+
+
+def profile_imports(modules, repeat, workdir):
+    """
+    Импортирует modules в repeat новых интерпретаторах; медианы по модулям и общего времени.
+
+    Текущий каталог - workdir: при импорте сервисы создают каталог data.
+    """
+    statement = 'import ' + ', '.join(modules)
+    walls = []
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], cwd=workdir,
+                                 env=child_env(), capture_output=True, text=True)
+        walls.append(time.perf_counter() - start)
+        if process.returncode:
+            raise RuntimeError(f"Импорт {statement} завершился ошибкой:\n{process.stderr[-2000:]}")
+        runs.append(parse_importtime(process.stderr))
+
+    names = set().union(*runs)
+    per_module = {}
+    for name in names:
+        samples = [run[name] for run in runs if name in run]
+        per_module[name] = {
+            'self_ms': round(statistics.median(sample[0] for sample in samples) * 1000, 3),
+            'cumulative_ms': round(statistics.median(sample[1] for sample in samples) * 1000, 3),
+        }
+    return {
+        'statement': statement,
+        'process_ms': round(statistics.median(walls) * 1000, 1),
+        'import_ms': round(sum(module['self_ms'] for module in per_module.values()), 1),
+        'module_count': round(statistics.median(len(run) for run in runs)),
+        'modules': per_module,
+    }
+
+
+def package_of(name):
+    """Группа для сводки: пакет верхнего уровня, для проекта - подпакет src."""
+    parts = name.split('.')
+    if parts[0] == 'src':
+        return '.'.join(parts[:2])
+    return parts[0]
+
+
+def by_package(profile):
+    totals = {}
+    for name, module in profile['modules'].items():
+        group = package_of(name)
+        totals[group] = totals.get(group, 0.0) + module['self_ms']
+    return sorted(totals.items(), key=lambda item: -item[1])
+
+
+def deferred_loaded(profile):
+    return sorted(name for name in profile['modules']
+                  if any(name == prefix or name.startswith(prefix + '.') for prefix in DEFERRED_MODULES))
+
+
+async def open_first_page():
+    import httpx
+    from nicegui import core
+    from nicegui.testing.user import User
+
+    async with core.app.router.lifespan_context(core.app):
+        started = time.perf_counter()
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(core.app), base_url='http://test') as http:
+            user = User(http)
+            opening = time.perf_counter()
+            await user.open('/')
+            return started, opening, time.perf_counter()
+
+
+def child_first_page(username, user_id):
+    """Дочерний процесс: импорты main.py, старт приложения и первая страница; печатает JSON."""
+    process_start = time.time()
+    start = time.perf_counter()
+    import importlib
+
+    for module in app_modules():
+        importlib.import_module(module)
+    imported = time.perf_counter()
+
+    from nicegui import app, ui
+
+    from benchmarks.ui_render_bench import prepare_simulation
+    from src.ui.user_ui import UserUI
+
+    @ui.page('/')
+    def main_page():
+        app.storage.user.update({'user_id': user_id, 'username': username, 'authenticated': True})
+        UserUI()
+
+    prepare_simulation()
+    started, opening, opened = asyncio.run(open_first_page())
+    print(json.dumps({
+        'process_start': process_start,
+        'imports_ms': round((imported - start) * 1000, 1),
+        'app_startup_ms': round((started - imported) * 1000, 1),
+        'first_page_ms': round((opened - opening) * 1000, 1),
+        'total_ms': round((opened - start) * 1000, 1),
+    }))
+
+
+def profile_first_page(workdir, username, user_id, repeat):
+    """Время до первой страницы в repeat новых процессах; медианы этапов."""
+    runs = []
+    for _ in range(repeat):
+        spawned = time.time()
+        process = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.startup_profile', '--child-first-page', username, user_id],
+            cwd=workdir, env=child_env(workdir), capture_output=True, text=True)
+        finished = time.time()
+        if process.returncode:
+            raise RuntimeError(f"Первая страница не открылась:\n{process.stderr[-2000:]}")
+        result = json.loads(process.stdout.strip().splitlines()[-1])
+        result['interpreter_ms'] = round((result.pop('process_start') - spawned) * 1000, 1)
+        result['process_ms'] = round((finished - spawned) * 1000, 1)
+        runs.append(result)
+    return {key: round(statistics.median(run[key] for run in runs), 1) for key in runs[0]}
+
+
+def print_imports(name, profile, top, baseline=None):
+    previous = (baseline or {}).get('imports', {}).get(name)
+    suffix = f" (база: {previous['process_ms']} мс, модулей {previous['module_count']})" if previous else ''
+    print(f"\n[{name}] {profile['statement']}")
+    print(f"процесс {profile['process_ms']} мс, импорт {profile['import_ms']} мс, "
+          f"модулей {profile['module_count']}{suffix}")
+    print(f"  {'пакет':40} {'собств. мс':>11}")
+    for group, self_ms in by_package(profile)[:top]:
+        print(f"  {group:40} {self_ms:11.1f}")
+    own = sorted(((name, module) for name, module in profile['modules'].items() if name.startswith('src.')),
+                 key=lambda item: -item[1]['self_ms'])
+    if own:
+        print(f"  {'модуль проекта':40} {'собств. мс':>11} {'накопл. мс':>11}")
+        for module_name, module in own[:top]:
+            print(f"  {module_name:40} {module['self_ms']:11.1f} {module['cumulative_ms']:11.1f}")
+    loaded = deferred_loaded(profile)
+    print("  отложенные модули при старте: " + (', '.join(loaded) if loaded else 'не загружаются'))
+
+
+def print_first_page(result, baseline=None):
+    previous = (baseline or {}).get('first_page') or {}
+    print("\n[first_page] " + ', '.join(
+        f"{key} {value}" + (f" (база {previous[key]})" if key in previous else '') for key, value in result.items()))
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == '--child-first-page':
+        child_first_page(sys.argv[2], sys.argv[3])
+        return
+
+    parser = argparse.ArgumentParser(description="Профиль холодного старта")
+    parser.add_argument('--size', choices=sorted(SIZES), default='small')
+    parser.add_argument('--logs', type=int, default=50_000, help="Строк логов в создаваемом наборе")
+    parser.add_argument('--workdir', help="Каталог набора данных; если в нём есть manifest.json, набор переиспользуется")
+    parser.add_argument('--repeat', type=int, default=5, help="Запусков нового процесса на замер")
+    parser.add_argument('--top', type=int, default=12, help="Строк в таблицах пакетов и модулей")
+    parser.add_argument('--username', default='user1', help="Пользователь первой страницы")
+    parser.add_argument('--skip-page', action='store_true', help="Только импорты, без первой страницы")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help="Записать результаты в JSON файл")
+    parser.add_argument('--compare', help="JSON с прошлыми результатами для сравнения")
+    args = parser.parse_args()
+
+    json_path = os.path.abspath(args.json) if args.json else None
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix='detective-startup-'))
+    imports = {
+        'app': profile_imports(app_modules(), args.repeat, workdir),
+        'models': profile_imports(['src.models.user'], args.repeat, workdir),
+    }
+    for name, profile in imports.items():
+        print_imports(name, profile, args.top, baseline)
+
+    first_page = None
+    if not args.skip_page:
+        if not os.path.exists(os.path.join(workdir, 'manifest.json')):
+            generate_dataset(workdir, args.size, args.seed, args.logs)
+        with open(os.path.join(workdir, 'data', 'data.json'), 'r', encoding='utf-8') as file:
+            users = {user['username']: user['id'] for user in json.load(file)['users']}
+        first_page = profile_first_page(workdir, args.username, users[args.username], args.repeat)
+        print_first_page(first_page, baseline)
+
+    report = {
+        'environment': environment(),
+        'settings': {'repeat': args.repeat, 'username': args.username},
+        'imports': imports,
+        'first_page': first_page,
+    }
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    if not args.workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+"""
+Бенчмарк горячих путей хранилища на синтетическом наборе данных.
+
+Замеряются: UserService.load_data / get_user_by_id, GameRoomManagement.load /
+save, GameStateService.load, load_rooms / save_rooms каждой мини-игры и
+LogDatabase.add_log / get_logs / count_logs. Набор данных создаётся
+генераторами benchmarks.storage_datasets (small или full: 10k пользователей,
+1k комнат с длинной историей, сотни сценариев, 5M строк логов) или берётся
+из готового каталога.
+
+Результаты пишутся в JSON (--json) вместе с описанием окружения и коммита;
+--compare печатает отношение медиан к ранее сохранённому результату, что
+позволяет сравнивать ветки и машины.
+
+Запуск из корня репозитория:
+    python -m benchmarks.storage_bench --size small --json storage.json
+    python -m benchmarks.storage_bench --workdir /tmp/bench-data --size full --compare storage.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.storage_datasets import MINIGAME_ROOM_FILES, SIZES, generate_dataset
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+
+def summarize(times):
+    times = sorted(times)
+    total = sum(times)
+    return {
+        'runs': len(times),
+        'min_ms': round(times[0] * 1000, 3),
+        'p50_ms': round(times[len(times) // 2] * 1000, 3),
+        'p90_ms': round(times[min(len(times) - 1, int(len(times) * 0.9))] * 1000, 3),
+        'mean_ms': round(total / len(times) * 1000, 3),
+        'ops_s': round(len(times) / total, 1) if total else None,
+    }
+
+
+def measure(fn, repeat, max_seconds, prepare=None):
+    """
+    Вызывает fn до repeat раз (но не дольше max_seconds) и возвращает статистику.
+
+    :param prepare: Функция номер запуска -> аргумент fn; не входит в замер
+    """
+    times = []
+    deadline = time.perf_counter() + max_seconds
+    for run in range(repeat):
+        argument = prepare(run) if prepare else None
+        start = time.perf_counter()
+        if prepare:
+            fn(argument)
+        else:
+            fn()
+        times.append(time.perf_counter() - start)
+        if time.perf_counter() > deadline:
+            break
+    return summarize(times)
+
+
+def git_revision():
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, text=True).strip()
+        branch = subprocess.check_output(['git', 'rev-parse', '--abbrev-ref', 'HEAD'], cwd=REPO_ROOT,
+                                         text=True).strip()
+        return {'commit': commit, 'branch': branch}
+    except (OSError, subprocess.CalledProcessError):
+        return {}
+
+
+def environment():
+    return {
+        **git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def build_cases(manifest, rng):
+    """Возвращает [(название, fn, prepare)]; вызывается с текущим каталогом = набор данных."""
+    from src.game.game_room_management import GameRoomManagement
+    from src.game.game_state_service import GameStateService
+    from src.minigame.best_pairs.best_pairs_room_service import BestPairsRoomService
+    from src.minigame.chameleon.chameleon_room_service import ChameleonRoomService
+    from src.minigame.codenames.codenames_room_service import CodenamesRoomService
+    from src.minigame.spy.spy_room_service import SpyRoomService
+    from src.services.log.log_database import LogDatabase
+    from src.services.user.user_service import UserService
+
+    users = UserService()
+    user_ids = manifest['user_ids']
+    users.get_user_by_id(user_ids[0])  # прогрев справочника для замера warm
+    rooms = GameRoomManagement()
+    room_data = rooms.load()
+    scenarios = GameStateService()
+    game_ids = manifest['game_ids']
+    logs = LogDatabase()
+    newest = logs.get_logs(page_size=1)
+    log_date = newest[0]['date'] if newest else None
+
+    def cold_lookup(user_id):
+        users.directory.invalidate()
+        users.get_user_by_id(user_id)
+
+    def log_entry(run):
+        now = time.time()
+        return {'timestamp': int(now), 'datetime': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now)),
+                'level': 'GAME', 'action': 'BENCH', 'user_id': rng.choice(user_ids),
+                'message': 'Бенчмарк записи лога', 'metadata': {'run': run}}
+
+    cases = [
+        ('users.load_data', users.load_data, None),
+        ('users.get_user_by_id.warm', users.get_user_by_id, lambda run: rng.choice(user_ids)),
+        ('users.get_user_by_id.cold', cold_lookup, lambda run: rng.choice(user_ids)),
+        ('detective.rooms.load', rooms.load, None),
+        ('detective.rooms.save', lambda: rooms.save(room_data), None),
+        ('scenario.load', scenarios.load, lambda run: rng.choice(game_ids)),
+    ]
+
+    services = {
+        'spy': SpyRoomService, 'chameleon': ChameleonRoomService,
+        'codenames': CodenamesRoomService, 'best_pairs': BestPairsRoomService,
+    }
+    for game, relative in MINIGAME_ROOM_FILES.items():
+        service = services[game](rooms_file=relative, in_memory=False)
+        minigame_rooms = service.load_rooms()
+        cases.append((f'{game}.load_rooms', service.load_rooms, None))
+        cases.append((f'{game}.save_rooms', lambda service=service, data=minigame_rooms: service.save_rooms(data), None))
+
+    cases += [
+        ('logs.add_log', logs.add_log, log_entry),
+        ('logs.get_logs.page1', lambda: logs.get_logs(), None),
+        ('logs.get_logs.page100', lambda: logs.get_logs(page=100), None),
+        ('logs.get_logs.user', lambda user_id: logs.get_logs(user_id=user_id), lambda run: rng.choice(user_ids)),
+        ('logs.get_logs.date', lambda: logs.get_logs(date=log_date), None),
+        ('logs.get_logs.search', lambda: logs.get_logs(search_query='свидетель архив'), None),
+        ('logs.count_logs.all', lambda: logs.count_logs(), None),
+        ('logs.count_logs.level', lambda: logs.count_logs(level='ERROR'), None),
+        ('logs.count_logs.user', lambda user_id: logs.count_logs(user_id=user_id), lambda run: rng.choice(user_ids)),
+        ('logs.count_logs.date', lambda: logs.count_logs(date=log_date), None),
+        ('logs.count_logs.search', lambda: logs.count_logs(search_query='свидетель архив'), None),
+    ]
+    return cases
+
+
+def file_sizes(workdir):
+    sizes = {}
+    for relative in ['data/data.json', 'data/gameRoomState.json', 'data/logs/logs.db',
+                     *MINIGAME_ROOM_FILES.values()]:
+        path = os.path.join(workdir, relative)
+        if os.path.exists(path):
+            sizes[relative] = os.path.getsize(path)
+    games_dir = os.path.join(workdir, 'data', 'games')
+    if os.path.isdir(games_dir):
+        sizes['data/games/*'] = sum(os.path.getsize(os.path.join(games_dir, name)) for name in os.listdir(games_dir))
+    return sizes
+
+
+def print_results(results, baseline=None):
+    base = (baseline or {}).get('results', {})
+    header = f"{'замер':32} {'запусков':>8} {'p50 мс':>10} {'p90 мс':>10} {'оп/с':>10}"
+    print(header + (f" {'к базе':>8}" if base else ''))
+    for name, stats in results.items():
+        line = (f"{name:32} {stats['runs']:8d} {stats['p50_ms']:10.3f} {stats['p90_ms']:10.3f} "
+                f"{stats['ops_s'] or 0:10.1f}")
+        if name in base and base[name]['p50_ms']:
+            line += f" {stats['p50_ms'] / base[name]['p50_ms']:7.2f}x"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк хранилища")
+    parser.add_argument('--size', choices=sorted(SIZES), default='small')
+    parser.add_argument('--logs', type=int, help="Строк логов (переопределяет размер набора)")
+    parser.add_argument('--workdir', help="Каталог набора данных; если в нём есть manifest.json, набор переиспользуется")
+    parser.add_argument('--repeat', type=int, default=30, help="Запусков на замер")
+    parser.add_argument('--max-seconds', type=float, default=10.0, help="Ограничение времени на замер")
+    parser.add_argument('--only', nargs='*', help="Префиксы замеров (например, logs users.load)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help="Записать результаты в JSON файл")
+    parser.add_argument('--compare', help="JSON с прошлыми результатами для сравнения")
+    args = parser.parse_args()
+
+    json_path = os.path.abspath(args.json) if args.json else None
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix='detective-storage-'))
+    manifest_path = os.path.join(workdir, 'manifest.json')
+    sys.path.insert(0, REPO_ROOT)
+
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+        print(f"Используется набор {manifest['size']} из {workdir}")
+    else:
+        start = time.perf_counter()
+        manifest = generate_dataset(workdir, args.size, args.seed, args.logs)
+        print(f"Набор {args.size} создан за {time.perf_counter() - start:.1f} с")
+
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        rng = random.Random(args.seed)
+        results = {}
+        for name, fn, prepare in build_cases(manifest, rng):
+            if args.only and not any(name.startswith(prefix) for prefix in args.only):
+                continue
+            results[name] = measure(fn, args.repeat, args.max_seconds, prepare)
+        sizes = file_sizes(workdir)
+    finally:
+        os.chdir(previous_cwd)
+
+    report = {
+        'environment': environment(),
+        'dataset': {key: value for key, value in manifest.items() if key not in ('user_ids', 'game_ids')},
+        'file_sizes_bytes': sizes,
+        'settings': {'repeat': args.repeat, 'max_seconds': args.max_seconds},
+        'results': results,
+    }
+    print_results(results, baseline)
+
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    if not args.workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
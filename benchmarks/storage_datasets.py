@@ -0,0 +1,257 @@
+"""
+Генераторы синтетических данных для бенчмарков хранилища.
+
+Данные повторяют форму рабочих файлов: пользователи (data/data.json),
+детективные комнаты с длинной историей перемещений (data/gameRoomState.json),
+сценарии игр (data/games/<id>.json), комнаты мини-игр и база логов SQLite.
+Генерация детерминирована зерном.
+
+Создание набора данных в каталоге:
+    python -m benchmarks.storage_datasets /tmp/bench-data --size full
+"""
+import argparse
+import json
+import os
+import random
+import time
+from datetime import datetime
+
+SIZES = {
+    # пользователи, детективные комнаты, длина истории, сценарии, комнат мини-игры, строк логов
+    'small': {'users': 1000, 'rooms': 100, 'history': 200, 'scenarios': 30, 'minigame_rooms': 100,
+              'logs': 200_000},
+    'full': {'users': 10_000, 'rooms': 1000, 'history': 200, 'scenarios': 300, 'minigame_rooms': 500,
+             'logs': 5_000_000},
+}
+
+MINIGAME_ROOM_FILES = {
+    'spy': 'src/minigame/spy/spy_rooms.json',
+    'chameleon': 'src/minigame/chameleon/chameleon_rooms.json',
+    'codenames': 'src/minigame/codenames/codenames_rooms.json',
+    'best_pairs': 'src/minigame/best_pairs/best_pairs_rooms.json',
+}
+
+LOG_LEVELS = ('INFO', 'GAME', 'GAME', 'GAME', 'SYSTEM', 'ERROR', 'DEBUG')
+LOG_ACTIONS = ('SPY_VOTE', 'CHAMELEON_DESCRIPTION', 'CODENAMES_MAKE_GUESS', 'BEST_PAIRS_GUESS_SUBMIT',
+               'SYSTEM', 'USER_LOGIN', 'SHOW_GAME', 'ERROR')
+WORDS = ('улица', 'дом', 'свидетель', 'полиция', 'архив', 'газета', 'морг', 'алиби', 'ключ', 'письмо',
+         'вокзал', 'банк', 'театр', 'рынок', 'порт')
+
+
+def text(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, ensure_ascii=False, indent=4)
+
+
+def generate_users(count, rng):
+    from src.models.user import User
+
+    users = []
+    for index in range(count):
+        user = User(f'user-{index:06d}', f'Имя{index}', f'Фамилия{index}', f'user{index}',
+                    'pbkdf2_sha256$' + '%032x' % rng.getrandbits(128), f'avatar{index % 20}.png',
+                    f'user{index}@example.com').to_dict()
+        rooms = [f'room-{rng.randrange(1000):04d}' for _ in range(rng.randrange(10))]
+        user['stats'] = {
+            'moves': rng.randrange(5000),
+            'rooms_visited': len(rooms),
+            'rooms_list': rooms,
+            'completed_games': rng.randrange(50),
+        }
+        users.append(user)
+    return users
+
+
+def generate_detective_rooms(count, history, user_ids, game_ids, rng):
+    now = int(time.time())
+    rooms = {}
+    for index in range(count):
+        length = rng.randint(history // 2, history)
+        visited_at = now - length * 60
+        location_history = []
+        for step in range(length):
+            visited_at += rng.randint(10, 120)
+            location_history.append({
+                'id': str(rng.randint(1, 400)),
+                'visited_at': visited_at,
+                'is_tooltip': rng.random() < 0.05,
+                'open': rng.random() < 0.3,
+            })
+        rooms[f'room-{index:04d}'] = {
+            'game_id': rng.choice(game_ids),
+            'users': rng.sample(user_ids, min(len(user_ids), rng.randint(1, 6))),
+            'status': rng.choice(('playing', 'playing', 'finished')),
+            'last_visited_at': visited_at,
+            'move': length,
+            'location_history': location_history,
+            'current_location': location_history[-1]['id'] if location_history else None,
+        }
+    return rooms
+
+
+def generate_scenario(rng, places=120, people=60):
+    from src.game.game_state_service import GameStateService
+
+    state = GameStateService.default_game_state()
+    state['start'] = text(rng, 80)
+    state['gazeta'] = text(rng, 200)
+    for section, count in (('people', people), ('gosplace', places // 3), ('obplace', places // 3)):
+        state['spravochnik'][section] = {str(rng.randint(100000, 999999)): text(rng, 6) for _ in range(count)}
+    state['place'] = {str(rng.randint(1, 999)): text(rng, 60) for _ in range(places)}
+    state['tooltip'] = {str(n): str(rng.randint(1, 999)) for n in range(1, 6)}
+    culprit = rng.choice(list(state['spravochnik']['people']))
+    state['isCulprit'] = {'id': culprit, 'name': state['spravochnik']['people'][culprit], 'endText': text(rng, 40)}
+    return state
+
+
+def _players(rng, game, index, count, now):
+    return [
+        {'id': f'{game}-{index}-{n}', 'name': f'Игрок {n}', 'is_host': n == 0, 'joined_at': now,
+         'last_action': now, 'is_ready': rng.random() < 0.7}
+        for n in range(count)
+    ]
+
+
+def generate_minigame_rooms(game, count, rng):
+    """Комнаты в формате сервиса комнат игры game (поля game_data - как у create_room)."""
+    now = int(time.time())
+    rooms = {}
+    for index in range(count):
+        room_id = f'{game[:2].upper()}{index:05d}'
+        players = _players(rng, game, index, rng.randint(3, 10), now)
+        status = rng.choice(('waiting', 'playing', 'playing', 'finished'))
+        room = {
+            'room_id': room_id, 'created_at': now - rng.randrange(86400), 'last_activity': now,
+            'status': status, 'host_id': players[0]['id'], 'rng_seed': rng.getrandbits(64), 'players': players,
+        }
+        ids = [player['id'] for player in players]
+        if game == 'spy':
+            room['game_data'] = {'category': text(rng, 1), 'location': text(rng, 2), 'spy_index': 0,
+                                 'votes': {pid: rng.choice(ids) for pid in ids}, 'round': 2,
+                                 'time_per_round': 300}
+        elif game == 'chameleon':
+            room['game_data'] = {'category': text(rng, 1), 'word': text(rng, 1), 'chameleon_index': 0,
+                                 'grid_words': [text(rng, 1) for _ in range(16)],
+                                 'descriptions': [{'player_id': pid, 'player_name': pid, 'description': text(rng, 3),
+                                                   'timestamp': now} for pid in ids],
+                                 'votes': {}, 'round': 2, 'current_player_index': 0}
+        elif game == 'codenames':
+            size = 25
+            room['teams'] = {'1': {'captain': ids[0], 'members': ids[2::2], 'color': 'bg-red-500', 'name': 'Красная'},
+                             '2': {'captain': ids[1], 'members': ids[3::2], 'color': 'bg-blue-500', 'name': 'Синяя'}}
+            for n, player in enumerate(players):
+                player['team'] = str(n % 2 + 1)
+                player['role'] = 'captain' if n < 2 else 'member'
+            room['settings'] = {'team_count': 2, 'hint_mode': 'written'}
+            room['game_data'] = {
+                'board': {'emojis': ['🙂'] * size, 'teams': [rng.choice((0, 1, 2, -1)) for _ in range(size)],
+                          'revealed': rng.getrandbits(size), 'totals': {}, 'remaining': {}, 'grid_size': 5},
+                'current_team': 1, 'current_hint': {'text': text(rng, 1), 'count': 2, 'guesses_made': 0},
+                'round': 1, 'turn_order': [1, 2], 'game_started': True}
+        else:
+            nouns = [text(rng, 1) for _ in range(5)]
+            adjectives = [text(rng, 1) for _ in range(5)]
+            room['current_host_index'] = 0
+            room['scores'] = {pid: rng.randrange(30) for pid in ids}
+            room['game_data'] = {'nouns': nouns, 'adjectives': adjectives,
+                                 'host_pairings': dict(zip(nouns, adjectives)),
+                                 'player_guesses': {pid: dict(zip(nouns, rng.sample(adjectives, 5))) for pid in ids[1:]},
+                                 'round': 2, 'current_round_host': ids[0], 'round_scores': {}}
+        rooms[room_id] = room
+    return rooms
+
+
+def generate_logs(db_path, count, user_ids, rng, batch=50_000):
+    """
+    Заполняет базу логов count строками (схема LogDatabase).
+
+    Индексы удаляются на время вставки и создаются заново в конце.
+    """
+    from src.services.log.log_database import LogDatabase
+
+    db = LogDatabase(db_path)
+    conn = db.get_connection()
+    indexes = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'logs' AND name LIKE 'idx_%'")]
+    for name in indexes:
+        conn.execute(f'DROP INDEX {name}')
+
+    now = int(time.time())
+    start = now - 180 * 86400
+    step = max(1, (now - start) // max(count, 1))
+    written = 0
+    while written < count:
+        rows = []
+        for n in range(written, min(count, written + batch)):
+            timestamp = start + n * step
+            moment = datetime.fromtimestamp(timestamp)
+            rows.append((
+                timestamp, moment.strftime('%Y-%m-%d %H:%M:%S'), moment.strftime('%Y-%m-%d'),
+                rng.choice(LOG_LEVELS), rng.choice(LOG_ACTIONS),
+                rng.choice(user_ids) if user_ids and rng.random() < 0.9 else None,
+                text(rng, 5), json.dumps({'room_id': f'room-{rng.randrange(1000):04d}'}) if rng.random() < 0.6 else None,
+            ))
+        conn.executemany(
+            'INSERT INTO logs (timestamp, datetime, date, level, action, user_id, message, metadata) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        conn.commit()
+        written += len(rows)
+
+    db.init_db()
+    return db
+
+
+def generate_dataset(workdir, size='small', seed=1, logs=None):
+    """
+    Создаёт полный набор данных в каталоге workdir (пути как у сервисов по умолчанию).
+
+    :return: Манифест с размерами набора
+    """
+    sizes = dict(SIZES[size])
+    if logs is not None:
+        sizes['logs'] = logs
+    rng = random.Random(seed)
+
+    users = generate_users(sizes['users'], rng)
+    user_ids = [user['id'] for user in users]
+    write_json(os.path.join(workdir, 'data', 'data.json'), {'users': users})
+
+    game_ids = [f'game-{index:03d}' for index in range(sizes['scenarios'])]
+    for game_id in game_ids:
+        write_json(os.path.join(workdir, 'data', 'games', f'{game_id}.json'), generate_scenario(rng))
+
+    write_json(os.path.join(workdir, 'data', 'gameRoomState.json'),
+               generate_detective_rooms(sizes['rooms'], sizes['history'], user_ids, game_ids, rng))
+
+    for game, relative in MINIGAME_ROOM_FILES.items():
+        write_json(os.path.join(workdir, relative), generate_minigame_rooms(game, sizes['minigame_rooms'], rng))
+
+    generate_logs(os.path.join(workdir, 'data', 'logs', 'logs.db'), sizes['logs'], user_ids, rng)
+
+    manifest = {'size': size, 'seed': seed, **sizes, 'user_ids': user_ids[:100], 'game_ids': game_ids}
+    write_json(os.path.join(workdir, 'manifest.json'), manifest)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Генерация синтетического набора данных для бенчмарков")
+    parser.add_argument('workdir')
+    parser.add_argument('--size', choices=sorted(SIZES), default='small')
+    parser.add_argument('--logs', type=int, help="Строк логов (переопределяет размер набора)")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    manifest = generate_dataset(os.path.abspath(args.workdir), args.size, args.seed, args.logs)
+    print(f"Набор {args.size} создан в {args.workdir} за {time.perf_counter() - start:.1f} с: "
+          f"{manifest['users']} пользователей, {manifest['rooms']} комнат, {manifest['scenarios']} сценариев, "
+          f"{manifest['logs']} строк логов")
+
+
+if __name__ == '__main__':
+    main()
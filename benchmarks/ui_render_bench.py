@@ -0,0 +1,354 @@
+"""
+Бенчмарк построения экранов UI на симулированном пользователе NiceGUI.
+
+Замеряются: UserUI.setup_ui (администратор и игрок), GameUI.show_game_interface,
+LogService.log_interface, AdminGameUI.create_game_cards,
+CodenamesGameUI.show_game_screen и BestPairsGameUI.show_unified_pairing_interface.
+Данные - синтетический набор benchmarks.storage_datasets.
+
+Каждый экран строится на отдельной странице, которую открывает
+nicegui.testing.User (HTTP-запрос через ASGI и рукопожатие сокета без
+браузера). Для первого построения замеряется время, число элементов и
+размер ответа страницы; затем экран перестраивается в том же клиенте,
+и для перестроения замеряются время, число элементов и размер исходящих
+сообщений сокета (по Outbox._emit).
+
+Окружение повторяет фикстуру user из nicegui.testing (ей нужен
+pytest-asyncio), поэтому прогон не требует pytest.
+
+Запуск из корня репозитория:
+    python -m benchmarks.ui_render_bench --size small --json ui.json
+    python -m benchmarks.ui_render_bench --workdir /tmp/bench-data --compare ui.json --only codenames
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks.storage_bench import REPO_ROOT, environment, summarize
+from benchmarks.storage_datasets import MINIGAME_ROOM_FILES, SIZES, generate_dataset
+
+ADMIN_USERNAME = 'lucky_illia'
+
+
+class SocketMeter:
+    """Считает исходящие сообщения сокета по клиентам (обёртка Outbox._emit)."""
+
+    def __init__(self):
+        self.bytes = {}
+        self.messages = {}
+        self.page_bytes = 0  # размер последнего ответа страницы
+
+    async def on_response(self, response):
+        """Обработчик ответов httpx: первое построение уходит в HTML страницы."""
+        await response.aread()
+        self.page_bytes = len(response.content)
+
+    def install(self):
+        from nicegui.outbox import Outbox
+
+        meter = self
+        original = Outbox._emit
+
+        async def _emit(outbox, message):
+            client_id, _, data = message
+            size = len(json.dumps(data, default=str).encode('utf-8'))
+            meter.bytes[client_id] = meter.bytes.get(client_id, 0) + size
+            meter.messages[client_id] = meter.messages.get(client_id, 0) + 1
+            await original(outbox, message)
+
+        Outbox._emit = _emit
+
+    def take(self, client_id):
+        """Возвращает (байт, сообщений) клиента с прошлого вызова."""
+        return self.bytes.pop(client_id, 0), self.messages.pop(client_id, 0)
+
+
+class RenderCase:
+    """
+    Экран для замера.
+
+    :param session: Поля app.storage.user на время построения
+    :param setup: Функция () -> состояние; создаёт объекты UI вне замера
+    :param render: Функция (состояние) -> None; строит экран
+    :param clears_itself: Экран сам очищает свой контейнер при перестроении
+    """
+
+    def __init__(self, name, session, render, setup=None, clears_itself=False):
+        self.name = name
+        self.path = f'/bench/{name}'
+        self.session = session
+        self.setup = setup or (lambda: None)
+        self.render = render
+        self.clears_itself = clears_itself
+        self.state = None
+        self.container = None
+        self.first = []  # [(секунды, элементов)]
+
+    def build(self):
+        """Строит экран в контейнере страницы и возвращает (секунды, элементов экрана)."""
+        start = time.perf_counter()
+        with self.container:
+            self.render(self.state)
+        elapsed = time.perf_counter() - start
+        return elapsed, sum(1 for _ in self.container.descendants())
+
+
+def pick_rooms(manifest):
+    """Выбирает комнаты набора данных: детективную и игровые комнаты мини-игр."""
+    with open('data/gameRoomState.json', 'r', encoding='utf-8') as file:
+        detective = json.load(file)
+    playing = [rid for rid, room in detective.items() if room['status'] == 'playing']
+    room_id = max(playing, key=lambda rid: len(detective[rid]['location_history']))
+    rooms = {'detective': (room_id, detective[room_id]['users'][0])}
+    for game in ('codenames', 'best_pairs'):
+        with open(MINIGAME_ROOM_FILES[game], 'r', encoding='utf-8') as file:
+            minigame_rooms = json.load(file)
+        playing = [room for room in minigame_rooms.values() if room['status'] == 'playing']
+        room = max(playing, key=lambda room: len(room['players']))
+        rooms[game] = (room['room_id'], room['players'][0]['id'])
+    return rooms
+
+
+def build_cases(manifest):
+    """Возвращает список RenderCase; вызывается с текущим каталогом = набор данных."""
+    from nicegui import ui
+
+    from src.game.admin_game_ui import AdminGameUI
+    from src.game.game_ui import GameUI
+    from src.minigame.best_pairs.best_pairs_game_ui import BestPairsGameUI
+    from src.minigame.codenames.codenames_game_ui import CodenamesGameUI
+    from src.services.log.log_services import LogService
+    from src.ui.user_ui import UserUI
+
+    rooms = pick_rooms(manifest)
+    player_id = manifest['user_ids'][1]
+    detective_room, detective_user = rooms['detective']
+    codenames_room, codenames_player = rooms['codenames']
+    best_pairs_room, best_pairs_host = rooms['best_pairs']
+
+    def admin_cards(admin):
+        admin.display_container = ui.column().classes('w-full')
+        admin.create_game_cards()
+
+    def admin_card_content(admin):
+        # Раскрытие одной карточки: черновик игры и все разделы
+        admin.drafts.clear()
+        admin.create_game_card_content(admin.game_ids[0])
+
+    def codenames_setup():
+        game = CodenamesGameUI()
+        game.current_room_id = codenames_room
+        game.player_id = codenames_player
+        game.game_container = ui.element('div').classes('w-full')
+        return game
+
+    def codenames_screen(game):
+        game.show_game_screen()
+
+    def best_pairs_setup():
+        game = BestPairsGameUI()
+        game.current_room_id = best_pairs_room
+        game.player_id = best_pairs_host
+        return game
+
+    def best_pairs_pairing(game):
+        game.selected_pairings = {}
+        game.show_unified_pairing_interface(game.room_service.get_room(best_pairs_room), is_host=True)
+
+    return [
+        RenderCase('user_ui.admin', {'user_id': manifest['user_ids'][0], 'username': ADMIN_USERNAME},
+                   lambda state: UserUI()),
+        RenderCase('user_ui.player', {'user_id': player_id, 'username': 'user1'}, lambda state: UserUI()),
+        RenderCase('game_ui.show_game_interface', {'user_id': detective_user, 'game_state_id': detective_room},
+                   lambda game: game.show_game_interface, setup=GameUI, clears_itself=True),
+        RenderCase('logs.log_interface', {'user_id': player_id}, lambda logs: logs.log_interface(),
+                   setup=LogService),
+        RenderCase('admin_game_ui.create_game_cards', {'user_id': player_id, 'username': ADMIN_USERNAME},
+                   admin_cards, setup=AdminGameUI),
+        RenderCase('admin_game_ui.create_game_card_content', {'user_id': player_id, 'username': ADMIN_USERNAME},
+                   admin_card_content, setup=AdminGameUI),
+        RenderCase('codenames.show_game_screen', {'user_id': codenames_player, 'codenames_room_id': codenames_room},
+                   codenames_screen, setup=codenames_setup, clears_itself=True),
+        RenderCase('best_pairs.show_unified_pairing_interface',
+                   {'user_id': best_pairs_host, 'best_pairs_room_id': best_pairs_room},
+                   best_pairs_pairing, setup=best_pairs_setup),
+    ]
+
+
+def register_page(case):
+    """Страница, которая строит экран case и запоминает замер первого построения."""
+    from nicegui import app, ui
+
+    @ui.page(case.path)
+    def bench_page():
+        app.storage.user.clear()
+        app.storage.user.update(case.session)
+        case.container = ui.column().classes('w-full')
+        with case.container:
+            case.state = case.setup()
+        case.first.append(case.build())
+
+
+def prepare_simulation():
+    """Настройки запуска как у фикстуры user из nicegui.testing."""
+    import nicegui.storage
+    from nicegui import core
+
+    core.app.config.add_run_config(
+        reload=False,
+        title='Detective Game Bench',
+        viewport='',
+        favicon=None,
+        dark=False,
+        language='en-US',
+        binding_refresh_interval=0.1,
+        reconnect_timeout=3.0,
+        message_history_length=1000,
+        tailwind=True,
+        prod_js=True,
+        show_welcome_message=False,
+    )
+    nicegui.storage.set_storage_secret('bench secret')
+
+
+async def flush(seconds=0.05):
+    """Даёт циклу отправки клиента разослать накопленные обновления."""
+    await asyncio.sleep(seconds)
+
+
+async def run_case(user, case, meter, repeat, max_seconds):
+    rerender = []
+    rerender_socket = []
+
+    deadline = time.perf_counter() + max_seconds
+    for _ in range(repeat):
+        await user.open(case.path)
+        await flush()
+        meter.take(user.client.id)
+
+        with user.client:
+            if not case.clears_itself:
+                case.container.clear()
+            rerender.append(case.build())
+        await flush()
+        rerender_socket.append(meter.take(user.client.id))
+        user.client.delete()
+        if time.perf_counter() > deadline:
+            break
+
+    first_times = [seconds for seconds, _ in case.first]
+    return {
+        'first_render': {
+            **summarize(first_times),
+            'elements': case.first[-1][1],
+            'page_bytes': meter.page_bytes,
+        },
+        'rerender': {
+            **summarize([seconds for seconds, _ in rerender]),
+            'elements': rerender[-1][1],
+            'socket_bytes': rerender_socket[-1][0],
+            'socket_messages': rerender_socket[-1][1],
+        },
+    }
+
+
+async def run_cases(cases, repeat, max_seconds):
+    import httpx
+    from nicegui import core
+    from nicegui.testing.user import User
+
+    meter = SocketMeter()
+    meter.install()
+    results = {}
+    async with core.app.router.lifespan_context(core.app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(core.app), base_url='http://test',
+                                     event_hooks={'response': [meter.on_response]}) as http:
+            user = User(http)
+            for case in cases:
+                results[case.name] = await run_case(user, case, meter, repeat, max_seconds)
+    return results
+
+
+def print_results(results, baseline=None):
+    base = (baseline or {}).get('results', {})
+    header = (f"{'экран':44} {'p50 мс':>9} {'элементов':>10} {'страница КБ':>12} "
+              f"{'перестр. мс':>12} {'сокет КБ':>9}")
+    print(header + (f" {'к базе':>8}" if base else ''))
+    for name, stats in results.items():
+        first, again = stats['first_render'], stats['rerender']
+        line = (f"{name:44} {first['p50_ms']:9.2f} {first['elements']:10d} {first['page_bytes'] / 1024:12.1f} "
+                f"{again['p50_ms']:12.2f} {again['socket_bytes'] / 1024:9.1f}")
+        previous = base.get(name, {}).get('first_render', {})
+        if previous.get('p50_ms'):
+            line += f" {first['p50_ms'] / previous['p50_ms']:7.2f}x"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк построения экранов UI")
+    parser.add_argument('--size', choices=sorted(SIZES), default='small')
+    parser.add_argument('--logs', type=int, default=50_000, help="Строк логов в создаваемом наборе")
+    parser.add_argument('--workdir', help="Каталог набора данных; если в нём есть manifest.json, набор переиспользуется")
+    parser.add_argument('--repeat', type=int, default=10, help="Построений на экран")
+    parser.add_argument('--max-seconds', type=float, default=20.0, help="Ограничение времени на экран")
+    parser.add_argument('--only', nargs='*', help="Префиксы экранов (например, user_ui codenames)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help="Записать результаты в JSON файл")
+    parser.add_argument('--compare', help="JSON с прошлыми результатами для сравнения")
+    args = parser.parse_args()
+
+    json_path = os.path.abspath(args.json) if args.json else None
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix='detective-ui-'))
+    manifest_path = os.path.join(workdir, 'manifest.json')
+    # Хранилище NiceGUI (.nicegui) - в каталоге набора, а не в репозитории
+    os.environ['NICEGUI_STORAGE_PATH'] = os.path.join(workdir, '.nicegui')
+    sys.path.insert(0, REPO_ROOT)
+
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+        print(f"Используется набор {manifest['size']} из {workdir}")
+    else:
+        start = time.perf_counter()
+        manifest = generate_dataset(workdir, args.size, args.seed, args.logs)
+        print(f"Набор {args.size} создан за {time.perf_counter() - start:.1f} с")
+
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        cases = [case for case in build_cases(manifest)
+                 if not args.only or any(case.name.startswith(prefix) for prefix in args.only)]
+        for case in cases:
+            register_page(case)
+        prepare_simulation()
+        results = asyncio.run(run_cases(cases, args.repeat, args.max_seconds))
+    finally:
+        os.chdir(previous_cwd)
+
+    report = {
+        'environment': environment(),
+        'dataset': {key: value for key, value in manifest.items() if key not in ('user_ids', 'game_ids')},
+        'settings': {'repeat': args.repeat, 'max_seconds': args.max_seconds},
+        'results': results,
+    }
+    print_results(results, baseline)
+
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    if not args.workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,16 @@
 # src/__init__.py
 
 # This file can include initialization code for the entire package, if needed.
-# For example, import key modules to make them available directly from the package.
-
-# Import necessary classes and modules from submodules
-from .ui.user_ui import UserUI
-from src.services.user.user_service import UserService
-from .models.user import User
+# Key classes are loaded on first access, so importing one module of the package
+# (e.g. src.models.user) does not load the whole application.
+from src.lazy_exports import lazy_exports
 
 # Define the public API of the package
 # The following line specifies what will be available when importing from this package.
-__all__ = ['UserUI', 'UserService', 'User']
\ No newline at end of file
+__all__ = ['UserUI', 'UserService', 'User']
+
+__getattr__ = lazy_exports(__name__, {
+    'UserUI': '.ui.user_ui',
+    'UserService': '.services.user.user_service',
+    'User': '.models.user',
+})
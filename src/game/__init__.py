@@ -1,8 +1,14 @@
 # src/game/__init__.py
 
-from .game_state_service import GameStateService
-from .game_dialog import GameDialog
-from .game_ui import GameUI
-from .game_room_management import GameRoomManagement
+from src.lazy_exports import lazy_exports
 
-__all__ = ['GameStateService', 'GameDialog', 'GameUI', 'GameRoomManagement']
\ No newline at end of file
+__all__ = ['GameStateService', 'GameStateDraft', 'GameDialog', 'GameUI', 'GameRoomManagement']
+
+# Экраны загружаются при первом обращении: сервисам пакета они не нужны
+__getattr__ = lazy_exports(__name__, {
+    'GameStateService': '.game_state_service',
+    'GameStateDraft': '.game_state_draft',
+    'GameDialog': '.game_dialog',
+    'GameUI': '.game_ui',
+    'GameRoomManagement': '.game_room_management',
+})
@@ -4,15 +4,19 @@ import os, json, time
 from src.game import GameStateService
 from src.services.user.user_service import UserService
 from src.services.log.log_services import LogService
+from src.services.metrics import timed_storage
 
 
 class GameRoomManagement:
-    def __init__(self, filepath='data/gameRoomState.json', game_ui=None):
+    def __init__(self, filepath='data/gameRoomState.json',
+                 user_service=None, game_state_service=None, log_service=None):
         self.filepath = filepath
-        self.user_service = UserService()
-        self.game_state_service = GameStateService()  # Теперь использует обновленный класс с файлами для каждой игры
-        self.log_service = LogService()
-        self.game_ui = game_ui
+        self.user_service = user_service or UserService()
+        self.game_state_service = game_state_service or GameStateService()  # Теперь использует обновленный класс с файлами для каждой игры
+        self.log_service = log_service or LogService()
+        # Экземпляр общий для всех клиентов: экран клиента (GameUI) передаётся в методы явно
+        # {room_id: game_id}, с которыми в последний раз обновлялся каталог игр
+        self._room_links = None
         self.ensure_file_exists()
 
     def ensure_file_exists(self):
@@ -23,6 +27,7 @@ class GameRoomManagement:
         if not os.path.exists(self.filepath):
             self.save({})
 
+    @timed_storage
     def load(self):
         try:
             with open(self.filepath, 'r', encoding='utf-8') as file:
@@ -31,6 +36,7 @@ class GameRoomManagement:
             print("❌ Error: Could not load game state data.")
             return {}
 
+    @timed_storage
     def save(self, data):
         try:
             directory = os.path.dirname(self.filepath)
@@ -51,11 +57,18 @@ class GameRoomManagement:
 
             # Replace the original file with the temporary one
             os.replace(temp_filepath, self.filepath)
-            return True
         except Exception as e:
             print(f"❌ Error writing game state to file: {e}")
             return False
 
+        # Список комнат игры в каталоге меняется только при создании и удалении
+        # комнаты или смене её game_id, а не при каждом ходе
+        room_links = {room_id: room.get('game_id') for room_id, room in data.items() if isinstance(room, dict)}
+        if room_links != self._room_links:
+            self.game_state_service.sync_room_links(data)
+            self._room_links = room_links
+        return True
+
     def room_exists(self, room_id):
         data = self.load()
         return room_id in data
@@ -246,9 +259,14 @@ class GameRoomManagement:
 
         return data[room_id].get('current_location', None)
 
-    def check_for_updates(self):
-        """Проверяет обновления в игре и обновляет интерфейс при необходимости"""
-        if not hasattr(self, 'game_ui') or self.game_ui is None:
+    def check_for_updates(self, room_data=None, game_ui=None):
+        """
+        Проверяет обновления в игре и обновляет интерфейс при необходимости
+
+        :param room_data: Снимок комнаты из общего тика; если не передан, комната загружается из файла
+        :param game_ui: GameUI клиента, интерфейс которого нужно обновить
+        """
+        if game_ui is None:
 
             self.log_service.add_error_log(
                 error_message="Ошибка при проверке обновлений: game_ui не инициализирован",
@@ -256,17 +274,18 @@ class GameRoomManagement:
             )
             return
 
-        data = self.load()
         room_id = app.storage.user.get('game_state_id')
+        if room_id and room_data is None:
+            room_data = self.load().get(room_id)
 
-        if not room_id or room_id not in data:
+        if not room_id or not room_data:
             return
 
-        last_move_time = data[room_id].get('last_visited_at', 0)
+        last_move_time = room_data.get('last_visited_at', 0)
 
-        if hasattr(self.game_ui, 'last_update') and last_move_time > self.game_ui.last_update:
-            self.game_ui.show_game_interface
-            self.game_ui.last_update = last_move_time
+        if hasattr(game_ui, 'last_update') and last_move_time > game_ui.last_update:
+            game_ui.show_game_interface
+            game_ui.last_update = last_move_time
 
             self.log_service.add_system_log(
                 user_id=app.storage.user.get('user_id'),
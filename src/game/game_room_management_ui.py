@@ -1,38 +1,56 @@
 from nicegui import ui, app
 
-from src.services.user.user_service import UserService
-from src.game.game_state_service import GameStateService
-from src.game.game_room_management import GameRoomManagement
+from src.services.service_container import ServiceContainer
 
 
 class GameRoomManagementUI:
-    def __init__(self):
+    # Количество карточек комнат на одной странице
+    PAGE_SIZE = 20
+
+    STATUS_FILTERS = {
+        'all': 'Все статусы',
+        'playing': 'Активные',
+        'finished': 'Завершенные'
+    }
+
+    def __init__(self, services=None):
         """
         Инициализирует UI для управления игровыми комнатами
+
+        :param services: Контейнер общих сервисов (по умолчанию - общий для процесса)
         """
-        self.room_manager = GameRoomManagement()
-        self.user_service = UserService()
-        self.game_state_service = GameStateService()
+        services = services or ServiceContainer.get()
+        self.room_manager = services.room_management
+        self.user_service = services.user_service
+        self.game_state_service = services.game_state_service
         self.log_service = self.room_manager.log_service
 
         # Данные о комнатах и играх
         self.room_data = {}
-        self.game_ids = []  # Список ID игр вместо словаря всех игр
+        self.game_catalog = {}  # Каталог игр: game_id -> метаданные для списков
+        self.game_ids = []
         self.display_container = None
 
+        # Состояние списка: текущая страница и фильтры
+        self.page = 1
+        self.status_filter = 'all'
+        self.game_filter = ''
+        self.search_query = ''
+
     def load_data(self):
         """Загружает данные о комнатах и список доступных игр"""
         self.room_data = self.room_manager.load()
-        # Получаем список всех ID игр вместо загрузки всех данных
-        self.game_ids = self.game_state_service.list_all_games()
+        # Читаем только каталог игр, файлы самих игр не открываются
+        self.game_catalog = self.game_state_service.load_catalog()
+        self.game_ids = sorted(self.game_catalog)
+
+    def get_usernames_by_ids(self, user_ids):
+        """Получает имена пользователей для набора ID из справочника пользователей"""
+        return self.user_service.directory.get_usernames(set(user_ids), 'Неизвестный пользователь')
 
     def get_username_by_id(self, user_id):
         """Получает имя пользователя по его ID"""
-        users = self.user_service.load_data()
-        for user in users:
-            if user['id'] == user_id:
-                return user.get('username', 'Неизвестный пользователь')
-        return 'Неизвестный пользователь'
+        return self.get_usernames_by_ids([user_id])[user_id]
 
     def get_location_name_by_id(self, location_id, game_id):
         """Получает название локации по ее ID и ID игры"""
@@ -59,7 +77,7 @@ class GameRoomManagementUI:
             room_id_input = ui.input(label='ID комнаты').classes('w-full mb-4')
             game_id_select = ui.select(
                 label='ID игры',
-                options=self.game_ids if self.game_ids else []
+                options=self.game_state_service.get_game_options(self.game_catalog)
             ).classes('w-full mb-4')
 
             def confirm_create():
@@ -159,10 +177,10 @@ class GameRoomManagementUI:
                 {'name': 'username', 'label': 'Пользователь', 'field': 'username', 'align': 'center'},
             ]
             if user_list:
-                with ui.table(columns=self.column, rows=[]).classes('w-full') as table:
-                    for user_id in user_list:
-                        username = self.get_username_by_id(user_id)
-                        table.rows.append({"user_id": user_id, "username": username})
+                # Имена всех пользователей комнаты получаем одним запросом
+                usernames = self.get_usernames_by_ids(user_list)
+                rows = [{"user_id": user_id, "username": usernames[user_id]} for user_id in user_list]
+                ui.table(columns=self.column, rows=rows).classes('w-full')
             else:
                 ui.label('В комнате нет пользователей').classes('text-gray-500 my-1')
 
@@ -283,7 +301,7 @@ class GameRoomManagementUI:
                 # Селект с опциями - используем список ID игр
                 current_game_id = self.room_data[room_id].get('game_id')
                 selected_game_id = ui.select(
-                    options=self.game_ids if self.game_ids else [],
+                    options=self.game_state_service.get_game_options(self.game_catalog),
                     value=current_game_id if current_game_id in self.game_ids else None
                 ).classes('w-full')
 
@@ -303,86 +321,152 @@ class GameRoomManagementUI:
             self.display_container.clear()
             self.create_room_cards()
 
+    def get_filtered_room_ids(self):
+        """Возвращает ID комнат, подходящих под текущие фильтры"""
+        query = self.search_query.strip().lower()
+        room_ids = []
+        for room_id, room in self.room_data.items():
+            if self.status_filter != 'all' and room.get('status') != self.status_filter:
+                continue
+            if self.game_filter and room.get('game_id') != self.game_filter:
+                continue
+            if query and query not in str(room_id).lower():
+                continue
+            room_ids.append(room_id)
+        return sorted(room_ids)
+
+    def set_filter(self, name, value):
+        """Изменяет фильтр списка комнат и возвращает на первую страницу"""
+        setattr(self, name, value or ('all' if name == 'status_filter' else ''))
+        self.page = 1
+        self.rerender_room_cards()
+
+    def set_page(self, page):
+        self.page = page
+        self.rerender_room_cards()
+
+    def rerender_room_cards(self):
+        """Перерисовывает список без повторного чтения файлов"""
+        if self.display_container:
+            self.display_container.clear()
+            self.create_room_cards()
+
     def create_room_cards(self):
-        """Создает карточки для всех комнат"""
-        from datetime import datetime
+        """Создает карточки комнат текущей страницы"""
+        room_ids = self.get_filtered_room_ids()
+        total_pages = max(1, (len(room_ids) + self.PAGE_SIZE - 1) // self.PAGE_SIZE)
+        self.page = min(max(1, self.page), total_pages)
+        page_room_ids = room_ids[(self.page - 1) * self.PAGE_SIZE:self.page * self.PAGE_SIZE]
+
+        with self.display_container:
+            with ui.row().classes('w-full items-center mb-2'):
+                ui.label(f'Найдено комнат: {len(room_ids)} из {len(self.room_data)}').classes('text-gray-600')
+                if total_pages > 1:
+                    ui.pagination(1, total_pages, direction_links=True, value=self.page,
+                                  on_change=lambda e: self.set_page(e.value)).classes('ml-auto')
 
-        if not self.room_data:
-            with self.display_container:
+            if not page_room_ids:
                 ui.label('Нет доступных комнат').classes('text-xl text-gray-500 text-center w-full my-8')
-            return
+                return
 
-        with self.display_container:
-            for room_id, room in self.room_data.items():
-                status_class = 'text-green-500' if room.get('status') == 'playing' else 'text-red-500'
+            for room_id in page_room_ids:
+                room = self.room_data[room_id]
                 status_text = 'Активна' if room.get('status') == 'playing' else 'Завершена'
-                game_id = room.get("game_id", "Не указан")
-
-                # Проверяем существование игры в новом формате
-                game_exists = game_id in self.game_ids
+                user_count = len(room.get('users', []))
 
                 with ui.card().classes('w-full p-4 mb-4'):
-                    with ui.expansion(f'Комната: {room_id}', icon='meeting_room', group='rooms').classes('w-full'):
-                        with ui.column().classes('w-full'):
-                            # Основная информация о комнате
-                            with ui.row().classes('w-full items-center'):
-                                ui.label(f'Статус: ').classes('font-bold')
-                                ui.label(status_text).classes(f'{status_class} mr-4')
-
-                                # Добавляем индикатор существования игры
-                                game_id_text = f'ID игры: {game_id}'
-                                if not game_exists and game_id != "Не указан":
-                                    game_id_text += ' (Файл игры не найден)'
-                                    game_id_class = 'mr-4 text-red-500'
-                                else:
-                                    game_id_class = 'mr-4'
-
-                                ui.label(game_id_text).classes(game_id_class)
-
-                                last_visited = room.get('last_visited_at', 0)
-                                last_visited_str = datetime.fromtimestamp(last_visited).strftime(
-                                    '%d.%m.%Y %H:%M:%S') if last_visited else "Никогда"
-                                ui.label(f'Последнее посещение: {last_visited_str}').classes('mr-4')
-
-                                ui.label(f'Текущий ход: {room.get("move", 0)}').classes('mr-4')
-
-                            # Текущая локация и пользователи
-                            with ui.row().classes('w-full mt-2'):
-                                ui.label(f'Текущая локация: {room.get("current_location", "Не определена")}').classes(
-                                    'mr-4')
-
-                                user_count = len(room.get('users', []))
-                                ui.label(f'Пользователей в комнате: {user_count}').classes('mr-4')
-
-                            # Кнопки действий
-                            with ui.row().classes('w-full justify-between mt-4'):
-                                # Кнопки информации
-                                with ui.row():
-                                    ui.button('История перемещений', icon='history',
-                                              on_click=lambda rid=room_id: self.show_location_history(rid)).classes(
-                                        'mr-2 bg-blue-600 text-white')
-
-                                    ui.button('Пользователи', icon='people',
-                                              on_click=lambda rid=room_id: self.show_users_in_room(rid)).classes(
-                                        'mr-2 bg-blue-600 text-white')
-
-                                    ui.button('Изменить ID игры',
-                                              on_click=lambda rid=room_id: self.open_change_game_id_dialog(
-                                                  rid)).classes('mr-2 bg-blue-600 text-white')
-
-                                # Кнопки управления
-                                with ui.row():
-                                    ui.button('Сбросить', icon='refresh',
-                                              on_click=lambda rid=room_id: self.reset_room(rid)) \
-                                        .classes('mr-2 bg-yellow-500 text-white')
-
-                                    ui.button('Завершить', icon='done_all',
-                                              on_click=lambda rid=room_id: self.finish_game(rid)) \
-                                        .classes('mr-2 bg-orange-500 text-white')
-
-                                    ui.button('Удалить', icon='delete',
-                                              on_click=lambda rid=room_id: self.delete_room_confirmation(rid)) \
-                                        .classes('bg-red-500 text-white')
+                    # Содержимое карточки строится только при первом раскрытии
+                    expansion = ui.expansion(
+                        f'Комната: {room_id}',
+                        caption=f'{status_text} · игра {room.get("game_id", "Не указан")} · игроков: {user_count}',
+                        icon='meeting_room',
+                        group='rooms'
+                    ).classes('w-full')
+                    with expansion:
+                        content = ui.column().classes('w-full')
+
+                    def on_expand(e, rid=room_id, container=content):
+                        if e.value and not container.default_slot.children:
+                            with container:
+                                self.create_room_details(rid)
+
+                    expansion.on_value_change(on_expand)
+
+    def create_room_details(self, room_id):
+        """Создает содержимое карточки комнаты"""
+        from datetime import datetime
+
+        room = self.room_data.get(room_id, {})
+        status_class = 'text-green-500' if room.get('status') == 'playing' else 'text-red-500'
+        status_text = 'Активна' if room.get('status') == 'playing' else 'Завершена'
+        game_id = room.get("game_id", "Не указан")
+
+        # Проверяем существование игры по каталогу
+        game_exists = game_id in self.game_ids
+
+        # Основная информация о комнате
+        with ui.row().classes('w-full items-center'):
+            ui.label(f'Статус: ').classes('font-bold')
+            ui.label(status_text).classes(f'{status_class} mr-4')
+
+            # Добавляем индикатор существования игры
+            game_id_text = f'ID игры: {game_id}'
+            if not game_exists and game_id != "Не указан":
+                game_id_text += ' (Файл игры не найден)'
+                game_id_class = 'mr-4 text-red-500'
+            else:
+                game_id_class = 'mr-4'
+
+            ui.label(game_id_text).classes(game_id_class)
+
+            game_title = self.game_catalog.get(game_id, {}).get('title')
+            if game_title:
+                ui.label(f'Игра: {game_title}').classes('mr-4 text-gray-600')
+
+            last_visited = room.get('last_visited_at', 0)
+            last_visited_str = datetime.fromtimestamp(last_visited).strftime(
+                '%d.%m.%Y %H:%M:%S') if last_visited else "Никогда"
+            ui.label(f'Последнее посещение: {last_visited_str}').classes('mr-4')
+
+            ui.label(f'Текущий ход: {room.get("move", 0)}').classes('mr-4')
+
+        # Текущая локация и пользователи
+        with ui.row().classes('w-full mt-2'):
+            ui.label(f'Текущая локация: {room.get("current_location", "Не определена")}').classes(
+                'mr-4')
+
+            user_count = len(room.get('users', []))
+            ui.label(f'Пользователей в комнате: {user_count}').classes('mr-4')
+
+        # Кнопки действий
+        with ui.row().classes('w-full justify-between mt-4'):
+            # Кнопки информации
+            with ui.row():
+                ui.button('История перемещений', icon='history',
+                          on_click=lambda rid=room_id: self.show_location_history(rid)).classes(
+                    'mr-2 bg-blue-600 text-white')
+
+                ui.button('Пользователи', icon='people',
+                          on_click=lambda rid=room_id: self.show_users_in_room(rid)).classes(
+                    'mr-2 bg-blue-600 text-white')
+
+                ui.button('Изменить ID игры',
+                          on_click=lambda rid=room_id: self.open_change_game_id_dialog(
+                              rid)).classes('mr-2 bg-blue-600 text-white')
+
+            # Кнопки управления
+            with ui.row():
+                ui.button('Сбросить', icon='refresh',
+                          on_click=lambda rid=room_id: self.reset_room(rid)) \
+                    .classes('mr-2 bg-yellow-500 text-white')
+
+                ui.button('Завершить', icon='done_all',
+                          on_click=lambda rid=room_id: self.finish_game(rid)) \
+                    .classes('mr-2 bg-orange-500 text-white')
+
+                ui.button('Удалить', icon='delete',
+                          on_click=lambda rid=room_id: self.delete_room_confirmation(rid)) \
+                    .classes('bg-red-500 text-white')
 
     def create_ui(self):
         """Создает интерфейс управления комнатами"""
@@ -399,6 +483,17 @@ class GameRoomManagementUI:
                 ui.button('Создать комнату', icon='add', on_click=lambda: self.create_new_room_dialog()) \
                     .classes('bg-green-500 text-white')
 
+            # Фильтры списка комнат
+            with ui.row().classes('w-full items-center gap-4 mb-4'):
+                ui.input('ID комнаты', value=self.search_query,
+                         on_change=lambda e: self.set_filter('search_query', e.value)) \
+                    .props('clearable debounce=300').classes('w-48')
+                ui.select(self.STATUS_FILTERS, value=self.status_filter, label='Статус',
+                          on_change=lambda e: self.set_filter('status_filter', e.value)).classes('w-48')
+                ui.select({'': 'Все игры', **self.game_state_service.get_game_options(self.game_catalog)},
+                          value=self.game_filter, label='Игра',
+                          on_change=lambda e: self.set_filter('game_filter', e.value)).classes('w-64')
+
             # Контейнер для карточек комнат
             self.display_container = ui.column().classes('w-full max-h-[70vh] overflow-auto')
             self.create_room_cards()
\ No newline at end of file
@@ -0,0 +1,243 @@
+import copy
+import csv
+import io
+import json
+
+
+class GameStateDraft:
+    """
+    Черновик состояния игры в памяти.
+
+    Все изменения сценария накапливаются в копии данных игры и записываются
+    на диск одной операцией при вызове GameStateService.commit_draft().
+    При записи в текущие данные игры переносятся только измененные записи,
+    поэтому правки других разделов, сделанные за это время другим
+    администратором, сохраняются. Если ту же запись успели изменить
+    на диске, она попадает в conflicts и черновик не записывается.
+    """
+
+    # Разделы, которые можно заполнять массово (из таблицы или файла)
+    SPRAVOCHNIK_SECTIONS = ('people', 'gosplace', 'obplace')
+    IMPORT_SECTIONS = SPRAVOCHNIK_SECTIONS + ('place', 'tooltip')
+
+    def __init__(self, game_id, data, version=None):
+        """
+        :param version: mtime_ns файла игры, из которого прочитаны data; None - неизвестна
+        """
+        self.game_id = game_id
+        self.data = copy.deepcopy(data)
+        # Данные игры на момент открытия черновика (или последней записи)
+        self.base = copy.deepcopy(data)
+        self.base_version = version
+        self.changes = []
+        self.conflicts = []
+
+    @property
+    def is_dirty(self):
+        """Есть ли несохраненные изменения."""
+        return bool(self.changes)
+
+    def _mark(self, section, key=None):
+        self.changes.append((section, key))
+
+    def _entry(self, data, section, key):
+        """Значение записи (раздел или запись раздела); None, если её нет."""
+        if key is None:
+            return data.get(section)
+        if section in self.SPRAVOCHNIK_SECTIONS:
+            data = data.get('spravochnik', {})
+        return data.get(section, {}).get(key)
+
+    def _set_entry(self, data, section, key, value):
+        if key is None:
+            data[section] = copy.deepcopy(value)
+            return
+        if section in self.SPRAVOCHNIK_SECTIONS:
+            data = data.setdefault('spravochnik', {})
+        data.setdefault(section, {})[key] = copy.deepcopy(value)
+
+    def edited_entries(self):
+        """Измененные записи (раздел, ключ) без повторов, в порядке изменения."""
+        return list(dict.fromkeys(self.changes))
+
+    def find_conflicts(self, current):
+        """Измененные в черновике записи, которые после открытия черновика изменились и в current."""
+        return [(section, key) for section, key in self.edited_entries()
+                if self._entry(current, section, key) != self._entry(self.base, section, key)]
+
+    def merge_into(self, current):
+        """Копия current с перенесенными из черновика измененными записями."""
+        merged = copy.deepcopy(current)
+        for section, key in self.edited_entries():
+            self._set_entry(merged, section, key, self._entry(self.data, section, key))
+        return merged
+
+    def rebase(self, data, version=None):
+        """Начинает черновик заново от записанных данных data."""
+        self.data = copy.deepcopy(data)
+        self.base = copy.deepcopy(data)
+        self.base_version = version
+        self.changes.clear()
+        self.conflicts = []
+
+    def set_start(self, text):
+        """Set the starting text of the game."""
+        self.data['start'] = text
+        self._mark('start')
+
+    def set_gazeta(self, text):
+        """Set gazeta text."""
+        self.data['gazeta'] = text
+        self._mark('gazeta')
+
+    def set_police(self, text=None, delo=None):
+        """Set police information."""
+        police = self.data.setdefault('112102', {'text': '', 'delo': ''})
+        if text is not None:
+            police['text'] = text
+        if delo is not None:
+            police['delo'] = delo
+        self._mark('112102')
+
+    def set_morg(self, text=None, vskrytie=None):
+        """Set morgue information."""
+        morg = self.data.setdefault('440321', {'text': '', 'vskrytie': ''})
+        if text is not None:
+            morg['text'] = text
+        if vskrytie is not None:
+            morg['vskrytie'] = vskrytie
+        self._mark('440321')
+
+    def set_zags(self, text=None, otchet=None):
+        """Set ZAGS information."""
+        zags = self.data.setdefault('220123', {'text': '', 'otchet': ''})
+        if text is not None:
+            zags['text'] = text
+        if otchet is not None:
+            zags['otchet'] = otchet
+        self._mark('220123')
+
+    def add_spravochnik_entry(self, section, entry_id, text):
+        """Add an entry to one of the spravochnik sections (people, gosplace, obplace)."""
+        if section not in self.SPRAVOCHNIK_SECTIONS:
+            raise ValueError(f"Неизвестный раздел справочника: {section}")
+        spravochnik = self.data.setdefault('spravochnik', {})
+        spravochnik.setdefault(section, {})[entry_id] = text
+        self._mark(section, entry_id)
+
+    def add_people(self, person_id, person_text):
+        """Add person information to the spravochnik."""
+        self.add_spravochnik_entry('people', person_id, person_text)
+
+    def add_gosplace(self, place_id, place_text):
+        """Add government place information to the spravochnik."""
+        self.add_spravochnik_entry('gosplace', place_id, place_text)
+
+    def add_obplace(self, place_id, place_text):
+        """Add public place information to the spravochnik."""
+        self.add_spravochnik_entry('obplace', place_id, place_text)
+
+    def add_place(self, place_id, text):
+        """Add place information."""
+        self.data.setdefault('place', {})[place_id] = text
+        self._mark('place', place_id)
+
+    def add_tooltip(self, count, location_id):
+        """Add tooltip information."""
+        self.data.setdefault('tooltip', {})[count] = location_id
+        self._mark('tooltip', count)
+
+    def set_culprit(self, id_culprit, name_culprit, end_text):
+        """Set culprit information."""
+        self.data['isCulprit'] = {
+            'id': id_culprit,
+            'name': name_culprit,
+            'endText': end_text
+        }
+        self._mark('isCulprit')
+
+    def set_status(self, new_status):
+        """Set game status."""
+        self.data['status'] = new_status
+        self._mark('status')
+
+    def import_rows(self, section, rows):
+        """
+        Добавляет в раздел набор строк (ID, текст).
+
+        :param section: Раздел: people, gosplace, obplace, place или tooltip
+        :param rows: Итерируемый набор пар (ID, текст)
+        :return: Количество добавленных записей
+        """
+        if section not in self.IMPORT_SECTIONS:
+            raise ValueError(f"Раздел {section} не поддерживает импорт")
+
+        imported = 0
+        for entry_id, text in rows:
+            if section in self.SPRAVOCHNIK_SECTIONS:
+                self.add_spravochnik_entry(section, entry_id, text)
+            elif section == 'place':
+                self.add_place(entry_id, text)
+            else:
+                self.add_tooltip(entry_id, text)
+            imported += 1
+        return imported
+
+    @staticmethod
+    def parse_table(text):
+        """
+        Разбирает вставленную таблицу в список пар (ID, текст).
+
+        Каждая строка — одна запись. ID отделяется от текста табуляцией
+        (копирование из таблиц), точкой с запятой или запятой.
+        Пустые строки и строки без текста пропускаются.
+        """
+        rows = []
+        if not text:
+            return rows
+
+        lines = [line for line in text.splitlines() if line.strip()]
+        if not lines:
+            return rows
+
+        # Разделитель определяем по первой строке
+        first_line = lines[0]
+        if '\t' in first_line:
+            delimiter = '\t'
+        elif ';' in first_line:
+            delimiter = ';'
+        else:
+            delimiter = ','
+
+        for record in csv.reader(io.StringIO('\n'.join(lines)), delimiter=delimiter):
+            if len(record) < 2:
+                continue
+            entry_id = record[0].strip()
+            entry_text = delimiter.join(record[1:]).strip()
+            if entry_id and entry_text:
+                rows.append((entry_id, entry_text))
+        return rows
+
+    @classmethod
+    def parse_file(cls, filename, content):
+        """
+        Разбирает загруженный файл в список пар (ID, текст).
+
+        JSON-файл может быть объектом {ID: текст} или списком объектов
+        с полями id и text. Остальные форматы (csv, tsv, txt) разбираются
+        как вставленная таблица.
+        """
+        if isinstance(content, bytes):
+            content = content.decode('utf-8-sig')
+
+        if filename.lower().endswith('.json'):
+            data = json.loads(content)
+            if isinstance(data, dict):
+                return [(str(key), str(value)) for key, value in data.items()]
+            return [
+                (str(item['id']), str(item['text']))
+                for item in data
+                if isinstance(item, dict) and item.get('id') and item.get('text')
+            ]
+
+        return cls.parse_table(content)
@@ -2,13 +2,26 @@ import json
 import os
 import time
 import shutil
+import threading
+from contextlib import contextmanager
 from click import get_app_dir
 from nicegui import app
 
+from src.game.game_state_draft import GameStateDraft
+from src.services.metrics import timed_storage
+
 
 class GameStateService:
-    def __init__(self, directory='data/games'):
+    # Количество символов начального текста, используемых как название игры
+    TITLE_SNIPPET_LENGTH = 80
+
+    def __init__(self, directory='data/games', catalog_file='data/gameCatalog.json'):
         self.directory = directory
+        self.catalog_file = catalog_file
+        # (mtime_ns файла каталога, разобранный каталог); каталог не изменяется на месте
+        self._catalog_cache = None
+        # Запись черновиков: чтение текущих данных и сохранение без вклинивания других записей
+        self._commit_lock = threading.Lock()
         self.ensure_directory_exists()
 
     def ensure_directory_exists(self):
@@ -19,6 +32,7 @@ class GameStateService:
         """Return the filepath for a specific game's state file."""
         return os.path.join(self.directory, f"{game_id}.json")
 
+    @timed_storage
     def load(self, game_id):
         """Load a specific game's state from its file."""
         filepath = self.get_game_filepath(game_id)
@@ -32,6 +46,7 @@ class GameStateService:
             print(f"❌ Error: Could not load game state data for game {game_id}.")
             return None
 
+    @timed_storage
     def save(self, game_id, data):
         """Save a specific game's state to its file."""
         try:
@@ -55,14 +70,203 @@ class GameStateService:
 
             # Replace the original file with the temporary one
             os.replace(temp_filepath, filepath)
-            return True
         except Exception as e:
             print(f"❌ Error writing game state to file for game {game_id}: {e}")
             return False
 
-    def create_game_state(self, game_id):
-        """Create a new game state file for the given game ID."""
-        game_state = {
+        self.update_catalog_entry(game_id, data)
+        return True
+
+    # ----- Каталог игр -----
+
+    def load_catalog(self):
+        """
+        Load the games catalog index.
+
+        The catalog holds list-view metadata for every game, so list screens
+        never open the game files themselves. It is kept current by save()
+        and delete_game_state(), so reading it does not touch the games
+        directory. It is rebuilt only if missing or unreadable; game files
+        changed outside the service are picked up by refresh_catalog().
+        """
+        catalog = self._read_catalog()
+        if catalog is None:
+            return self.rebuild_catalog()
+        return catalog
+
+    def _read_catalog(self):
+        """Read the catalog file, reusing the parsed copy while the file is unchanged; None if unusable."""
+        try:
+            mtime = os.stat(self.catalog_file).st_mtime_ns
+        except OSError:
+            return None
+        if self._catalog_cache is not None and self._catalog_cache[0] == mtime:
+            return self._catalog_cache[1]
+        try:
+            with open(self.catalog_file, 'r', encoding='utf-8') as file:
+                catalog = json.load(file)
+        except (json.JSONDecodeError, OSError):
+            print("❌ Error: Could not load games catalog, rebuilding.")
+            return None
+        self._catalog_cache = (mtime, catalog)
+        return catalog
+
+    def refresh_catalog(self):
+        """
+        Sync the catalog with the games directory on request.
+
+        Entries of game files added or modified since they were built are
+        rebuilt, entries of deleted files are dropped.
+        """
+        catalog = self._read_catalog()
+        if catalog is None:
+            return self.rebuild_catalog()
+
+        modified = {}
+        if os.path.exists(self.directory):
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.json'):
+                        modified[entry.name[:-len('.json')]] = int(entry.stat().st_mtime)
+
+        stale = [game_id for game_id, mtime in modified.items()
+                 if catalog.get(game_id, {}).get('modified') != mtime]
+        removed = [game_id for game_id in catalog if game_id not in modified]
+        if not stale and not removed:
+            return catalog
+
+        catalog = {game_id: entry for game_id, entry in catalog.items() if game_id in modified}
+        for game_id in stale:
+            rooms = catalog.get(game_id, {}).get('rooms', [])
+            catalog[game_id] = self.build_catalog_entry(game_id, self.load(game_id), rooms)
+        self.save_catalog(catalog)
+        return catalog
+
+    def save_catalog(self, catalog):
+        """Save the games catalog index atomically."""
+        try:
+            directory = os.path.dirname(self.catalog_file)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+
+            temp_filepath = f"{self.catalog_file}.tmp"
+            with open(temp_filepath, 'w', encoding='utf-8') as temp_file:
+                json.dump(catalog, temp_file, indent=4, ensure_ascii=False)
+            os.replace(temp_filepath, self.catalog_file)
+            self._catalog_cache = (os.stat(self.catalog_file).st_mtime_ns, catalog)
+            return True
+        except Exception as e:
+            self._catalog_cache = None
+            print(f"❌ Error writing games catalog: {e}")
+            return False
+
+    def build_catalog_entry(self, game_id, data, rooms=None):
+        """Build the catalog entry (title, section counts, status) for a game."""
+        data = data or {}
+        spravochnik = data.get('spravochnik') or {}
+
+        title = data.get('title')
+        if not title:
+            start_text = (data.get('start') or '').strip()
+            first_line = start_text.splitlines()[0] if start_text else ''
+            title = first_line[:self.TITLE_SNIPPET_LENGTH]
+
+        filepath = self.get_game_filepath(game_id)
+        modified = os.path.getmtime(filepath) if os.path.exists(filepath) else time.time()
+
+        return {
+            'id': game_id,
+            'title': title,
+            'status': data.get('status'),
+            'counts': {
+                'people': len(spravochnik.get('people') or {}),
+                'gosplace': len(spravochnik.get('gosplace') or {}),
+                'obplace': len(spravochnik.get('obplace') or {}),
+                'place': len(data.get('place') or {}),
+                'tooltip': len(data.get('tooltip') or {})
+            },
+            'has_culprit': bool((data.get('isCulprit') or {}).get('id')),
+            'modified': int(modified),
+            'rooms': sorted(rooms or [])
+        }
+
+    def rebuild_catalog(self):
+        """Rebuild the catalog by scanning every game file once."""
+        previous = {}
+        if os.path.exists(self.catalog_file):
+            try:
+                with open(self.catalog_file, 'r', encoding='utf-8') as file:
+                    previous = json.load(file)
+            except (json.JSONDecodeError, OSError):
+                previous = {}
+
+        catalog = {}
+        if os.path.exists(self.directory):
+            for filename in os.listdir(self.directory):
+                if not filename.endswith('.json'):
+                    continue
+                game_id = os.path.splitext(filename)[0]
+                rooms = previous.get(game_id, {}).get('rooms', [])
+                catalog[game_id] = self.build_catalog_entry(game_id, self.load(game_id), rooms)
+
+        self.save_catalog(catalog)
+        return catalog
+
+    def update_catalog_entry(self, game_id, data):
+        """Refresh a single game's catalog entry after its file was written."""
+        catalog = self._read_catalog()
+        if catalog is None:
+            # Каталог собирается заново вместе с уже записанной игрой
+            self.rebuild_catalog()
+            return
+        rooms = catalog.get(game_id, {}).get('rooms', [])
+        catalog = dict(catalog)
+        catalog[game_id] = self.build_catalog_entry(game_id, data, rooms)
+        self.save_catalog(catalog)
+
+    def sync_room_links(self, room_data):
+        """
+        Update the list of rooms using each game.
+
+        :param room_data: Словарь комнат {room_id: {'game_id': ..., ...}}
+        :return: True if the catalog changed
+        """
+        links = {}
+        for room_id, room in (room_data or {}).items():
+            game_id = room.get('game_id') if isinstance(room, dict) else None
+            if game_id:
+                links.setdefault(game_id, []).append(room_id)
+
+        catalog = dict(self.load_catalog())
+        changed = False
+        for game_id, entry in catalog.items():
+            rooms = sorted(links.get(game_id, []))
+            if entry.get('rooms') != rooms:
+                catalog[game_id] = {**entry, 'rooms': rooms}
+                changed = True
+
+        if changed:
+            self.save_catalog(catalog)
+        return changed
+
+    def get_catalog_entry(self, game_id):
+        """Return the catalog entry of a game or None."""
+        return self.load_catalog().get(game_id)
+
+    def get_game_options(self, catalog=None):
+        """Return {game_id: label} for game selectors, read from the catalog only."""
+        if catalog is None:
+            catalog = self.load_catalog()
+        options = {}
+        for game_id, entry in sorted(catalog.items()):
+            title = entry.get('title')
+            options[game_id] = f"{game_id} — {title}" if title else game_id
+        return options
+
+    @staticmethod
+    def default_game_state():
+        """Return the initial state structure of a new game."""
+        return {
             'start': None,
             'gazeta': '',
             'spravochnik': {
@@ -81,7 +285,10 @@ class GameStateService:
             },
             "tooltip": {}
         }
-        self.save(game_id, game_state)
+
+    def create_game_state(self, game_id):
+        """Create a new game state file for the given game ID."""
+        self.save(game_id, self.default_game_state())
 
     def game_exists(self, game_id):
         """Check if a game state file exists for the given game ID."""
@@ -95,68 +302,127 @@ class GameStateService:
             return self.load(game_id)
         return self.load(game_id)
 
+    def begin_edit(self, game_id):
+        """
+        Start an edit session for a game.
+
+        The game is loaded once; all changes are collected in the returned
+        draft and written with a single save by commit_draft().
+        """
+        # Версия берется до чтения: если файл изменится между ними, commit перечитает его
+        version = self._file_version(game_id)
+        data = self.load(game_id)
+        if data is None:
+            data = self.default_game_state()
+            version = None
+        return GameStateDraft(game_id, data, version)
+
+    def _file_version(self, game_id):
+        """mtime_ns файла игры или None, если файла нет."""
+        try:
+            return os.stat(self.get_game_filepath(game_id)).st_mtime_ns
+        except OSError:
+            return None
+
+    def commit_draft(self, draft):
+        """
+        Write all changes collected in a draft with one atomic save.
+
+        Only the entries edited in the draft are applied on top of the
+        current file, so concurrent edits of other entries are kept. If an
+        edited entry was also changed on disk since the draft was opened,
+        nothing is written and the entries are listed in draft.conflicts.
+        If the file has not changed since the draft was read, the draft's
+        snapshot is used instead of loading the file again.
+
+        :return: True if the draft was written; on False the changes stay in the draft
+        """
+        with self._commit_lock:
+            version = self._file_version(draft.game_id)
+            if version is not None and version == draft.base_version:
+                current = draft.base
+            else:
+                current = self.load(draft.game_id)
+            if current is None:
+                current = self.default_game_state()
+            draft.conflicts = draft.find_conflicts(current)
+            if draft.conflicts:
+                return False
+            merged = draft.merge_into(current)
+            if not self.save(draft.game_id, merged):
+                return False
+        draft.rebase(merged)
+        return True
+
+    @contextmanager
+    def edit_session(self, game_id):
+        """
+        Context manager that commits the draft on successful exit.
+
+        If the commit fails (a write error or a conflict with a concurrent
+        edit), the changes stay in the draft: draft.is_dirty is still True
+        and draft.conflicts lists the conflicting entries.
+        """
+        draft = self.begin_edit(game_id)
+        yield draft
+        if draft.is_dirty and not self.commit_draft(draft):
+            print(f"❌ Error: changes to game {game_id} were not saved, conflicts: {draft.conflicts}")
+
+    def import_section(self, game_id, section, rows):
+        """
+        Import many (ID, text) rows into a section with a single save.
+
+        :return: Number of imported rows; 0 if the changes were not saved
+        """
+        with self.edit_session(game_id) as draft:
+            imported = draft.import_rows(section, rows)
+        return 0 if draft.is_dirty else imported
+
+    def _edit(self, game_id, change):
+        """
+        Apply change(draft) to a game and save it.
+
+        :return: True if the change was saved
+        """
+        with self.edit_session(game_id) as draft:
+            change(draft)
+        return not draft.is_dirty
+
     def add_place(self, game_id, place_id, text):
         """Add place information to a game's state."""
-        game_data = self.ensure_game_exists(game_id)
-        game_data['place'][place_id] = text
-        self.save(game_id, game_data)
+        return self._edit(game_id, lambda draft: draft.add_place(place_id, text))
 
     def add_gazeta(self, game_id, text):
         """Add gazeta text to a game's state."""
-        game_data = self.ensure_game_exists(game_id)
-        game_data['gazeta'] = text
-        self.save(game_id, game_data)
+        return self._edit(game_id, lambda draft: draft.set_gazeta(text))
 
     def add_police(self, game_id, text=None, delo=None):
         """Add police information to a game's state."""
-        game_data = self.ensure_game_exists(game_id)
-        if text is not None:
-            game_data['112102']['text'] = text
-        if delo is not None:
-            game_data['112102']['delo'] = delo
-        self.save(game_id, game_data)
+        return self._edit(game_id, lambda draft: draft.set_police(text=text, delo=delo))
 
     def add_morg(self, game_id, text=None, vskrytie=None):
         """Add morgue information to a game's state."""
-        game_data = self.ensure_game_exists(game_id)
-        if text is not None:
-            game_data['440321']['text'] = text
-        if vskrytie is not None:
-            game_data['440321']['vskrytie'] = vskrytie
-        self.save(game_id, game_data)
+        return self._edit(game_id, lambda draft: draft.set_morg(text=text, vskrytie=vskrytie))
 
     def add_zags(self, game_id, text=None, otchet=None):
         """Add ZAGS information to a game's state."""
-        game_data = self.ensure_game_exists(game_id)
-        if text is not None:
-            game_data['220123']['text'] = text
-        if otchet is not None:
-            game_data['220123']['otchet'] = otchet
-        self.save(game_id, game_data)
+        return self._edit(game_id, lambda draft: draft.set_zags(text=text, otchet=otchet))
 
     def add_people(self, game_id, person_id, person_text):
         """Add person information to a game's spravochnik."""
-        game_data = self.ensure_game_exists(game_id)
-        game_data['spravochnik']['people'][person_id] = person_text
-        self.save(game_id, game_data)
+        return self._edit(game_id, lambda draft: draft.add_people(person_id, person_text))
 
     def add_gosplace(self, game_id, place_id, place_text):
         """Add government place information to a game's spravochnik."""
-        game_data = self.ensure_game_exists(game_id)
-        game_data['spravochnik']['gosplace'][place_id] = place_text
-        self.save(game_id, game_data)
+        return self._edit(game_id, lambda draft: draft.add_gosplace(place_id, place_text))
 
     def add_obplace(self, game_id, place_id, place_text):
         """Add public place information to a game's spravochnik."""
-        game_data = self.ensure_game_exists(game_id)
-        game_data['spravochnik']['obplace'][place_id] = place_text
-        self.save(game_id, game_data)
+        return self._edit(game_id, lambda draft: draft.add_obplace(place_id, place_text))
 
     def add_tooltip(self, game_id, count, location_id):
         """Add tooltip information to a game's state."""
-        game_data = self.load(game_id)
-        game_data['tooltip'][count] = location_id
-        self.save(game_id, game_data)
+        return self._edit(game_id, lambda draft: draft.add_tooltip(count, location_id))
 
     def get_game_state(self, game_id):
         """Get the entire state of a game."""
@@ -190,16 +456,17 @@ class GameStateService:
         filepath = self.get_game_filepath(game_id)
         if os.path.exists(filepath):
             os.remove(filepath)
+            catalog = self.load_catalog()
+            if game_id in catalog:
+                # Каталог из кэша не изменяется на месте
+                catalog = {key: entry for key, entry in catalog.items() if key != game_id}
+                self.save_catalog(catalog)
             return True
         return False
 
     def list_all_games(self):
-        """List all game IDs by scanning the games directory."""
-        if not os.path.exists(self.directory):
-            return []
-
-        game_files = [f for f in os.listdir(self.directory) if f.endswith('.json')]
-        return [os.path.splitext(f)[0] for f in game_files]
+        """List all game IDs from the catalog index."""
+        return sorted(self.load_catalog())
 
     def migrate_from_single_file(self, old_filepath='data/gameState.json'):
         """
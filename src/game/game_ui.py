@@ -1,28 +1,43 @@
 from nicegui import ui, app
 
-from src.services.user.user_service import UserService
-from src.game.game_state_service import GameStateService
 from src.game.game_dialog import GameDialog
-from src.game.game_room_management import GameRoomManagement
-from src.services.log.log_services import LogService
+from src.services.room_reaper import RoomReaper
+from src.services.room_ticker import RoomTicker
+from src.services.service_container import ServiceContainer
 
 
 class GameUI:
-    def __init__(self):
+    def __init__(self, services=None):
         self.last_update = 0
         self.timer = None
-        # Инициализируем сервисы - GameStateService теперь работает с отдельными файлами для каждой игры
-        self.log_service = LogService()
-        self.user_service = UserService()
-        self.game_state_service = GameStateService()
+        # Общие сервисы процесса - GameStateService работает с отдельными файлами для каждой игры
+        services = services or ServiceContainer.get()
+        self.log_service = services.log_service
+        self.user_service = services.user_service
+        self.game_state_service = services.game_state_service
         self.game_dialog = GameDialog(self)
-        self.game_room_management = GameRoomManagement(game_ui=self)
+        self.game_room_management = services.room_management
+        self.ticker = RoomTicker.get()
+        self._eviction = RoomReaper.subscribe(self._on_room_evicted)
 
-    def check_updates_safely(self):
+    def _on_room_evicted(self, game, room_id, reason):
+        """Комната игрока удалена сборщиком: выполняется в контексте клиента (RoomReaper.subscribe)."""
+        if game != 'detective' or room_id != app.storage.user.get('game_state_id'):
+            return
+        if self.timer:
+            self.timer.cancel()
+            self.timer = None
+        self.game_room_management.update_user_game_state(app.storage.user.get('user_id'), None)
+        app.storage.user.update({'game_state_id': None})
+        ui.notify(RoomReaper.REASON_MESSAGES.get(reason, RoomReaper.REASON_MESSAGES['idle']), type='warning')
+        if hasattr(self, 'game_container') and not self.game_container.is_deleted:
+            self.show_game_interface()
+
+    def check_updates_safely(self, room_data=None):
         """Упрощенная и оптимизированная версия проверки обновлений"""
         try:
             # Выполняем обычную проверку обновлений
-            self.game_room_management.check_for_updates()
+            self.game_room_management.check_for_updates(room_data, self)
         except Exception as e:
             # Логируем ошибку, но не выполняем сложных проверок и операций
             self.log_service.add_error_log(
@@ -170,7 +185,10 @@ class GameUI:
             return
 
         if room_data.get('status') != 'finished':
-            self.timer = ui.timer(interval=1.0, callback=self.check_updates_safely)
+            # Комната загружается один раз за тик для всех игроков, а не каждым клиентом
+            self.timer = self.ticker.subscribe(
+                'detective', current_room_id, self.game_room_management.get_game_state,
+                self.check_updates_safely, interval=1.0)
             self.log_service.add_log(
                 level='GAME',
                 message=f"Показывание активной игры для пользователя",
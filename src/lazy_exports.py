@@ -0,0 +1,24 @@
+import importlib
+import sys
+
+
+def lazy_exports(package, exports):
+    """
+    Возвращает __getattr__ пакета (PEP 562), который импортирует
+    экспортируемый класс при первом обращении к нему.
+
+    Так импорт одного модуля пакета (например, src.models.user или
+    src.game.game_state_service) не загружает экраны, мини-игры и почту.
+
+    :param package: __name__ пакета
+    :param exports: имя -> модуль относительно пакета (например, '.game_ui')
+    """
+
+    def __getattr__(name):
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(exports[name], package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    return __getattr__
@@ -3,6 +3,11 @@ import os
 from nicegui import app, ui
 from src.services.login import AuthMiddleware
 from src.ui.user_ui import UserUI
+from src.services.room_reaper import RoomReaper
+from src.services.presence_service import PresenceService
+from src.services.timer_registry import TimerRegistry
+from src.services.metrics import Metrics
+from src.services.loop_monitor import LoopMonitor
 from dotenv import load_dotenv
 #from src.services.registration import Registration
 #from src.services.user_service import UserService
@@ -10,7 +15,12 @@ from dotenv import load_dotenv
 
 if __name__ in {"__main__", "__mp_main__"}:
     app.add_middleware(AuthMiddleware)
+    Metrics.get().start()
     load_dotenv()
+    RoomReaper.create_default().start()
+    PresenceService.start_default()
+    TimerRegistry.get().start()
+    LoopMonitor.get().start()
 
 @ui.page('/')
 def main_page() -> None:
@@ -1,8 +1,12 @@
 # src/minigame/best_pairs/__init__.py
 
-from .best_pairs_data_service import BestPairsDataService
-from .best_pairs_room_service import BestPairsRoomService
-from .best_pairs_components_ui import BestPairsComponents
-from .best_pairs_game_ui import BestPairsGameUI
+from src.lazy_exports import lazy_exports
 
-__all__ = ['BestPairsDataService', 'BestPairsRoomService', 'BestPairsComponents', 'BestPairsGameUI']
\ No newline at end of file
+__all__ = ['BestPairsDataService', 'BestPairsRoomService', 'BestPairsComponents', 'BestPairsGameUI']
+
+__getattr__ = lazy_exports(__name__, {
+    'BestPairsDataService': '.best_pairs_data_service',
+    'BestPairsRoomService': '.best_pairs_room_service',
+    'BestPairsComponents': '.best_pairs_components_ui',
+    'BestPairsGameUI': '.best_pairs_game_ui',
+})
@@ -1,19 +1,35 @@
 import json
 import os
-import random
+from src.minigame.content_catalog import ContentCatalog
+from src.minigame.content_deck import ContentDeck
 from src.services.log.log_services import LogService
+from src.services.rng_provider import RngProvider
 
 
 class BestPairsDataService:
     """
     Сервис для работы с данными игры Лучшие Пары.
     Управляет карточками существительных и прилагательных.
+
+    Чтение карточек идёт из общего ContentCatalog, который обновляется
+    при изменении файла; файл читается только при изменении списков.
     """
 
-    def __init__(self, data_file='src/minigame/best_pairs/best_pairs_data.json'):
+    def __init__(self, data_file='src/minigame/best_pairs/best_pairs_data.json', rng=None):
         self.data_file = data_file
+        self.rng = rng or RngProvider.get()
         self.log_service = LogService()
         self.ensure_data_file_exists()
+        self.catalog = ContentCatalog.for_file(self.data_file, self.index_data, "BEST_PAIRS_DATA_LOAD",
+                                               default=self.get_default_data)
+
+    @staticmethod
+    def index_data(data):
+        """Строит таблицы карточек: кортежи существительных и прилагательных."""
+        return {
+            "nouns": tuple(data.get("nouns", [])),
+            "adjectives": tuple(data.get("adjectives", []))
+        }
 
     def ensure_data_file_exists(self):
         """Проверяет существование файла с данными и создает его при необходимости."""
@@ -93,6 +109,9 @@ class BestPairsDataService:
                 json.dump(data, file, indent=2, ensure_ascii=False)
 
             os.replace(temp_file, self.data_file)
+            # Обновляем каталог сразу, не дожидаясь события watchfiles
+            if getattr(self, 'catalog', None) is not None:
+                self.catalog.reload()
             return True
         except Exception as e:
             self.log_service.add_error_log(
@@ -103,27 +122,29 @@ class BestPairsDataService:
 
     def get_word_counts(self):
         """Возвращает количество слов в каждом списке."""
-        data = self.load_data()
+        tables = self.catalog.tables
         return {
-            "nouns": len(data.get("nouns", [])),
-            "adjectives": len(data.get("adjectives", []))
+            "nouns": len(tables["nouns"]),
+            "adjectives": len(tables["adjectives"])
         }
 
-    def get_random_cards(self, count=5):
+    def get_random_cards(self, count=5, decks=None):
         """
         Возвращает случайные карточки для игры.
 
         Args:
             count: Количество карточек
+            decks: Колоды комнаты - если переданы, карточки не повторяются
+                   между раундами, пока не будут выданы все
 
         Returns:
             dict: {"nouns": [...], "adjectives": [...]}
         """
-        data = self.load_data()
+        tables = self.catalog.tables
 
         # Получаем списки слов
-        nouns_list = data.get("nouns", [])
-        adjectives_list = data.get("adjectives", [])
+        nouns_list = tables["nouns"]
+        adjectives_list = tables["adjectives"]
 
         # Проверяем, что есть достаточно карточек
         if len(nouns_list) < count or len(adjectives_list) < count:
@@ -135,8 +156,13 @@ class BestPairsDataService:
             count = min(count, len(nouns_list), len(adjectives_list))
 
         # Выбираем случайные карточки
-        selected_nouns = random.sample(nouns_list, count)
-        selected_adjectives = random.sample(adjectives_list, count)
+        if decks is not None:
+            selected_nouns = ContentDeck.of(decks, "nouns", len(nouns_list)).draw_from(nouns_list, count)
+            selected_adjectives = ContentDeck.of(decks, "adjectives", len(adjectives_list)).draw_from(
+                adjectives_list, count)
+        else:
+            selected_nouns = self.rng.sample(nouns_list, count)
+            selected_adjectives = self.rng.sample(adjectives_list, count)
 
         return {
             "nouns": selected_nouns,
@@ -1,11 +1,13 @@
 from nicegui import ui, app
 import time
-from datetime import datetime
 
-from src.minigame.best_pairs.best_pairs_data_service import BestPairsDataService
-from src.minigame.best_pairs.best_pairs_room_service import BestPairsRoomService
-from src.services.log.log_services import LogService
+from src.services.presence_service import PresenceService
+from src.services.room_ticker import RoomTicker
+from src.minigame.lobby_rooms_table import LobbyRoomsTable
+from src.minigame.room_eviction import watch_room_eviction
+from src.services.service_container import ServiceContainer
 from src.minigame.best_pairs.best_pairs_components_ui import BestPairsComponents
+from src.models.minigame_room import find_player
 
 
 class BestPairsGameUI:
@@ -14,10 +16,11 @@ class BestPairsGameUI:
     Игра на ассоциативное мышление с угадыванием пар.
     """
 
-    def __init__(self):
-        self.log_service = LogService()
-        self.data_service = BestPairsDataService()
-        self.room_service = BestPairsRoomService()
+    def __init__(self, services=None):
+        services = services or ServiceContainer.get()
+        self.log_service = services.log_service
+        self.data_service = services.data_service('best_pairs')
+        self.room_service = services.room_service('best_pairs')
         self.components = BestPairsComponents()
 
         self.current_room_id = None
@@ -28,6 +31,14 @@ class BestPairsGameUI:
         self.update_timer = None
         self.rooms_update_timer = None
 
+        # Уведомления об удалении комнаты сборщиком неактивных комнат
+        self._eviction = watch_room_eviction(self, 'best_pairs')
+        # Присутствие игроков в комнатах (только в памяти)
+        self.presence = PresenceService.get()
+        self.ticker = RoomTicker.get()
+        # Список комнат обновляется по изменениям индекса лобби, а не по таймеру
+        self._lobby_table = None
+
         # Для хранения выбранных пар
         self.selected_pairings = {}
 
@@ -137,6 +148,10 @@ class BestPairsGameUI:
                               icon='group_add',
                               on_click=self.show_join_dialog).classes('bg-green-600 hover:bg-green-700 text-white')
 
+                    ui.button('Быстрая игра',
+                              icon='bolt',
+                              on_click=self.quick_join).classes('bg-indigo-600 hover:bg-indigo-700 text-white')
+
                 # Список доступных комнат
                 self.show_available_rooms()
 
@@ -144,75 +159,9 @@ class BestPairsGameUI:
         """Creates and displays a list of available rooms using consistent styling"""
         with ui.card().classes('w-full p-6 mt-4 rounded-xl shadow-lg bg-gray-100 dark:bg-gray-800'):
             ui.label('Доступные комнаты:').classes('text-xl font-bold mb-4 text-indigo-600 dark:text-indigo-400')
-            rooms_list_container = ui.element('div').classes('w-full')
-
-            # Function to update the rooms list
-            def update_rooms_list():
-                rooms_list_container.clear()
-                with rooms_list_container:
-                    available_rooms = self.room_service.get_rooms_list()
-
-                    if available_rooms:
-                        # Create rows for the table
-                        rows = []
-                        for i, room in enumerate(available_rooms):
-                            rows.append({
-                                'id': room['room_id'],
-                                'room_id': room['room_id'],
-                                'host_name': room['host_name'],
-                                'player_count': room['player_count'],
-                                'created_at': datetime.fromtimestamp(room['created_at']).strftime('%H:%M:%S')
-                            })
-
-                        # Define columns in the same style as player table
-                        columns = [
-                            {'name': 'room_id', 'label': 'ID комнаты', 'field': 'room_id', 'align': 'center'},
-                            {'name': 'host_name', 'label': 'Создатель', 'field': 'host_name', 'align': 'center'},
-                            {'name': 'player_count', 'label': 'Игроков', 'field': 'player_count', 'align': 'center'},
-                            {'name': 'created_at', 'label': 'Создана', 'field': 'created_at', 'align': 'center'},
-                            {'name': 'action', 'label': 'Действие', 'field': 'action', 'align': 'center'},
-                        ]
-
-                        # Create the table with unified styling
-                        table = ui.table(
-                            columns=columns,
-                            rows=rows,
-                            row_key='id',
-                            column_defaults={'align': 'center', 'headerClasses': 'uppercase text-primary'}
-                        ).classes('w-full')
-
-                        # Add custom body slot for action buttons
-                        table.add_slot('body', '''
-                            <q-tr :props="props">
-                                <q-td v-for="col in props.cols" :key="col.name" :props="props" class="text-center">
-                                    <template v-if="col.name === 'action'">
-                                        <div class="flex justify-center">
-                                            <q-btn color="primary" dense icon="login" size="md"
-                                                   @click="() => $parent.$emit('join', props.row.room_id)">
-                                                Присоединиться
-                                            </q-btn>
-                                        </div>
-                                    </template>
-                                    <template v-else>
-                                        <span>{{ col.value }}</span>
-                                    </template>
-                                </q-td>
-                            </q-tr>
-                        ''')
-
-                        # Add handler for join event
-                        table.on('join', lambda e: self.join_room(e.args))
-                    else:
-                        with ui.card().classes('w-full p-4 bg-gray-200 dark:bg-gray-700 rounded-lg'):
-                            with ui.row().classes('items-center justify-center text-gray-500 dark:text-gray-400'):
-                                ui.icon('info').classes('text-xl mr-2')
-                                ui.label('Нет доступных комнат').classes('text-center')
-
-            # Update the rooms list
-            update_rooms_list()
             self._cancel_timers()
-            # Start timer to update the rooms list (every 5 seconds)
-            self.rooms_update_timer = ui.timer(3.0, update_rooms_list)
+            # Таблица обновляется по разнице индекса лобби, без пересоздания элементов
+            self._lobby_table = LobbyRoomsTable(self.room_service, self.join_room)
 
     def create_room(self):
         """Создает новую комнату"""
@@ -240,7 +189,7 @@ class BestPairsGameUI:
 
         with dialog, ui.card().classes('p-4'):
             ui.label('Введите ID комнаты').classes('text-lg font-bold mb-2')
-            room_input = ui.input('ID комнаты', placeholder='pairs_1234').classes('w-full mb-4')
+            room_input = ui.input('ID комнаты', placeholder='pairs_7KQ3M').classes('w-full mb-4')
 
             def join_and_close():
                 if self.join_room(room_input.value):
@@ -259,6 +208,7 @@ class BestPairsGameUI:
 
     def join_room(self, room_id):
         """Присоединяется к существующей комнате"""
+        room_id = self.room_service.id_allocator.normalize(room_id)
         if not room_id:
             ui.notify('Введите ID комнаты', type='warning')
             return False
@@ -301,11 +251,11 @@ class BestPairsGameUI:
 
         # Запускаем таймер обновления
         self._cancel_timers()
-        self.update_timer = ui.timer(1.0, lambda: self.update_waiting_room())
+        self.update_timer = self._subscribe_room_tick(self.update_waiting_room, 1.0)
 
         # Получаем данные текущего игрока
         self._ensure_player_id()
-        current_player = next((p for p in room_data["players"] if p["id"] == self.player_id), None)
+        current_player = find_player(room_data, self.player_id)
         is_host = current_player and current_player.get("is_host", False)
 
         with self.game_container:
@@ -361,9 +311,11 @@ class BestPairsGameUI:
                             on_click=self.leave_room
                         ).classes('bg-red-600 hover:bg-red-700 text-white')
 
-    def update_waiting_room(self):
+    def update_waiting_room(self, room_data=None):
         """Обновляет комнату ожидания"""
-        room_data = self.room_service.get_room(self.current_room_id)
+        self._touch_presence()
+        if room_data is None:
+            room_data = self.room_service.get_room(self.current_room_id)
 
         if not room_data:
             self._cancel_timers()
@@ -407,7 +359,7 @@ class BestPairsGameUI:
         if not room_data:
             return
 
-        current_player = next((p for p in room_data["players"] if p["id"] == self.player_id), None)
+        current_player = find_player(room_data, self.player_id)
 
         if not current_player:
             return
@@ -439,14 +391,16 @@ class BestPairsGameUI:
         if not all_ready:
             ui.notify('Ошибка не все готовы', type='warning')
             return
-        # Получаем случайные карточки
-        cards = self.data_service.get_random_cards(count=5)
+        # Получаем случайные карточки из колод комнаты (без повторов между раундами)
+        decks = room_data.get("decks", {})
+        cards = self.data_service.get_random_cards(count=5, decks=decks)
 
         # Начинаем раунд
         success = self.room_service.start_round(
             self.current_room_id,
             cards["nouns"],
-            cards["adjectives"]
+            cards["adjectives"],
+            decks
         )
 
         if success:
@@ -482,11 +436,11 @@ class BestPairsGameUI:
         # Запускаем таймер обновления
         self._cancel_timers()
         self.last_round = room_data["game_data"]["round"]  # Сохраняем текущий раунд
-        self.update_timer = ui.timer(1.0, lambda: self.update_game_screen())
+        self.update_timer = self._subscribe_room_tick(self.update_game_screen, 1.0)
 
         # Получаем данные текущего игрока
         self._ensure_player_id()
-        current_player = next((p for p in room_data["players"] if p["id"] == self.player_id), None)
+        current_player = find_player(room_data, self.player_id)
         is_host_of_round = self.player_id == room_data["game_data"]["current_round_host"]
 
         with self.game_container:
@@ -954,7 +908,7 @@ class BestPairsGameUI:
     def show_waiting_for_host(self, room_data):
         """Интерфейс ожидания для игроков пока ведущий раскладывает"""
         host_id = room_data["game_data"]["current_round_host"]
-        host = next((p for p in room_data["players"] if p["id"] == host_id), None)
+        host = find_player(room_data, host_id)
         host_name = host["name"] if host else "Ведущий"
 
         self.components.create_status_indicator(f'{host_name} раскладывает пары...', 'waiting')
@@ -1003,7 +957,7 @@ class BestPairsGameUI:
         player_guesses = room_data["game_data"]["player_guesses"]
 
         # Применяем очки
-        self.room_service.apply_round_scores(self.current_room_id)
+        self.room_service.apply_round_scores(self.current_room_id, user_id=self.player_id)
 
         # Показываем правильные пары
         ui.label('Результаты раунда').classes('text-xl font-bold mb-4 text-center')
@@ -1069,7 +1023,7 @@ class BestPairsGameUI:
 
     def proceed_to_round_end(self):
         """Переходит к экрану окончания раунда"""
-        success = self.room_service.end_round(self.current_room_id)
+        success = self.room_service.end_round(self.current_room_id, user_id=self.player_id)
 
         if success:
             ui.notify('Переход к результатам!', type='positive')
@@ -1107,7 +1061,7 @@ class BestPairsGameUI:
 
     def next_round(self):
         """Переходит к следующему раунду"""
-        success = self.room_service.next_round(self.current_room_id)
+        success = self.room_service.next_round(self.current_room_id, user_id=self.player_id)
 
         if success:
             ui.notify('Переход к следующему раунду!', type='positive')
@@ -1115,9 +1069,11 @@ class BestPairsGameUI:
         else:
             ui.notify('Ошибка перехода к следующему раунду', type='negative')
 
-    def update_game_screen(self):
+    def update_game_screen(self, room_data=None):
         """Обновляет игровой экран"""
-        room_data = self.room_service.get_room(self.current_room_id)
+        self._touch_presence()
+        if room_data is None:
+            room_data = self.room_service.get_room(self.current_room_id)
 
         if not room_data:
             self._cancel_timers()
@@ -1217,6 +1173,7 @@ class BestPairsGameUI:
         """Покидает текущую комнату"""
         self._ensure_player_id()
         self.room_service.remove_player(self.current_room_id, self.player_id)
+        self.presence.leave('best_pairs', self.current_room_id, self.player_id)
 
         self.current_room_id = None
         app.storage.user.update({'best_pairs_room_id': None})
@@ -1225,8 +1182,33 @@ class BestPairsGameUI:
         ui.notify('Вы покинули комнату', type='info')
         self.show_main_menu()
 
+    def quick_join(self):
+        """Присоединяется к открытой комнате, где больше всего игроков."""
+        room_id = self.room_service.find_open_room()
+        if not room_id:
+            ui.notify('Нет открытых комнат, создайте новую', type='info')
+            return
+        self.join_room(room_id)
+
+    def _subscribe_room_tick(self, update, interval=1.0):
+        """Подписывает экран на общий тик текущей комнаты вместо собственного таймера."""
+        room_id = self.current_room_id
+        return self.ticker.subscribe(
+            'best_pairs', room_id, self.room_service.get_room,
+            lambda room_data: update(room_data if room_id == self.current_room_id else None),
+            interval)
+
+    def _touch_presence(self):
+        """Сигнал присутствия игрока в текущей комнате."""
+        player_id = self.player_id
+        if self.current_room_id and player_id:
+            self.presence.heartbeat('best_pairs', self.current_room_id, player_id, ui.context.client.id)
+
     def _cancel_timers(self):
         """Отменяет все активные таймеры"""
+        if self._lobby_table is not None:
+            self._lobby_table.close()
+            self._lobby_table = None
         if self.update_timer:
             try:
                 self.update_timer.cancel()
@@ -1,68 +1,29 @@
-import json
-import os
 import time
-import random
-from nicegui import app
-from src.services.log.log_services import LogService
+from src.services.rng_provider import RngProvider
+from src.minigame.room_store import room_transaction
+from src.minigame.room_service import MinigameRoomService
+from src.models.minigame_room import find_player, find_host_name
 
 
-class BestPairsRoomService:
+class BestPairsRoomService(MinigameRoomService):
     """
     Сервис для управления игровыми комнатами в игре Лучшие Пары.
     Отвечает за создание/удаление комнат, управление игроками,
     сохранение и загрузку состояний комнат.
     """
 
-    def __init__(self, rooms_file='src/minigame/best_pairs/best_pairs_rooms.json'):
-        self.rooms_file = rooms_file
-        self.log_service = LogService()
-        self.ensure_rooms_file_exists()
-
-    def ensure_rooms_file_exists(self):
-        """Проверяет существование файла с данными о комнатах."""
-        directory = os.path.dirname(self.rooms_file)
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-
-        if not os.path.exists(self.rooms_file):
-            self.save_rooms({})
-
-    def load_rooms(self):
-        """Загружает данные о комнатах из файла."""
-        try:
-            with open(self.rooms_file, 'r', encoding='utf-8') as file:
-                return json.load(file)
-        except Exception as e:
-            self.log_service.add_error_log(
-                error_message=f"Ошибка загрузки данных о комнатах Лучшие Пары: {str(e)}",
-                action="BEST_PAIRS_ROOMS_LOAD"
-            )
-            return {}
-
-    def save_rooms(self, rooms_data):
-        """Сохраняет данные о комнатах в файл."""
-        try:
-            directory = os.path.dirname(self.rooms_file)
-            if not os.path.exists(directory):
-                os.makedirs(directory)
-
-            temp_file = f"{self.rooms_file}.tmp"
-            with open(temp_file, 'w', encoding='utf-8') as file:
-                json.dump(rooms_data, file, indent=2, ensure_ascii=False)
-
-            os.replace(temp_file, self.rooms_file)
-            return True
-        except Exception as e:
-            self.log_service.add_error_log(
-                error_message=f"Ошибка сохранения данных о комнатах Лучшие Пары: {str(e)}",
-                action="BEST_PAIRS_ROOMS_SAVE"
-            )
-            return False
+    GAME = "best_pairs"
+    ROOM_ID_PREFIX = "pairs"
+    ACTION_PREFIX = "BEST_PAIRS"
+    GAME_TITLE = "Лучшие Пары"
+    ROOMS_FILE = 'src/minigame/best_pairs/best_pairs_rooms.json'
+    # По правилам игры участвуют 2-8 игроков
+    MAX_PLAYERS = 8
 
     def create_room(self, host_id, host_name):
         """Создает новую комнату."""
         # Генерируем уникальный ID комнаты
-        room_id = f"pairs_{random.randint(1000, 9999)}"
+        room_id = self.allocate_room_id()
         current_time = int(time.time())
 
         # Создаем структуру данных комнаты
@@ -72,6 +33,7 @@ class BestPairsRoomService:
             "last_activity": current_time,
             "status": "waiting",  # waiting, playing, finished
             "host_id": host_id,
+            "rng_seed": RngProvider.new_seed(),
             "current_host_index": 0,  # Индекс текущего ведущего
             "rounds_played": 0,  # Количество сыгранных раундов
             "players": [
@@ -97,10 +59,8 @@ class BestPairsRoomService:
             }
         }
 
-        # Сохраняем комнату
-        rooms = self.load_rooms()
-        rooms[room_id] = room_data
-        success = self.save_rooms(rooms)
+        # Сохраняем комнату под её блокировкой
+        success = self.insert_room(room_id, room_data)
 
         if success:
             self.log_service.add_log(
@@ -113,9 +73,14 @@ class BestPairsRoomService:
 
         return room_id if success else None
 
-    def delete_room(self, room_id):
-        """Удаляет комнату."""
-        rooms = self.load_rooms()
+    @room_transaction
+    def delete_room(self, room_id, user_id=None):
+        """
+        Удаляет комнату.
+
+        :param user_id: Кто удаляет комнату; None - система (фоновые задачи)
+        """
+        rooms = self.load_rooms(room_id)
         if room_id in rooms:
             room_data = rooms.pop(room_id)
             success = self.save_rooms(rooms)
@@ -125,26 +90,17 @@ class BestPairsRoomService:
                     level="GAME",
                     action="BEST_PAIRS_ROOM_DELETE",
                     message=f"Удалена комната Лучшие Пары",
-                    user_id=app.storage.user.get('user_id'),
+                    user_id=user_id,
                     metadata={"room_id": room_id}
                 )
 
             return success
         return False
 
-    def room_exists(self, room_id):
-        """Проверяет существование комнаты."""
-        rooms = self.load_rooms()
-        return room_id in rooms
-
-    def get_room(self, room_id):
-        """Получает данные о комнате."""
-        rooms = self.load_rooms()
-        return rooms.get(room_id)
-
+    @room_transaction
     def add_player(self, room_id, player_id, player_name):
         """Добавляет игрока в комнату."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -152,7 +108,7 @@ class BestPairsRoomService:
         current_time = int(time.time())
 
         # Проверяем, не находится ли игрок уже в комнате
-        existing_player = next((p for p in room["players"] if p["id"] == player_id), None)
+        existing_player = find_player(room, player_id)
         if existing_player:
             # Обновляем время последнего действия
             existing_player["last_action"] = current_time
@@ -187,9 +143,10 @@ class BestPairsRoomService:
 
         return success
 
+    @room_transaction
     def remove_player(self, room_id, player_id):
         """Удаляет игрока из комнаты."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -202,7 +159,7 @@ class BestPairsRoomService:
 
         # Если не осталось игроков, удаляем комнату
         if not room["players"]:
-            return self.delete_room(room_id)
+            return self.delete_room(room_id, user_id=player_id)
 
         # Если удаленный игрок был хостом, назначаем нового
         if not any(p.get("is_host") for p in room["players"]) and room["players"]:
@@ -222,9 +179,10 @@ class BestPairsRoomService:
 
         return success
 
+    @room_transaction
     def set_player_ready(self, room_id, player_id, is_ready):
         """Устанавливает статус готовности игрока."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -232,7 +190,7 @@ class BestPairsRoomService:
         current_time = int(time.time())
 
         # Находим игрока
-        player = next((p for p in room["players"] if p["id"] == player_id), None)
+        player = find_player(room, player_id)
         if not player:
             return False
 
@@ -262,9 +220,10 @@ class BestPairsRoomService:
 
         return all(player.get("is_ready", False) for player in room["players"])
 
-    def start_round(self, room_id, nouns, adjectives):
+    @room_transaction
+    def start_round(self, room_id, nouns, adjectives, decks=None):
         """Начинает новый раунд игры."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -289,6 +248,9 @@ class BestPairsRoomService:
         room["game_data"]["current_round_host"] = current_host["id"]
         room["game_data"]["round_scores"] = {}
         room["game_data"]["scores_applied"] = False  # ← ДОБАВЛЕНО! Сбрасываем флаг
+        if decks is not None:
+            # Состояние колод контента комнаты (см. ContentDeck)
+            room["decks"] = decks
 
         room["last_activity"] = current_time
 
@@ -313,9 +275,10 @@ class BestPairsRoomService:
 
         return success
 
+    @room_transaction
     def set_host_pairings(self, room_id, host_id, pairings):
         """Сохраняет пары, составленные ведущим."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -332,7 +295,7 @@ class BestPairsRoomService:
         room["last_activity"] = current_time
 
         # Обновляем время действия ведущего
-        host_player = next((p for p in room["players"] if p["id"] == host_id), None)
+        host_player = find_player(room, host_id)
         if host_player:
             host_player["last_action"] = current_time
 
@@ -349,9 +312,10 @@ class BestPairsRoomService:
 
         return success
 
+    @room_transaction
     def submit_player_guess(self, room_id, player_id, guesses):
         """Сохраняет догадки игрока."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -371,7 +335,7 @@ class BestPairsRoomService:
         room["last_activity"] = current_time
 
         # Обновляем время действия игрока
-        player = next((p for p in room["players"] if p["id"] == player_id), None)
+        player = find_player(room, player_id)
         if player:
             player["last_action"] = current_time
 
@@ -427,9 +391,10 @@ class BestPairsRoomService:
         return scores
 
     # ИСПРАВЛЕНИЕ 2: В apply_round_scores() - добавляем проверку на повторное применение
-    def apply_round_scores(self, room_id):
+    @room_transaction
+    def apply_round_scores(self, room_id, user_id=None):
         """Применяет подсчитанные очки к общему счету."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -461,16 +426,17 @@ class BestPairsRoomService:
                 level="GAME",
                 action="BEST_PAIRS_SCORES_APPLIED",
                 message=f"Подсчитаны очки за раунд",
-                user_id=app.storage.user.get('user_id'),
+                user_id=user_id,
                 metadata={"room_id": room_id, "scores": scores}
             )
 
         return success
 
     # Добавляем новую функцию
-    def end_round(self, room_id):
+    @room_transaction
+    def end_round(self, room_id, user_id=None):
         """Завершает текущий раунд и переходит к экрану окончания раунда."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -490,16 +456,17 @@ class BestPairsRoomService:
                 level="GAME",
                 action="BEST_PAIRS_ROUND_END",
                 message=f"Раунд завершен",
-                user_id=app.storage.user.get('user_id'),
+                user_id=user_id,
                 metadata={"room_id": room_id}
             )
 
         return success
 
     # В next_round() также нужно сбрасывать флаг
-    def next_round(self, room_id):
+    @room_transaction
+    def next_round(self, room_id, user_id=None):
         """Переходит к следующему раунду."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -514,7 +481,7 @@ class BestPairsRoomService:
 
         # Увеличиваем счетчик раундов для прошлого ведущего
         prev_host_id = room["game_data"]["current_round_host"]
-        prev_host = next((p for p in room["players"] if p["id"] == prev_host_id), None)
+        prev_host = find_player(room, prev_host_id)
         if prev_host:
             prev_host["rounds_as_host"] += 1
 
@@ -545,28 +512,18 @@ class BestPairsRoomService:
                 level="GAME",
                 action="BEST_PAIRS_NEXT_ROUND",
                 message=f"Переход к следующему раунду",
-                user_id=app.storage.user.get('user_id'),
+                user_id=user_id,
                 metadata={"room_id": room_id, "rounds_played": room["rounds_played"]}
             )
 
         return success
 
-    def get_rooms_list(self):
-        """Возвращает список доступных комнат."""
-        rooms = self.load_rooms()
-        rooms_list = []
-
-        for room_id, room_data in rooms.items():
-            # Добавляем только комнаты в состоянии ожидания
-            if room_data["status"] == "waiting":
-                rooms_list.append({
-                    "room_id": room_id,
-                    "host_name": next((p["name"] for p in room_data["players"] if p.get("is_host")), "Неизвестно"),
-                    "player_count": len(room_data["players"]),
-                    "created_at": room_data["created_at"]
-                })
-
-        # Сортируем по времени создания (новые первыми)
-        rooms_list.sort(key=lambda x: x["created_at"], reverse=True)
-
-        return rooms_list
\ No newline at end of file
+    @staticmethod
+    def lobby_summary(room_id, room):
+        """Сводка комнаты для списка доступных комнат."""
+        return {
+            "room_id": room_id,
+            "host_name": find_host_name(room),
+            "player_count": len(room["players"]),
+            "created_at": room["created_at"]
+        }
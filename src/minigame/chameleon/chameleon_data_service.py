@@ -1,79 +1,78 @@
-import os
-import json
-import random
+from src.minigame.content_catalog import ContentCatalog
+from src.minigame.content_deck import ContentDeck
 from src.services.log.log_services import LogService
+from src.services.rng_provider import RngProvider
 
 
 class ChameleonDataService:
     """
     Сервис для работы с данными игры Хамелеон.
     Отвечает за загрузку категорий и слов из JSON файла.
+
+    Категории берутся из общего ContentCatalog, который обновляется
+    при изменении файла.
     """
 
-    def __init__(self, data_file='src/minigame/chameleon/categories.json'):
+    def __init__(self, data_file='src/minigame/chameleon/categories.json', rng=None):
         self.data_file = data_file
+        self.rng = rng or RngProvider.get()
         self.log_service = LogService()
-        self.categories = []
-        self.load_categories()
+        self.catalog = ContentCatalog.for_file(self.data_file, self.index_categories, "CHAMELEON_DATA_LOAD")
 
-    def load_categories(self):
-        """Загружает категории и слова из JSON файла."""
-        try:
-            if not os.path.exists(self.data_file):
-                self.log_service.add_error_log(
-                    error_message=f"Файл данных категорий не найден: {self.data_file}",
-                    action="CHAMELEON_DATA_LOAD"
-                )
-                self.categories = []
-                return
+    @staticmethod
+    def index_categories(data):
+        """Строит таблицы категорий: названия и слова по названию."""
+        categories = data.get('categories', [])
+        return {
+            'categories': categories,
+            'names': tuple(category['name'] for category in categories),
+            'words': {category['name']: tuple(category.get('words', [])) for category in categories}
+        }
 
-            with open(self.data_file, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-                self.categories = data.get('categories', [])
+    @property
+    def categories(self):
+        return self.catalog.tables['categories']
 
-            self.log_service.add_log(
-                level="GAME",
-                action="CHAMELEON_DATA_LOAD",
-                message=f"Загружено {len(self.categories)} категорий"
-            )
-        except Exception as e:
-            self.log_service.add_error_log(
-                error_message=f"Ошибка загрузки категорий: {str(e)}",
-                action="CHAMELEON_DATA_LOAD"
-            )
-            self.categories = []
+    def load_categories(self):
+        """Принудительно перечитывает категории и слова из JSON файла."""
+        return self.catalog.reload()
 
     def get_all_categories(self):
         """Возвращает список всех категорий."""
-        return [category['name'] for category in self.categories]
+        return list(self.catalog.tables['names'])
 
     def get_words_for_category(self, category_name):
         """Возвращает список слов для указанной категории."""
-        for category in self.categories:
-            if category['name'] == category_name:
-                return category['words']
-        return []
+        return list(self.catalog.tables['words'].get(category_name, ()))
 
     def get_random_category(self):
         """Возвращает случайную категорию."""
-        if not self.categories:
+        names = self.catalog.tables['names']
+        if not names:
             return None
-        return random.choice(self.categories)['name']
+        return self.rng.choice(names)
 
-    def get_random_word(self, category_name):
-        """Возвращает случайное слово из указанной категории."""
-        words = self.get_words_for_category(category_name)
+    def get_random_word(self, category_name, decks=None):
+        """
+        Возвращает случайное слово из указанной категории.
+
+        :param decks: Колоды комнаты - если переданы, слова не повторяются,
+                      пока не будут выданы все слова категории
+        """
+        words = self.catalog.tables['words'].get(category_name)
         if not words:
             return None
-        return random.choice(words)
+        if decks is not None:
+            return ContentDeck.of(decks, f"words:{category_name}", len(words)).draw_from(words)[0]
+        return self.rng.choice(words)
 
-    def get_random_category_and_word(self):
+    def get_random_category_and_word(self, decks=None):
         """Возвращает случайную категорию и слово из неё."""
-        if not self.categories:
+        names = self.catalog.tables['names']
+        if not names:
             return None, None
-
-        category = random.choice(self.categories)
-        category_name = category['name']
-        word = random.choice(category['words'])
-
-        return category_name, word
\ No newline at end of file
+        if decks is not None:
+            category_name = ContentDeck.of(decks, "categories", len(names)).draw_from(names)[0]
+        else:
+            category_name = self.rng.choice(names)
+        return category_name, self.get_random_word(category_name, decks)
\ No newline at end of file
@@ -1,12 +1,13 @@
 from nicegui import ui, app
-import random
-import time
-from datetime import datetime
 
-from src.minigame.chameleon.chameleon_data_service import ChameleonDataService
-from src.minigame.chameleon.chameleon_room_service import ChameleonRoomService
-from src.services.log.log_services import LogService
+from src.services.presence_service import PresenceService
+from src.services.rng_provider import RngProvider
+from src.services.room_ticker import RoomTicker
+from src.minigame.lobby_rooms_table import LobbyRoomsTable
+from src.minigame.room_eviction import watch_room_eviction
+from src.services.service_container import ServiceContainer
 from src.minigame.chameleon.chameleon_ui_components import ChameleonComponents
+from src.models.minigame_room import find_player
 
 
 class ChameleonGameUI:
@@ -15,10 +16,11 @@ class ChameleonGameUI:
     Гибридный режим: обсуждение происходит вживую, а интерфейс онлайн.
     """
 
-    def __init__(self):
-        self.log_service = LogService()
-        self.data_service = ChameleonDataService()
-        self.room_service = ChameleonRoomService()
+    def __init__(self, services=None):
+        services = services or ServiceContainer.get()
+        self.log_service = services.log_service
+        self.data_service = services.data_service('chameleon')
+        self.room_service = services.room_service('chameleon')
         self.components = ChameleonComponents()
 
         self.current_room_id = None
@@ -28,6 +30,14 @@ class ChameleonGameUI:
         self.update_timer = None
         self.rooms_update_timer = None
 
+        # Уведомления об удалении комнаты сборщиком неактивных комнат
+        self._eviction = watch_room_eviction(self, 'chameleon')
+        # Присутствие игроков в комнатах (только в памяти)
+        self.presence = PresenceService.get()
+        self.ticker = RoomTicker.get()
+        # Список комнат обновляется по изменениям индекса лобби, а не по таймеру
+        self._lobby_table = None
+
     def show_main_menu(self, container=None):
         """Показывает главное меню игры."""
         # Восстанавливаем сохраненный ID комнаты при перезагрузке
@@ -116,6 +126,8 @@ class ChameleonGameUI:
                         'flex-grow bg-green-600 hover:bg-green-700 text-white')
                     ui.button('Присоединиться к игре', icon='login', on_click=self.show_join_menu).classes(
                         'flex-grow bg-blue-600 hover:bg-blue-700 text-white')
+                    ui.button('Быстрая игра', icon='bolt', on_click=self.quick_join).classes(
+                        'flex-grow bg-indigo-600 hover:bg-indigo-700 text-white')
                     ui.button('Обновить список', icon='refresh', on_click=self.refresh_rooms_list).classes(
                         'bg-gray-200 dark:bg-gray-700 hover:bg-gray-300 dark:hover:bg-gray-600')
 
@@ -125,78 +137,36 @@ class ChameleonGameUI:
         """Creates and displays a list of available rooms using consistent styling"""
         with ui.card().classes('w-full p-6 mt-4 rounded-xl shadow-lg bg-gray-100 dark:bg-gray-800'):
             ui.label('Доступные комнаты:').classes('text-xl font-bold mb-4 text-indigo-600 dark:text-indigo-400')
-            rooms_container = ui.element('div').classes('w-full')
-
-            # Function to update the rooms list
-            def update_rooms_list():
-                rooms_container.clear()
-                with rooms_container:
-                    available_rooms = self.room_service.get_rooms_list()
-
-                    if available_rooms:
-                        # Create rows for the table
-                        rows = []
-                        for i, room in enumerate(available_rooms):
-                            rows.append({
-                                'id': room['room_id'],
-                                'room_id': room['room_id'],
-                                'host_name': room['host_name'],
-                                'player_count': room['player_count'],
-                                'created_at': datetime.fromtimestamp(room['created_at']).strftime('%H:%M:%S')
-                            })
-
-                        # Define columns in the same style as player table
-                        columns = [
-                            {'name': 'room_id', 'label': 'ID комнаты', 'field': 'room_id', 'align': 'center'},
-                            {'name': 'host_name', 'label': 'Создатель', 'field': 'host_name', 'align': 'center'},
-                            {'name': 'player_count', 'label': 'Игроков', 'field': 'player_count', 'align': 'center'},
-                            {'name': 'created_at', 'label': 'Создана', 'field': 'created_at', 'align': 'center'},
-                            {'name': 'action', 'label': 'Действие', 'field': 'action', 'align': 'center'},
-                        ]
-
-                        # Create the table with unified styling
-                        table = ui.table(
-                            columns=columns,
-                            rows=rows,
-                            row_key='id',
-                            column_defaults={'align': 'center', 'headerClasses': 'uppercase text-primary'}
-                        ).classes('w-full')
-
-                        # Add custom body slot for action buttons
-                        table.add_slot('body', '''
-                            <q-tr :props="props">
-                                <q-td v-for="col in props.cols" :key="col.name" :props="props" class="text-center">
-                                    <template v-if="col.name === 'action'">
-                                        <div class="flex justify-center">
-                                            <q-btn color="primary" dense icon="login" size="md"
-                                                   @click="() => $parent.$emit('join', props.row.room_id)">
-                                                Присоединиться
-                                            </q-btn>
-                                        </div>
-                                    </template>
-                                    <template v-else>
-                                        <span>{{ col.value }}</span>
-                                    </template>
-                                </q-td>
-                            </q-tr>
-                        ''')
-
-                        # Add handler for join event
-                        table.on('join', lambda e: self.join_game(e.args))
-                    else:
-                        with ui.card().classes('w-full p-4 bg-gray-200 dark:bg-gray-700 rounded-lg'):
-                            with ui.row().classes('items-center justify-center text-gray-500 dark:text-gray-400'):
-                                ui.icon('info').classes('text-xl mr-2')
-                                ui.label('Нет доступных комнат').classes('text-center')
+            # Таблица обновляется по разнице индекса лобби, без пересоздания элементов
+            self._lobby_table = LobbyRoomsTable(self.room_service, self.join_game)
 
-            # Update the rooms list
-            update_rooms_list()
-
-            # Start timer to update the rooms list (every 5 seconds)
-            self.rooms_update_timer = ui.timer(5.0, update_rooms_list)
+    def quick_join(self):
+        """Присоединяется к открытой комнате, где больше всего игроков."""
+        room_id = self.room_service.find_open_room()
+        if not room_id:
+            ui.notify('Нет открытых комнат, создайте новую', type='info')
+            return
+        self.join_game(room_id)
+
+    def _subscribe_room_tick(self, update, interval=1.0):
+        """Подписывает экран на общий тик текущей комнаты вместо собственного таймера."""
+        room_id = self.current_room_id
+        return self.ticker.subscribe(
+            'chameleon', room_id, self.room_service.get_room,
+            lambda room_data: update(room_data if room_id == self.current_room_id else None),
+            interval)
+
+    def _touch_presence(self):
+        """Сигнал присутствия игрока в текущей комнате."""
+        player_id = app.storage.user.get('user_id')
+        if self.current_room_id and player_id:
+            self.presence.heartbeat('chameleon', self.current_room_id, player_id, ui.context.client.id)
 
     def _cancel_timers(self):
         """Отменяет все активные таймеры"""
+        if self._lobby_table is not None:
+            self._lobby_table.close()
+            self._lobby_table = None
         if self.update_timer:
             try:
                 self.update_timer.cancel()
@@ -247,7 +217,7 @@ class ChameleonGameUI:
             room_id_input.props('outlined dense rounded')
 
             def join_room():
-                room_id = room_id_input.value.strip()
+                room_id = self.room_service.id_allocator.normalize(room_id_input.value)
                 if not room_id:
                     ui.notify('Введите ID комнаты', type='warning')
                     return
@@ -317,11 +287,11 @@ class ChameleonGameUI:
 
         # Запускаем таймер обновления
         self._cancel_timers()
-        self.update_timer = ui.timer(1.0, lambda: self.update_waiting_room())
+        self.update_timer = self._subscribe_room_tick(self.update_waiting_room, 1.0)
 
         # Получаем данные текущего игрока
         current_user_id = app.storage.user.get('user_id')
-        current_player = next((p for p in room_data["players"] if p["id"] == current_user_id), None)
+        current_player = find_player(room_data, current_user_id)
         is_host = current_player and current_player.get("is_host", False)
 
         with self.game_container:
@@ -377,15 +347,17 @@ class ChameleonGameUI:
                                 # Получаем все слова для категории
                                 category_words = self.data_service.get_words_for_category(category_select.value)
 
-                                # Выбираем случайное слово
-                                word = random.choice(category_words)
+                                # Выбираем случайное слово из колоды категории комнаты (без повторов)
+                                room = self.room_service.get_room(self.current_room_id) or room_data
+                                decks = room.get("decks", {})
+                                word = self.data_service.get_random_word(category_select.value, decks)
                                 if not word:
                                     ui.notify('Не удалось выбрать слово', type='negative')
                                     return
 
                                 # Подготавливаем сетку слов
                                 grid_words = category_words.copy()
-                                random.shuffle(grid_words)
+                                RngProvider.for_room_content(room, "grid_words").shuffle(grid_words)
 
                                 # Добавляем плейсхолдеры для заполнения сетки 4x4
                                 grid_words_with_placeholders = grid_words.copy()
@@ -402,7 +374,8 @@ class ChameleonGameUI:
                                     self.current_room_id,
                                     category_select.value,
                                     word,
-                                    grid_words_with_placeholders  # Передаем подготовленную сетку слов
+                                    grid_words_with_placeholders,  # Передаем подготовленную сетку слов
+                                    decks
                                 )
 
                                 if success:
@@ -428,13 +401,15 @@ class ChameleonGameUI:
                 ui.button('Выйти из игры', icon='exit_to_app', on_click=self.leave_game).classes(
                     'w-full bg-red-500 hover:bg-red-600 text-white mt-4')
 
-    def update_waiting_room(self):
+    def update_waiting_room(self, room_data=None):
         """Обновляет данные в комнате ожидания."""
+        self._touch_presence()
         if not self.current_room_id:
             self._cancel_timers()
             return
 
-        room_data = self.room_service.get_room(self.current_room_id)
+        if room_data is None:
+            room_data = self.room_service.get_room(self.current_room_id)
         if not room_data:
             self._cancel_timers()
             ui.notify('Комната была удалена', type='negative')
@@ -465,7 +440,7 @@ class ChameleonGameUI:
             return
 
         current_user_id = app.storage.user.get('user_id')
-        current_player = next((p for p in room_data["players"] if p["id"] == current_user_id), None)
+        current_player = find_player(room_data, current_user_id)
 
         if not current_player:
             return
@@ -500,7 +475,7 @@ class ChameleonGameUI:
 
         # Запускаем таймер обновления
         self._cancel_timers()
-        self.update_timer = ui.timer(1.0, lambda: self.update_game_screen())
+        self.update_timer = self._subscribe_room_tick(self.update_game_screen, 1.0)
 
         # Получаем данные текущего игрока
         current_user_id = app.storage.user.get('user_id')
@@ -529,15 +504,7 @@ class ChameleonGameUI:
                 # Кнопка для перехода к голосованию (только для хоста и только в раунде 1)
                 if is_host and current_round == 1:
                     def start_voting():
-                        # Копируем данные комнаты и изменяем номер раунда
-                        updated_room = dict(room_data)
-                        updated_room["game_data"]["round"] = 2
-                        updated_room["last_activity"] = int(time.time())
-
-                        # Сохраняем обновленные данные
-                        rooms = self.room_service.load_rooms()
-                        rooms[self.current_room_id] = updated_room
-                        success = self.room_service.save_rooms(rooms)
+                        success = self.room_service.start_voting_round(self.current_room_id, user_id=app.storage.user.get('user_id'))
 
                         if success:
                             ui.notify('Переход к этапу голосования', type='positive')
@@ -648,13 +615,15 @@ class ChameleonGameUI:
             ui.button('Выйти из игры', icon='exit_to_app', on_click=self.leave_game).classes(
                 'w-full bg-red-500 hover:bg-red-600 text-white mt-4')
 
-    def update_game_screen(self):
+    def update_game_screen(self, room_data=None):
         """Обновляет данные на экране игры."""
+        self._touch_presence()
         if not self.current_room_id:
             self._cancel_timers()
             return
 
-        room_data = self.room_service.get_room(self.current_room_id)
+        if room_data is None:
+            room_data = self.room_service.get_room(self.current_room_id)
         if not room_data:
             self._cancel_timers()
             ui.notify('Комната была удалена', type='negative')
@@ -725,7 +694,7 @@ class ChameleonGameUI:
         if not self.current_room_id:
             return
 
-        success = self.room_service.finish_game(self.current_room_id)
+        success = self.room_service.finish_game(self.current_room_id, user_id=app.storage.user.get('user_id'))
         if success:
             ui.notify('Игра завершена', type='positive')
             self.show_game_over(False, self.room_service.get_room(self.current_room_id)["game_data"]["word"])
@@ -737,7 +706,7 @@ class ChameleonGameUI:
         if not self.current_room_id:
             return
 
-        success = self.room_service.reset_game(self.current_room_id)
+        success = self.room_service.reset_game(self.current_room_id, user_id=app.storage.user.get('user_id'))
         if success:
             ui.notify('Игра сброшена', type='positive')
             self.show_waiting_room()
@@ -762,6 +731,7 @@ class ChameleonGameUI:
             self.current_room_id,
             app.storage.user.get('user_id')
         )
+        self.presence.leave('chameleon', self.current_room_id, app.storage.user.get('user_id'))
 
         if success:
             ui.notify('Вы покинули игру', type='positive')
@@ -1,68 +1,27 @@
-import json
-import os
 import time
-import random
-from nicegui import app
-from src.services.log.log_services import LogService
+from src.services.rng_provider import RngProvider
+from src.minigame.room_store import room_transaction
+from src.minigame.room_service import MinigameRoomService
+from src.models.minigame_room import find_player, find_player_index, find_host_name
 
 
-class ChameleonRoomService:
+class ChameleonRoomService(MinigameRoomService):
     """
     Сервис для управления игровыми комнатами в игре Хамелеон.
     Отвечает за создание/удаление комнат, управление игроками, 
     сохранение и загрузку состояний комнат.
     """
 
-    def __init__(self, rooms_file='src/minigame/chameleon/chameleon_rooms.json'):
-        self.rooms_file = rooms_file
-        self.log_service = LogService()
-        self.ensure_rooms_file_exists()
-
-    def ensure_rooms_file_exists(self):
-        """Проверяет существование файла с данными о комнатах."""
-        directory = os.path.dirname(self.rooms_file)
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-
-        if not os.path.exists(self.rooms_file):
-            self.save_rooms({})
-
-    def load_rooms(self):
-        """Загружает данные о комнатах из файла."""
-        try:
-            with open(self.rooms_file, 'r', encoding='utf-8') as file:
-                return json.load(file)
-        except Exception as e:
-            self.log_service.add_error_log(
-                error_message=f"Ошибка загрузки данных о комнатах: {str(e)}",
-                action="CHAMELEON_ROOMS_LOAD"
-            )
-            return {}
-
-    def save_rooms(self, rooms_data):
-        """Сохраняет данные о комнатах в файл."""
-        try:
-            directory = os.path.dirname(self.rooms_file)
-            if not os.path.exists(directory):
-                os.makedirs(directory)
-
-            temp_file = f"{self.rooms_file}.tmp"
-            with open(temp_file, 'w', encoding='utf-8') as file:
-                json.dump(rooms_data, file, indent=2, ensure_ascii=False)
-
-            os.replace(temp_file, self.rooms_file)
-            return True
-        except Exception as e:
-            self.log_service.add_error_log(
-                error_message=f"Ошибка сохранения данных о комнатах: {str(e)}",
-                action="CHAMELEON_ROOMS_SAVE"
-            )
-            return False
+    GAME = "chameleon"
+    ROOM_ID_PREFIX = "chameleon"
+    ACTION_PREFIX = "CHAMELEON"
+    GAME_TITLE = "Хамелеон"
+    ROOMS_FILE = 'src/minigame/chameleon/chameleon_rooms.json'
 
     def create_room(self, host_id, host_name):
         """Создает новую комнату."""
         # Генерируем уникальный ID комнаты
-        room_id = f"chameleon_{random.randint(1000, 9999)}"
+        room_id = self.allocate_room_id()
         current_time = int(time.time())
 
         # Создаем структуру данных комнаты
@@ -72,6 +31,7 @@ class ChameleonRoomService:
             "last_activity": current_time,
             "status": "waiting",  # waiting, playing, finished
             "host_id": host_id,
+            "rng_seed": RngProvider.new_seed(),
             "players": [
                 {
                     "id": host_id,
@@ -93,10 +53,8 @@ class ChameleonRoomService:
             }
         }
 
-        # Сохраняем комнату
-        rooms = self.load_rooms()
-        rooms[room_id] = room_data
-        success = self.save_rooms(rooms)
+        # Сохраняем комнату под её блокировкой
+        success = self.insert_room(room_id, room_data)
 
         if success:
             self.log_service.add_log(
@@ -109,9 +67,14 @@ class ChameleonRoomService:
 
         return room_id if success else None
 
-    def delete_room(self, room_id):
-        """Удаляет комнату."""
-        rooms = self.load_rooms()
+    @room_transaction
+    def delete_room(self, room_id, user_id=None):
+        """
+        Удаляет комнату.
+
+        :param user_id: Кто удаляет комнату; None - система (фоновые задачи)
+        """
+        rooms = self.load_rooms(room_id)
         if room_id in rooms:
             room_data = rooms.pop(room_id)
             success = self.save_rooms(rooms)
@@ -121,26 +84,17 @@ class ChameleonRoomService:
                     level="GAME",
                     action="CHAMELEON_ROOM_DELETE",
                     message=f"Удалена комната Хамелеон",
-                    user_id=app.storage.user.get('user_id'),
+                    user_id=user_id,
                     metadata={"room_id": room_id}
                 )
 
             return success
         return False
 
-    def room_exists(self, room_id):
-        """Проверяет существование комнаты."""
-        rooms = self.load_rooms()
-        return room_id in rooms
-
-    def get_room(self, room_id):
-        """Получает данные о комнате."""
-        rooms = self.load_rooms()
-        return rooms.get(room_id)
-
+    @room_transaction
     def add_player(self, room_id, player_id, player_name):
         """Добавляет игрока в комнату."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -148,7 +102,7 @@ class ChameleonRoomService:
         current_time = int(time.time())
 
         # Проверяем, не находится ли уже игрок в комнате
-        if any(player["id"] == player_id for player in room["players"]):
+        if find_player(room, player_id) is not None:
             return True
 
         # Добавляем игрока
@@ -175,9 +129,10 @@ class ChameleonRoomService:
 
         return success
 
+    @room_transaction
     def remove_player(self, room_id, player_id):
         """Удаляет игрока из комнаты."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -185,7 +140,7 @@ class ChameleonRoomService:
         current_time = int(time.time())
 
         # Находим игрока
-        player_index = next((i for i, p in enumerate(room["players"]) if p["id"] == player_id), -1)
+        player_index = find_player_index(room, player_id)
         if player_index == -1:
             return False
 
@@ -220,9 +175,10 @@ class ChameleonRoomService:
 
         return success
 
+    @room_transaction
     def set_player_ready(self, room_id, player_id, is_ready=True):
         """Устанавливает статус готовности игрока."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -230,7 +186,7 @@ class ChameleonRoomService:
         current_time = int(time.time())
 
         # Находим игрока
-        player = next((p for p in room["players"] if p["id"] == player_id), None)
+        player = find_player(room, player_id)
         if not player:
             return False
 
@@ -260,9 +216,10 @@ class ChameleonRoomService:
 
         return all(player.get("is_ready", False) for player in room["players"])
 
-    def start_game(self, room_id, category, word, grid_words=None):
+    @room_transaction
+    def start_game(self, room_id, category, word, grid_words=None, decks=None):
         """Начинает игру в комнате."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -274,7 +231,7 @@ class ChameleonRoomService:
             return False
 
         # Выбираем случайного игрока в качестве Хамелеона
-        chameleon_index = random.randint(0, len(room["players"]) - 1)
+        chameleon_index = RngProvider.for_room(room).randint(0, len(room["players"]) - 1)
 
         # Обновляем данные игры
         room["status"] = "playing"
@@ -289,6 +246,9 @@ class ChameleonRoomService:
         # Сохраняем сетку слов для стабильного отображения
         if grid_words:
             room["game_data"]["grid_words"] = grid_words
+        if decks is not None:
+            # Состояние колод контента комнаты (см. ContentDeck)
+            room["decks"] = decks
 
         room["last_activity"] = current_time
 
@@ -316,9 +276,10 @@ class ChameleonRoomService:
 
         return success
 
+    @room_transaction
     def add_description(self, room_id, player_id, description):
         """Добавляет описание от игрока."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -330,7 +291,7 @@ class ChameleonRoomService:
             return False
 
         # Находим игрока
-        player = next((p for p in room["players"] if p["id"] == player_id), None)
+        player = find_player(room, player_id)
         if not player:
             return False
 
@@ -371,9 +332,39 @@ class ChameleonRoomService:
 
         return success
 
+    @room_transaction
+    def start_voting_round(self, room_id, user_id=None):
+        """Переводит игру в раунд голосования по решению хоста."""
+        rooms = self.load_rooms(room_id)
+        if room_id not in rooms:
+            return False
+
+        room = rooms[room_id]
+        current_time = int(time.time())
+
+        if room["status"] != "playing" or room["game_data"].get("round", 1) != 1:
+            return False
+
+        room["game_data"]["round"] = 2
+        room["last_activity"] = current_time
+
+        success = self.save_rooms(rooms)
+
+        if success:
+            self.log_service.add_log(
+                level="GAME",
+                action="CHAMELEON_VOTING_START",
+                message="Начался раунд голосования",
+                user_id=user_id,
+                metadata={"room_id": room_id}
+            )
+
+        return success
+
+    @room_transaction
     def add_vote(self, room_id, voter_id, voted_id):
         """Добавляет голос от игрока."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -385,12 +376,12 @@ class ChameleonRoomService:
             return False
 
         # Находим голосующего игрока
-        voter = next((p for p in room["players"] if p["id"] == voter_id), None)
+        voter = find_player(room, voter_id)
         if not voter:
             return False
 
         # Находим игрока, за которого голосуют
-        voted = next((p for p in room["players"] if p["id"] == voted_id), None)
+        voted = find_player(room, voted_id)
         if not voted:
             return False
 
@@ -461,9 +452,10 @@ class ChameleonRoomService:
             "chameleon_caught": chameleon_caught
         }
 
+    @room_transaction
     def check_chameleon_guess(self, room_id, chameleon_id, word_guess):
         """Проверяет догадку Хамелеона."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return None
 
@@ -516,9 +508,10 @@ class ChameleonRoomService:
             "actual_word": actual_word
         }
 
-    def finish_game(self, room_id):
+    @room_transaction
+    def finish_game(self, room_id, user_id=None):
         """Завершает игру."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -539,15 +532,16 @@ class ChameleonRoomService:
                 level="GAME",
                 action="CHAMELEON_GAME_END",
                 message=f"Игра Хамелеон завершена",
-                user_id=app.storage.user.get('user_id'),
+                user_id=user_id,
                 metadata={"room_id": room_id}
             )
 
         return success
 
-    def reset_game(self, room_id):
+    @room_transaction
+    def reset_game(self, room_id, user_id=None):
         """Сбрасывает игру для повторной игры."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -579,28 +573,18 @@ class ChameleonRoomService:
                 level="GAME",
                 action="CHAMELEON_GAME_RESET",
                 message=f"Игра Хамелеон сброшена",
-                user_id=app.storage.user.get('user_id'),
+                user_id=user_id,
                 metadata={"room_id": room_id}
             )
 
         return success
 
-    def get_rooms_list(self):
-        """Возвращает список доступных комнат."""
-        rooms = self.load_rooms()
-        rooms_list = []
-
-        for room_id, room_data in rooms.items():
-            # Добавляем только комнаты в состоянии ожидания
-            if room_data["status"] == "waiting":
-                rooms_list.append({
-                    "room_id": room_id,
-                    "host_name": next((p["name"] for p in room_data["players"] if p.get("is_host")), "Неизвестно"),
-                    "player_count": len(room_data["players"]),
-                    "created_at": room_data["created_at"]
-                })
-
-        # Сортируем по времени создания (новые первыми)
-        rooms_list.sort(key=lambda x: x["created_at"], reverse=True)
-
-        return rooms_list
\ No newline at end of file
+    @staticmethod
+    def lobby_summary(room_id, room):
+        """Сводка комнаты для списка доступных комнат."""
+        return {
+            "room_id": room_id,
+            "host_name": find_host_name(room),
+            "player_count": len(room["players"]),
+            "created_at": room["created_at"]
+        }
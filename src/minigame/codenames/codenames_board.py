@@ -0,0 +1,140 @@
+class CodenamesBoard:
+    """
+    Компактное представление игрового поля Codenames.
+
+    Поле хранится в game_data["board"] в виде:
+        emojis    - список эмоджи карт
+        teams     - список принадлежности карт (-1: убийца, 0: нейтральная, 1-5: команды)
+        revealed  - битовая маска открытых карт (бит i - карта i)
+        totals    - {команда: всего карт}
+        remaining - {команда: неоткрытых карт}
+        grid_size - размер стороны поля
+
+    Объект является обёрткой над этим словарём и изменяет его на месте,
+    поэтому открытие карты и проверка победы выполняются за O(1).
+    """
+
+    ASSASSIN = -1
+    NEUTRAL = 0
+
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+    @classmethod
+    def from_field(cls, field, grid_size=None):
+        """Создаёт поле из списка карт-словарей (формат generate_game_field)."""
+        emojis = [card['emoji'] for card in field]
+        teams = [card['team'] for card in field]
+        revealed = 0
+        totals = {}
+        remaining = {}
+        for index, card in enumerate(field):
+            key = str(card['team'])
+            totals[key] = totals.get(key, 0) + 1
+            if card.get('revealed'):
+                revealed |= 1 << index
+            else:
+                remaining[key] = remaining.get(key, 0) + 1
+            remaining.setdefault(key, 0)
+
+        if grid_size is None:
+            grid_size = max((card.get('col', 0) for card in field), default=-1) + 1 or 1
+
+        return cls({
+            'emojis': emojis,
+            'teams': teams,
+            'revealed': revealed,
+            'totals': totals,
+            'remaining': remaining,
+            'grid_size': grid_size
+        })
+
+    @classmethod
+    def of(cls, room):
+        """
+        Возвращает поле комнаты или None. Комната не изменяется.
+
+        Для комнат, начатых до перехода на компактный формат (game_data["field"]),
+        возвращается отдельное поле: его изменения в комнату не попадают,
+        поэтому перед изменением комнату переводят в новый формат через upgrade().
+        """
+        game_data = room.get('game_data') or {}
+        if game_data.get('board'):
+            return cls(game_data['board'])
+        if game_data.get('field'):
+            return cls.from_field(game_data['field'])
+        return None
+
+    @classmethod
+    def upgrade(cls, room):
+        """
+        Переводит поле комнаты старого формата в компактный на месте.
+
+        :return: True, если комната была изменена
+        """
+        game_data = room.get('game_data') or {}
+        if game_data.get('board') or not game_data.get('field'):
+            return False
+        game_data['board'] = cls.from_field(game_data['field']).data
+        game_data.pop('field', None)
+        return True
+
+    def __len__(self):
+        return len(self.data['teams'])
+
+    def team_at(self, index):
+        return self.data['teams'][index]
+
+    def is_revealed(self, index):
+        return bool((self.data['revealed'] >> index) & 1)
+
+    def reveal(self, index):
+        """
+        Открывает карту и обновляет счётчик неоткрытых карт её команды.
+
+        :return: Команда карты или None, если карта не существует или уже открыта
+        """
+        if index < 0 or index >= len(self.data['teams']) or self.is_revealed(index):
+            return None
+        team = self.data['teams'][index]
+        self.data['revealed'] |= 1 << index
+        key = str(team)
+        self.data['remaining'][key] = self.data['remaining'].get(key, 0) - 1
+        return team
+
+    def remaining(self, team):
+        """Количество неоткрытых карт команды."""
+        return self.data['remaining'].get(str(team), 0)
+
+    def total(self, team):
+        """Количество карт команды на поле."""
+        return self.data['totals'].get(str(team), 0)
+
+    def is_team_cleared(self, team):
+        """Открыты ли все карты команды."""
+        return self.total(team) > 0 and self.remaining(team) == 0
+
+    def team_stats(self):
+        """Возвращает {команда: {'total', 'revealed', 'remaining'}} без обхода поля."""
+        stats = {}
+        for key, total in self.data['totals'].items():
+            remaining = self.data['remaining'].get(key, 0)
+            stats[key] = {'total': total, 'revealed': total - remaining, 'remaining': remaining}
+        return stats
+
+    def card(self, index):
+        """Возвращает карту в формате словаря для UI."""
+        grid_size = self.data.get('grid_size') or 1
+        return {
+            'emoji': self.data['emojis'][index],
+            'team': self.data['teams'][index],
+            'revealed': self.is_revealed(index),
+            'row': index // grid_size,
+            'col': index % grid_size
+        }
+
+    def cards(self):
+        """Возвращает всё поле в формате списка карт-словарей для UI."""
+        return [self.card(index) for index in range(len(self))]
@@ -454,7 +454,7 @@ class CodenamesComponents:
                     'italic text-yellow-700 dark:text-yellow-300')
 
     @staticmethod
-    def create_team_status(teams, field):
+    def create_team_status(teams, field, card_stats=None):
         """Создает панель статуса команд"""
         with ui.card().classes('w-full p-4 mb-4'):
             ui.label('Статус команд').classes('text-lg font-bold mb-3')
@@ -463,11 +463,17 @@ class CodenamesComponents:
                 team_name = team.get('name', f'Команда {team_id}')
                 team_color = team.get('color', 'bg-gray-500')
 
-                # Подсчитываем карты команды
-                team_cards = [card for card in field if card['team'] == int(team_id)]
-                revealed_cards = [card for card in team_cards if card['revealed']]
+                # Подсчитываем карты команды (готовая статистика поля или обход карт)
+                if card_stats is not None:
+                    team_card_stats = card_stats.get(str(team_id), {})
+                    total_cards = team_card_stats.get('total', 0)
+                    revealed_count = team_card_stats.get('revealed', 0)
+                else:
+                    team_cards = [card for card in field if card['team'] == int(team_id)]
+                    total_cards = len(team_cards)
+                    revealed_count = len([card for card in team_cards if card['revealed']])
 
-                remaining = len(team_cards) - len(revealed_cards)
+                remaining = total_cards - revealed_count
 
                 with ui.row().classes('w-full items-center mb-2'):
                     ui.element('div').classes(f'{team_color} w-4 h-4 rounded mr-2')
@@ -475,7 +481,7 @@ class CodenamesComponents:
                     ui.label(f'{remaining} карт осталось').classes('flex-grow')
 
                     # Прогресс-бар
-                    progress = (len(revealed_cards) / len(team_cards)) * 100 if team_cards else 0
+                    progress = (revealed_count / total_cards) * 100 if total_cards else 0
                     with ui.element('div').classes('w-24 bg-gray-200 rounded-full h-2'):
                         ui.element('div').classes(f'{team_color} h-2 rounded-full transition-all').style(
                             f'width: {progress}%')
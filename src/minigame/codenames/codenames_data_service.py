@@ -1,21 +1,26 @@
 import os
 import json
-import random
+from src.minigame.content_catalog import ContentCatalog
+from src.minigame.content_deck import ContentDeck
 from src.services.log.log_services import LogService
+from src.services.rng_provider import RngProvider
 
 
 class CodenamesDataService:
     """
     Сервис для работы с данными игры Codenames.
     Отвечает за загрузку эмоджи из JSON файла и генерацию игрового поля.
+
+    Эмоджи берутся из общего ContentCatalog, который обновляется
+    при изменении файла.
     """
 
-    def __init__(self, data_file='src/minigame/codenames/emoji.json'):
+    def __init__(self, data_file='src/minigame/codenames/emoji.json', rng=None):
         self.data_file = data_file
+        self.rng = rng or RngProvider.get()
         self.log_service = LogService()
-        self.emojis = []
         self.ensure_data_file_exists()
-        self.load_emojis()
+        self.catalog = ContentCatalog.for_file(self.data_file, self.index_emojis, "CODENAMES_DATA_LOAD")
 
     def ensure_data_file_exists(self):
         """Проверяет существование файла данных и создает его при необходимости."""
@@ -51,37 +56,18 @@ class CodenamesDataService:
                     action="CODENAMES_DATA_CREATE"
                 )
 
+    @staticmethod
+    def index_emojis(data):
+        """Строит таблицу эмоджи."""
+        return {'emojis': tuple(data) if isinstance(data, list) else ()}
+
+    @property
+    def emojis(self):
+        return self.catalog.tables['emojis']
+
     def load_emojis(self):
-        """Загружает эмоджи из JSON файла."""
-        try:
-            if not os.path.isabs(self.data_file):
-                current_dir = os.getcwd()
-                abs_path = os.path.join(current_dir, self.data_file)
-            else:
-                abs_path = self.data_file
-
-            if not os.path.exists(abs_path):
-                self.log_service.add_error_log(
-                    error_message=f"Файл данных эмоджи не найден: {abs_path}",
-                    action="CODENAMES_DATA_LOAD"
-                )
-                self.emojis = []
-                return
-
-            with open(abs_path, 'r', encoding='utf-8') as file:
-                self.emojis = json.load(file)
-
-            self.log_service.add_log(
-                level="GAME",
-                action="CODENAMES_DATA_LOAD",
-                message=f"Загружено {len(self.emojis)} эмоджи для игры Codenames из {abs_path}"
-            )
-        except Exception as e:
-            self.log_service.add_error_log(
-                error_message=f"Ошибка загрузки эмоджи: {str(e)}",
-                action="CODENAMES_DATA_LOAD"
-            )
-            self.emojis = []
+        """Принудительно перечитывает эмоджи из JSON файла."""
+        return self.catalog.reload()
 
     def _get_field_config(self, team_count):
         """Возвращает конфигурацию поля для указанного количества команд."""
@@ -109,25 +95,31 @@ class CodenamesDataService:
         }
         return configs.get(team_count, configs[2])
 
-    def generate_game_field(self, team_count):
+    def generate_game_field(self, team_count, decks=None, rng=None):
         """
         Генерирует игровое поле для указанного количества команд.
 
         Args:
             team_count: Количество команд (2-5)
+            decks: Колоды комнаты - если переданы, эмоджи не повторяются
+                   между играми, пока не будут выданы все
+            rng: Генератор комнаты (RngProvider.for_room_content); по умолчанию - общий
 
         Returns:
             list: Список словарей с информацией о каждой карте
         """
-        if not self.emojis:
-            self.load_emojis()
-
+        rng = rng or self.rng
         config = self._get_field_config(team_count)
         grid_size = config['grid_size']
         total_cards = grid_size * grid_size
 
         # Получаем случайные эмоджи
-        selected_emojis = random.sample(self.emojis, min(total_cards, len(self.emojis)))
+        emojis = self.emojis
+        if decks is not None:
+            selected_emojis = ContentDeck.of(decks, "emojis", len(emojis)).draw_from(
+                emojis, min(total_cards, len(emojis)))
+        else:
+            selected_emojis = rng.sample(emojis, min(total_cards, len(emojis)))
 
         # Создаем список типов карт
         card_types = []
@@ -143,7 +135,7 @@ class CodenamesDataService:
         card_types.append(-1)
 
         # Перемешиваем типы карт
-        random.shuffle(card_types)
+        rng.shuffle(card_types)
 
         # Создаем поле
         field = []
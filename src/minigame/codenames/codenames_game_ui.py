@@ -1,11 +1,14 @@
-from datetime import datetime
-
 from nicegui import ui, app
 
+from src.minigame.codenames.codenames_board import CodenamesBoard
 from src.minigame.codenames.codenames_components_ui import CodenamesComponents
-from src.minigame.codenames.codenames_data_service import CodenamesDataService
-from src.minigame.codenames.codenames_room_service import CodenamesRoomService
-from src.services.log.log_services import LogService
+from src.services.presence_service import PresenceService
+from src.services.rng_provider import RngProvider
+from src.services.room_ticker import RoomTicker
+from src.minigame.lobby_rooms_table import LobbyRoomsTable
+from src.minigame.room_eviction import watch_room_eviction
+from src.services.service_container import ServiceContainer
+from src.models.minigame_room import find_player
 
 
 class CodenamesGameUI:
@@ -14,10 +17,11 @@ class CodenamesGameUI:
     Командная игра на угадывание слов по подсказкам капитанов.
     """
 
-    def __init__(self):
-        self.log_service = LogService()
-        self.data_service = CodenamesDataService()
-        self.room_service = CodenamesRoomService()
+    def __init__(self, services=None):
+        services = services or ServiceContainer.get()
+        self.log_service = services.log_service
+        self.data_service = services.data_service('codenames')
+        self.room_service = services.room_service('codenames')
         self.components = CodenamesComponents()
 
         self.current_room_id = None
@@ -28,6 +32,14 @@ class CodenamesGameUI:
         self.update_timer = None
         self.rooms_update_timer = None
 
+        # Уведомления об удалении комнаты сборщиком неактивных комнат
+        self._eviction = watch_room_eviction(self, 'codenames')
+        # Присутствие игроков в комнатах (только в памяти)
+        self.presence = PresenceService.get()
+        self.ticker = RoomTicker.get()
+        # Список комнат обновляется по изменениям индекса лобби, а не по таймеру
+        self._lobby_table = None
+
     def _ensure_player_id(self):
         """Гарантирует, что у нас есть правильный ID игрока"""
         if not self.player_id:
@@ -132,6 +144,8 @@ class CodenamesGameUI:
                         'flex-grow bg-blue-600 hover:bg-blue-700 text-white')
                     ui.button('Присоединиться к игре', icon='login', on_click=self.show_join_menu).classes(
                         'flex-grow bg-green-600 hover:bg-green-700 text-white')
+                    ui.button('Быстрая игра', icon='bolt', on_click=self.quick_join).classes(
+                        'flex-grow bg-indigo-600 hover:bg-indigo-700 text-white')
                     ui.button('Обновить список', icon='refresh', on_click=self.refresh_rooms_list).classes(
                         'bg-gray-200 dark:bg-gray-700 hover:bg-gray-300 dark:hover:bg-gray-600')
 
@@ -141,71 +155,37 @@ class CodenamesGameUI:
         """Создает и отображает список доступных комнат"""
         with ui.card().classes('w-full p-6 mt-4 rounded-xl shadow-lg bg-gray-100 dark:bg-gray-800'):
             ui.label('Доступные комнаты:').classes('text-xl font-bold mb-4 text-blue-600 dark:text-blue-400')
-            rooms_container = ui.element('div').classes('w-full')
-
-            def update_rooms_list():
-                rooms_container.clear()
-                with rooms_container:
-                    available_rooms = self.room_service.get_rooms_list()
-
-                    if available_rooms:
-                        rows = []
-                        for i, room in enumerate(available_rooms):
-                            rows.append({
-                                'id': room['room_id'],
-                                'room_id': room['room_id'],
-                                'host_name': room['host_name'],
-                                'player_count': room['player_count'],
-                                'team_count': room['team_count'],
-                                'created_at': datetime.fromtimestamp(room['created_at']).strftime('%H:%M:%S')
-                            })
-
-                        columns = [
-                            {'name': 'room_id', 'label': 'ID комнаты', 'field': 'room_id', 'align': 'center'},
-                            {'name': 'host_name', 'label': 'Создатель', 'field': 'host_name', 'align': 'center'},
-                            {'name': 'player_count', 'label': 'Игроков', 'field': 'player_count', 'align': 'center'},
-                            {'name': 'team_count', 'label': 'Команд', 'field': 'team_count', 'align': 'center'},
-                            {'name': 'created_at', 'label': 'Создана', 'field': 'created_at', 'align': 'center'},
-                            {'name': 'action', 'label': 'Действие', 'field': 'action', 'align': 'center'},
-                        ]
-
-                        table = ui.table(
-                            columns=columns,
-                            rows=rows,
-                            row_key='id',
-                            column_defaults={'align': 'center', 'headerClasses': 'uppercase text-primary'}
-                        ).classes('w-full')
-
-                        table.add_slot('body', '''
-                            <q-tr :props="props">
-                                <q-td v-for="col in props.cols" :key="col.name" :props="props" class="text-center">
-                                    <template v-if="col.name === 'action'">
-                                        <div class="flex justify-center">
-                                            <q-btn color="primary" dense icon="login" size="md"
-                                                   @click="() => $parent.$emit('join', props.row.room_id)">
-                                                Присоединиться
-                                            </q-btn>
-                                        </div>
-                                    </template>
-                                    <template v-else>
-                                        <span>{{ col.value }}</span>
-                                    </template>
-                                </q-td>
-                            </q-tr>
-                        ''')
-
-                        table.on('join', lambda e: self.join_game(e.args))
-                    else:
-                        with ui.card().classes('w-full p-4 bg-gray-200 dark:bg-gray-700 rounded-lg'):
-                            with ui.row().classes('items-center justify-center text-gray-500 dark:text-gray-400'):
-                                ui.icon('info').classes('text-xl mr-2')
-                                ui.label('Нет доступных комнат').classes('text-center')
+            # Таблица обновляется по разнице индекса лобби, без пересоздания элементов
+            self._lobby_table = LobbyRoomsTable(self.room_service, self.join_game, extra_columns=[
+                {'name': 'team_count', 'label': 'Команд', 'field': 'team_count', 'align': 'center'}])
 
-            update_rooms_list()
-            self.rooms_update_timer = ui.timer(5.0, update_rooms_list)
+    def quick_join(self):
+        """Присоединяется к открытой комнате, где больше всего игроков."""
+        room_id = self.room_service.find_open_room()
+        if not room_id:
+            ui.notify('Нет открытых комнат, создайте новую', type='info')
+            return
+        self.join_game(room_id)
+
+    def _subscribe_room_tick(self, update, interval=1.0):
+        """Подписывает экран на общий тик текущей комнаты вместо собственного таймера."""
+        room_id = self.current_room_id
+        return self.ticker.subscribe(
+            'codenames', room_id, self.room_service.get_room,
+            lambda room_data: update(room_data if room_id == self.current_room_id else None),
+            interval)
+
+    def _touch_presence(self):
+        """Сигнал присутствия игрока в текущей комнате."""
+        player_id = self.player_id
+        if self.current_room_id and player_id:
+            self.presence.heartbeat('codenames', self.current_room_id, player_id, ui.context.client.id)
 
     def _cancel_timers(self):
         """Отменяет все активные таймеры"""
+        if self._lobby_table is not None:
+            self._lobby_table.close()
+            self._lobby_table = None
         if self.update_timer:
             try:
                 self.update_timer.cancel()
@@ -267,7 +247,7 @@ class CodenamesGameUI:
             room_id_input.props('outlined dense rounded')
 
             def join_room():
-                room_id = room_id_input.value.strip()
+                room_id = self.room_service.id_allocator.normalize(room_id_input.value)
                 if not room_id:
                     ui.notify('Введите ID комнаты', type='warning')
                     return
@@ -343,9 +323,9 @@ class CodenamesGameUI:
 
         # Отменяем существующие таймеры и создаем новый
         self._cancel_timers()
-        self.update_timer = ui.timer(2.0, lambda: self.update_waiting_room())
+        self.update_timer = self._subscribe_room_tick(self.update_waiting_room, 2.0)
 
-        current_player = next((p for p in room_data["players"] if p["id"] == self.player_id), None)
+        current_player = find_player(room_data, self.player_id)
         is_host = current_player and current_player.get("is_host", False)
 
         # Создаем или обновляем контент
@@ -446,8 +426,11 @@ class CodenamesGameUI:
                                 return
 
                             try:
-                                field = self.data_service.generate_game_field(teams_count)
-                                success = self.room_service.start_game(self.current_room_id, field)
+                                room = self.room_service.get_room(self.current_room_id) or room_data
+                                decks = room.get("decks", {})
+                                field = self.data_service.generate_game_field(
+                                    teams_count, decks, RngProvider.for_room_content(room, "field"))
+                                success = self.room_service.start_game(self.current_room_id, field, decks)
                                 if success:
                                     ui.notify('Игра началась!', type='positive')
                                     self._waiting_room_shown = False
@@ -589,14 +572,16 @@ class CodenamesGameUI:
                 ui.label('Только создатель комнаты может создавать новые команды').classes(
                     'text-gray-500 italic mt-4')
 
-    def update_waiting_room(self):
+    def update_waiting_room(self, room_data=None):
         """Обновляет данные в комнате ожидания."""
+        self._touch_presence()
         if not self.current_room_id:
             self._cancel_timers()
             return
 
         try:
-            room_data = self.room_service.get_room(self.current_room_id)
+            if room_data is None:
+                room_data = self.room_service.get_room(self.current_room_id)
             if not room_data:
                 self._cancel_timers()
                 ui.notify('Комната была удалена', type='negative')
@@ -616,7 +601,7 @@ class CodenamesGameUI:
             if room_data.get("last_activity", 0) > self.last_update_time:
                 self.last_update_time = room_data.get("last_activity", 0)
 
-                current_player = next((p for p in room_data["players"] if p["id"] == self.player_id), None)
+                current_player = find_player(room_data, self.player_id)
                 is_host = current_player and current_player.get("is_host", False)
 
                 # Перерисовываем только содержимое
@@ -825,7 +810,7 @@ class CodenamesGameUI:
             return
 
         try:
-            success = self.room_service.update_settings(self.current_room_id, settings)
+            success = self.room_service.update_settings(self.current_room_id, settings, user_id=self.player_id)
             if success:
                 ui.notify('Настройки обновлены', type='positive')
 
@@ -874,9 +859,9 @@ class CodenamesGameUI:
         self.game_container.clear()
 
         self._cancel_timers()
-        self.update_timer = ui.timer(1.0, lambda: self.update_game_screen())
+        self.update_timer = self._subscribe_room_tick(self.update_game_screen, 1.0)
 
-        current_player = next((p for p in room_data["players"] if p["id"] == self.player_id), None)
+        current_player = find_player(room_data, self.player_id)
 
         if not current_player:
             ui.notify('Игрок не найден в комнате', type='negative')
@@ -910,8 +895,9 @@ class CodenamesGameUI:
                 self.end_turn
             )
 
-            # Игровое поле
-            field = room_data["game_data"]["field"]
+            # Игровое поле: карты строятся из компактного поля только для отрисовки
+            board = CodenamesBoard.of(room_data)
+            field = board.cards() if board else []
             grid_size = self.data_service.get_grid_size(len(room_data["teams"]))
 
             self.components.create_game_field(
@@ -922,7 +908,7 @@ class CodenamesGameUI:
             )
 
             # Статус команд
-            self.components.create_team_status(room_data["teams"], field)
+            self.components.create_team_status(room_data["teams"], field, board.team_stats() if board else {})
 
             # Список игроков
             with ui.card().classes('w-full p-6 rounded-xl shadow-lg bg-gray-100 dark:bg-gray-800 mb-4'):
@@ -976,13 +962,15 @@ class CodenamesGameUI:
                     ui.button('Выйти в меню', icon='home', on_click=self.return_to_menu).classes(
                         'bg-gray-500 hover:bg-gray-600 text-white')
 
-    def update_game_screen(self):
+    def update_game_screen(self, room_data=None):
         """Обновляет данные на экране игры - ИСПРАВЛЕНО."""
+        self._touch_presence()
         if not self.current_room_id:
             self._cancel_timers()
             return
 
-        room_data = self.room_service.get_room(self.current_room_id)
+        if room_data is None:
+            room_data = self.room_service.get_room(self.current_room_id)
         if not room_data:
             self._cancel_timers()
             ui.notify('Комната была удалена', type='negative')
@@ -1074,7 +1062,7 @@ class CodenamesGameUI:
         if not self.current_room_id:
             return
 
-        success = self.room_service.reset_game(self.current_room_id)
+        success = self.room_service.reset_game(self.current_room_id, user_id=self.player_id)
         if success:
             ui.notify('Игра сброшена', type='positive')
             self.show_waiting_room()
@@ -1099,6 +1087,7 @@ class CodenamesGameUI:
             self.current_room_id,
             self.player_id
         )
+        self.presence.leave('codenames', self.current_room_id, self.player_id)
 
         if success:
             ui.notify('Вы покинули игру', type='positive')
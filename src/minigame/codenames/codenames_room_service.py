@@ -1,66 +1,35 @@
-import json
-import os
 import time
-import random
-from nicegui import app
-from src.services.log.log_services import LogService
+from src.services.rng_provider import RngProvider
+from src.minigame.room_store import room_transaction
+from src.minigame.room_service import MinigameRoomService
+from src.minigame.codenames.codenames_board import CodenamesBoard
+from src.models.minigame_room import find_player, find_player_index, find_host_name
 
 
-class CodenamesRoomService:
+class CodenamesRoomService(MinigameRoomService):
     """
     Сервис для управления игровыми комнатами в игре Codenames.
     Отвечает за создание/удаление комнат, управление игроками, командами и ходами.
     """
 
-    def __init__(self, rooms_file='src/minigame/codenames/codenames_rooms.json'):
-        self.rooms_file = rooms_file
-        self.log_service = LogService()
-        self.ensure_rooms_file_exists()
+    GAME = "codenames"
+    ROOM_ID_PREFIX = "codenames"
+    ACTION_PREFIX = "CODENAMES"
+    GAME_TITLE = "Codenames"
+    ROOMS_FILE = 'src/minigame/codenames/codenames_rooms.json'
 
-    def ensure_rooms_file_exists(self):
-        """Проверяет существование файла с данными о комнатах."""
-        directory = os.path.dirname(self.rooms_file)
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-
-        if not os.path.exists(self.rooms_file):
-            self.save_rooms({})
-
-    def load_rooms(self):
-        """Загружает данные о комнатах из файла."""
-        try:
-            with open(self.rooms_file, 'r', encoding='utf-8') as file:
-                return json.load(file)
-        except Exception as e:
-            self.log_service.add_error_log(
-                error_message=f"Ошибка загрузки данных о комнатах Codenames: {str(e)}",
-                action="CODENAMES_ROOMS_LOAD"
-            )
-            return {}
-
-    def save_rooms(self, rooms_data):
-        """Сохраняет данные о комнатах в файл."""
-        try:
-            directory = os.path.dirname(self.rooms_file)
-            if not os.path.exists(directory):
-                os.makedirs(directory)
-
-            temp_file = f"{self.rooms_file}.tmp"
-            with open(temp_file, 'w', encoding='utf-8') as file:
-                json.dump(rooms_data, file, indent=2, ensure_ascii=False)
+    def prepare_room(self, room):
+        """
+        Изменяемую комнату в старом формате поля переводит в компактный до изменения.
 
-            os.replace(temp_file, self.rooms_file)
-            return True
-        except Exception as e:
-            self.log_service.add_error_log(
-                error_message=f"Ошибка сохранения данных о комнатах Codenames: {str(e)}",
-                action="CODENAMES_ROOMS_SAVE"
-            )
-            return False
+        Карты для отрисовки строит UI через CodenamesBoard.of(room).cards().
+        """
+        CodenamesBoard.upgrade(room)
 
     def create_room(self, host_id, host_name):
         """Создает новую комнату."""
-        room_id = f"codenames_{random.randint(1000, 9999)}"
+        # Генерируем уникальный ID комнаты
+        room_id = self.allocate_room_id()
         current_time = int(time.time())
 
         room_data = {
@@ -69,6 +38,7 @@ class CodenamesRoomService:
             "last_activity": current_time,
             "status": "waiting",  # waiting, playing, finished
             "host_id": host_id,
+            "rng_seed": RngProvider.new_seed(),
             "settings": {
                 "team_count": 2,
                 "hint_mode": "written"  # written или verbal
@@ -93,7 +63,7 @@ class CodenamesRoomService:
                 }
             ],
             "game_data": {
-                "field": [],
+                "board": None,
                 "current_team": 1,
                 "current_hint": None,
                 "round": 0,
@@ -102,9 +72,8 @@ class CodenamesRoomService:
             }
         }
 
-        rooms = self.load_rooms()
-        rooms[room_id] = room_data
-        success = self.save_rooms(rooms)
+        # Сохраняем комнату под её блокировкой
+        success = self.insert_room(room_id, room_data)
 
         if success:
             self.log_service.add_log(
@@ -117,9 +86,14 @@ class CodenamesRoomService:
 
         return room_id if success else None
 
-    def delete_room(self, room_id):
-        """Удаляет комнату."""
-        rooms = self.load_rooms()
+    @room_transaction
+    def delete_room(self, room_id, user_id=None):
+        """
+        Удаляет комнату.
+
+        :param user_id: Кто удаляет комнату; None - система (фоновые задачи)
+        """
+        rooms = self.load_rooms(room_id)
         if room_id in rooms:
             rooms.pop(room_id)
             success = self.save_rooms(rooms)
@@ -129,26 +103,17 @@ class CodenamesRoomService:
                     level="GAME",
                     action="CODENAMES_ROOM_DELETE",
                     message=f"Удалена комната Codenames",
-                    user_id=app.storage.user.get('user_id'),
+                    user_id=user_id,
                     metadata={"room_id": room_id}
                 )
 
             return success
         return False
 
-    def room_exists(self, room_id):
-        """Проверяет существование комнаты."""
-        rooms = self.load_rooms()
-        return room_id in rooms
-
-    def get_room(self, room_id):
-        """Получает данные о комнате."""
-        rooms = self.load_rooms()
-        return rooms.get(room_id)
-
+    @room_transaction
     def add_player(self, room_id, player_id, player_name):
         """Добавляет игрока в комнату."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -156,7 +121,7 @@ class CodenamesRoomService:
         current_time = int(time.time())
 
         # Проверяем, не находится ли уже игрок в комнате
-        if any(player["id"] == player_id for player in room["players"]):
+        if find_player(room, player_id) is not None:
             return True
 
         # Добавляем игрока в комнату без команды
@@ -184,9 +149,10 @@ class CodenamesRoomService:
 
         return success
 
+    @room_transaction
     def remove_player(self, room_id, player_id):
         """Удаляет игрока из комнаты."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -194,7 +160,7 @@ class CodenamesRoomService:
         current_time = int(time.time())
 
         # Находим игрока
-        player_index = next((i for i, p in enumerate(room["players"]) if p["id"] == player_id), -1)
+        player_index = find_player_index(room, player_id)
         if player_index == -1:
             return False
 
@@ -247,9 +213,10 @@ class CodenamesRoomService:
 
         return success
 
-    def start_game(self, room_id, field):
+    @room_transaction
+    def start_game(self, room_id, field, decks=None):
         """Начинает игру в комнате."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -262,15 +229,19 @@ class CodenamesRoomService:
 
         # Определяем порядок ходов (случайный выбор первой команды)
         team_ids = list(room["teams"].keys())
-        random.shuffle(team_ids)
+        RngProvider.for_room(room).shuffle(team_ids)
 
         # Обновляем данные игры
         room["status"] = "playing"
-        room["game_data"]["field"] = field
+        room["game_data"]["board"] = CodenamesBoard.from_field(field).data
+        room["game_data"].pop("field", None)
         room["game_data"]["current_team"] = int(team_ids[0])
         room["game_data"]["turn_order"] = [int(tid) for tid in team_ids]
         room["game_data"]["round"] = 1
         room["game_data"]["game_started"] = True
+        if decks is not None:
+            # Состояние колод контента комнаты (см. ContentDeck)
+            room["decks"] = decks
         room["last_activity"] = current_time
 
         # Обновляем время действия для всех игроков
@@ -313,9 +284,10 @@ class CodenamesRoomService:
 
         return True
 
+    @room_transaction
     def join_team(self, room_id, player_id, team_id, role):
         """Присоединяет игрока к команде в указанной роли."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -323,7 +295,7 @@ class CodenamesRoomService:
         current_time = int(time.time())
 
         # Находим игрока
-        player = next((p for p in room["players"] if p["id"] == player_id), None)
+        player = find_player(room, player_id)
         if not player:
             return False
 
@@ -434,9 +406,10 @@ class CodenamesRoomService:
 
         return success
 
-    def update_settings(self, room_id, settings):
+    @room_transaction
+    def update_settings(self, room_id, settings, user_id=None):
         """Обновляет настройки комнаты."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -476,15 +449,16 @@ class CodenamesRoomService:
                 level="GAME",
                 action="CODENAMES_UPDATE_SETTINGS",
                 message=f"Обновлены настройки комнаты",
-                user_id=app.storage.user.get('user_id'),
+                user_id=user_id,
                 metadata={"room_id": room_id, "settings": settings}
             )
 
         return success
 
+    @room_transaction
     def set_hint(self, room_id, player_id, hint_text, hint_count):
         """Устанавливает подсказку от капитана."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -518,9 +492,10 @@ class CodenamesRoomService:
 
         return success
 
+    @room_transaction
     def make_guess(self, room_id, player_id, card_index):
         """Обрабатывает угадывание карты игроком."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -529,18 +504,17 @@ class CodenamesRoomService:
 
         # Проверяем, что игрок в текущей команде
         current_team = room["game_data"]["current_team"]
-        player = next((p for p in room["players"] if p["id"] == player_id), None)
+        player = find_player(room, player_id)
         if not player or player.get("team") != str(current_team):
             return False
 
         # Проверяем, что карта существует и не открыта
-        field = room["game_data"]["field"]
-        if card_index >= len(field) or field[card_index]["revealed"]:
+        board = CodenamesBoard.of(room)
+        if not board or card_index < 0 or card_index >= len(board) or board.is_revealed(card_index):
             return False
 
         # Открываем карту
-        card = field[card_index]
-        card["revealed"] = True
+        card_team = board.reveal(card_index)
 
         # Увеличиваем счетчик попыток
         hint = room["game_data"]["current_hint"]
@@ -548,7 +522,7 @@ class CodenamesRoomService:
             hint["guesses_made"] += 1
 
         # Определяем результат хода
-        result = self._process_guess_result(room, card, current_team)
+        result = self._process_guess_result(room, board, card_team, current_team)
 
         room["last_activity"] = current_time
         success = self.save_rooms(rooms)
@@ -557,12 +531,12 @@ class CodenamesRoomService:
             self.log_service.add_log(
                 level="GAME",
                 action="CODENAMES_MAKE_GUESS",
-                message=f"Игрок открыл карту {card['emoji']}",
+                message=f"Игрок открыл карту {board.card(card_index)['emoji']}",
                 user_id=player_id,
                 metadata={
                     "room_id": room_id,
                     "team": current_team,
-                    "card_team": card["team"],
+                    "card_team": card_team,
                     "result": result
                 }
             )
@@ -571,11 +545,9 @@ class CodenamesRoomService:
 
     # Исправления для codenames_room_service.py - замените метод _process_guess_result
 
-    def _process_guess_result(self, room, card, current_team):
+    def _process_guess_result(self, room, board, card_team, current_team):
         """Обрабатывает результат угадывания - ИСПРАВЛЕНО."""
-        card_team = card["team"]
-
-        if card_team == -1:
+        if card_team == CodenamesBoard.ASSASSIN:
             # Попали на убийцу - команда проигрывает
             room["status"] = "finished"
             room["game_data"]["winner"] = "assassin"
@@ -586,7 +558,7 @@ class CodenamesRoomService:
         elif card_team == current_team:
             # Угадали свою карту - могут продолжать
             # Проверяем, выиграла ли команда
-            if self._check_team_victory(room, current_team):
+            if board.is_team_cleared(current_team):
                 room["status"] = "finished"
                 room["game_data"]["winner"] = current_team
                 room["game_data"]["game_end_reason"] = "victory"
@@ -634,15 +606,6 @@ class CodenamesRoomService:
 
         return result
 
-    @staticmethod
-    def _check_team_victory(room, team_id):
-        """Проверяет, выиграла ли команда."""
-        field = room["game_data"]["field"]
-        team_cards = [card for card in field if card["team"] == team_id]
-        revealed_team_cards = [card for card in team_cards if card["revealed"]]
-
-        return len(revealed_team_cards) == len(team_cards)
-
     @staticmethod
     def _switch_turn(room):
         """Переключает ход на следующую команду."""
@@ -660,9 +623,10 @@ class CodenamesRoomService:
         # Сбрасываем подсказку
         room["game_data"]["current_hint"] = None
 
+    @room_transaction
     def end_turn(self, room_id, player_id):
         """Заканчивает ход команды."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -671,7 +635,7 @@ class CodenamesRoomService:
 
         # Проверяем, что игрок в текущей команде
         current_team = room["game_data"]["current_team"]
-        player = next((p for p in room["players"] if p["id"] == player_id), None)
+        player = find_player(room, player_id)
         if not player or player.get("team") != str(current_team):
             return False
 
@@ -692,9 +656,10 @@ class CodenamesRoomService:
 
         return success
 
-    def finish_game(self, room_id):
+    @room_transaction
+    def finish_game(self, room_id, user_id=None):
         """Завершает игру."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -709,15 +674,16 @@ class CodenamesRoomService:
                 level="GAME",
                 action="CODENAMES_GAME_END",
                 message=f"Игра Codenames завершена",
-                user_id=app.storage.user.get('user_id'),
+                user_id=user_id,
                 metadata={"room_id": room_id}
             )
 
         return success
 
-    def reset_game(self, room_id):
+    @room_transaction
+    def reset_game(self, room_id, user_id=None):
         """Сбрасывает игру для повторной игры."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -727,7 +693,7 @@ class CodenamesRoomService:
         # Сбрасываем данные игры
         room["status"] = "waiting"
         room["game_data"] = {
-            "field": [],
+            "board": None,
             "current_team": 1,
             "current_hint": None,
             "round": 0,
@@ -747,29 +713,22 @@ class CodenamesRoomService:
                 level="GAME",
                 action="CODENAMES_GAME_RESET",
                 message=f"Игра Codenames сброшена",
-                user_id=app.storage.user.get('user_id'),
+                user_id=user_id,
                 metadata={"room_id": room_id}
             )
 
         return success
 
-    def get_rooms_list(self):
-        """Возвращает список доступных комнат."""
-        rooms = self.load_rooms()
-        rooms_list = []
-
-        for room_id, room_data in rooms.items():
-            if room_data["status"] == "waiting":
-                rooms_list.append({
-                    "room_id": room_id,
-                    "host_name": next((p["name"] for p in room_data["players"] if p.get("is_host")), "Неизвестно"),
-                    "player_count": len(room_data["players"]),
-                    "team_count": len(room_data["teams"]),
-                    "created_at": room_data["created_at"]
-                })
-
-        rooms_list.sort(key=lambda x: x["created_at"], reverse=True)
-        return rooms_list
+    @staticmethod
+    def lobby_summary(room_id, room):
+        """Сводка комнаты для списка доступных комнат."""
+        return {
+            "room_id": room_id,
+            "host_name": find_host_name(room),
+            "player_count": len(room["players"]),
+            "team_count": len(room["teams"]),
+            "created_at": room["created_at"]
+        }
 
     @staticmethod
     def _validate_team_action(room, player_id, team_id, role):
@@ -787,7 +746,7 @@ class CodenamesRoomService:
         """
 
         # Проверяем, что игрок существует
-        player = next((p for p in room["players"] if p["id"] == player_id), None)
+        player = find_player(room, player_id)
         if not player:
             return False, "Игрок не найден в комнате"
 
@@ -844,8 +803,8 @@ class CodenamesRoomService:
             members = team.get("members", [])
 
             # Проверяем, существуют ли игроки команды в комнате
-            captain_exists = captain and any(p["id"] == captain for p in room["players"])
-            valid_members = [m for m in members if any(p["id"] == m for p in room["players"])]
+            captain_exists = captain and find_player(room, captain) is not None
+            valid_members = [m for m in members if find_player(room, m) is not None]
 
             if not captain_exists and not valid_members:
                 teams_to_remove.append(team_id)
@@ -905,7 +864,7 @@ class CodenamesRoomService:
         if not room:
             return {"error": "Комната не найдена"}
 
-        player = next((p for p in room["players"] if p["id"] == player_id), None)
+        player = find_player(room, player_id)
         if not player:
             return {"error": "Игрок не найден"}
 
@@ -0,0 +1,133 @@
+import atexit
+import json
+import os
+import threading
+
+import watchfiles
+
+from src.services.log.log_services import LogService
+
+
+class ContentCatalog:
+    """
+    Общий для процесса каталог игрового контента (категории, слова, эмоджи).
+
+    Файл контента читается один раз и индексируется функцией indexer в
+    готовые таблицы (кортежи слов, словари категория -> слова), из которых
+    сервисы данных берут случайные элементы без повторного чтения файла.
+    Изменения файлов отслеживаются одним фоновым потоком watchfiles:
+    при записи файла таблицы перестраиваются и подменяются целиком.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+    _watcher = None
+    _watch_restart = threading.Event()
+    _stopping = False
+
+    def __init__(self, data_file, indexer, action, default=None):
+        """
+        :param data_file: Путь к JSON файлу контента
+        :param indexer: Функция data -> словарь таблиц
+        :param action: Действие для логов загрузки (например, SPY_DATA_LOAD)
+        :param default: Функция, возвращающая данные, если файл не прочитан
+        """
+        self.data_file = data_file
+        self.indexer = indexer
+        self.action = action
+        self.default = default
+        self.log_service = LogService()
+        self.version = 0
+        self.tables = None
+        self._reload_lock = threading.Lock()
+        self.reload()
+
+    @classmethod
+    def for_file(cls, data_file, indexer, action, default=None):
+        """Возвращает общий каталог для файла контента и запускает наблюдение за ним."""
+        key = os.path.abspath(data_file)
+        with cls._instances_lock:
+            created = key not in cls._instances
+            if created:
+                cls._instances[key] = cls(data_file, indexer, action, default)
+            catalog = cls._instances[key]
+        if created:
+            cls._ensure_watcher()
+        return catalog
+
+    def reload(self):
+        """
+        Перечитывает файл и подменяет таблицы.
+
+        При ошибке чтения остаются прежние таблицы (или таблицы из default).
+
+        :return: True, если файл прочитан
+        """
+        with self._reload_lock:
+            try:
+                with open(self.data_file, 'r', encoding='utf-8') as file:
+                    data = json.load(file)
+                tables = self.indexer(data)
+            except Exception as e:
+                self.log_service.add_error_log(
+                    error_message=f"Ошибка загрузки контента {self.data_file}: {str(e)}",
+                    action=self.action
+                )
+                if self.tables is None:
+                    self.tables = self.indexer(self.default() if self.default else {})
+                return False
+
+            self.tables = tables
+            self.version += 1
+
+        self.log_service.add_log(
+            level="GAME",
+            action=self.action,
+            message=f"Загружен контент из {self.data_file} (версия {self.version})",
+            metadata={name: len(table) for name, table in tables.items()}
+        )
+        return True
+
+    @classmethod
+    def _ensure_watcher(cls):
+        """Запускает поток наблюдения или перезапускает его с новым набором файлов."""
+        with cls._instances_lock:
+            if cls._watcher is None or not cls._watcher.is_alive():
+                cls._watch_restart.clear()
+                cls._watcher = threading.Thread(target=cls._watch_loop, name="content-catalog-watcher",
+                                                daemon=True)
+                cls._watcher.start()
+                atexit.register(cls._stop_watcher)
+            else:
+                cls._watch_restart.set()
+
+    @classmethod
+    def _stop_watcher(cls):
+        # Поток нужно остановить до завершения интерпретатора, пока он ждёт в watchfiles
+        cls._stopping = True
+        cls._watch_restart.set()
+        if cls._watcher is not None:
+            cls._watcher.join(timeout=2)
+
+    @classmethod
+    def _watch_loop(cls):
+        while not cls._stopping:
+            with cls._instances_lock:
+                catalogs = dict(cls._instances)
+                cls._watch_restart.clear()
+            directories = {os.path.dirname(key) for key in catalogs}
+
+            try:
+                # Следим за каталогами, а не за файлами: запись через os.replace
+                # подменяет файл, и наблюдение за самим файлом теряется
+                for changes in watchfiles.watch(
+                        *directories,
+                        watch_filter=lambda change, path: os.path.abspath(path) in catalogs,
+                        stop_event=cls._watch_restart,
+                        raise_interrupt=False):
+                    for key in {os.path.abspath(path) for _, path in changes}:
+                        if os.path.exists(key):
+                            catalogs[key].reload()
+            except Exception as e:
+                print(f"❌ Error watching content files: {e}")
+                cls._watch_restart.wait(5)
@@ -0,0 +1,86 @@
+from src.services.rng_provider import RngProvider
+
+
+class ContentDeck:
+    """
+    Колода для выдачи контента без повторов в пределах комнаты.
+
+    Колода - лениво перемешиваемая перестановка индексов пула контента
+    (алгоритм Фишера-Йетса, выполняемый по мере выдачи). Состояние
+    хранится в комнате в виде:
+        size     - размер пула, для которого построена колода
+        position - сколько карт уже выдано
+        swaps    - {индекс: значение} для ещё не выданных позиций,
+                   которые были затронуты перестановкой
+        seed     - зерно колоды
+        shuffles - сколько раз колода перемешивалась
+
+    swaps содержит не больше записей, чем выдано карт, поэтому состояние
+    компактно, а выдача k карт выполняется за O(k). Когда колода
+    заканчивается (или пул контента изменил размер), она тасуется заново.
+    Случайность каждой выдачи определяется (seed, shuffles, position),
+    поэтому по сохранённому состоянию выдача воспроизводима.
+    """
+
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+    @classmethod
+    def of(cls, decks, name, size):
+        """
+        Возвращает колоду name из словаря колод комнаты, создавая её при необходимости.
+
+        :param decks: Словарь колод комнаты (изменяется на месте)
+        :param name: Название колоды (например, "nouns" или "locations:Россия")
+        :param size: Текущий размер пула контента
+        """
+        data = decks.get(name)
+        if not data or data.get('size') != size:
+            data = {'size': size, 'position': 0, 'swaps': {}, 'seed': RngProvider.new_seed(), 'shuffles': 0}
+            decks[name] = data
+        return cls(data)
+
+    @property
+    def remaining(self):
+        """Количество карт до следующего перемешивания."""
+        return self.data['size'] - self.data['position']
+
+    def reshuffle(self):
+        self.data['position'] = 0
+        self.data['swaps'] = {}
+        self.data['shuffles'] = self.data.get('shuffles', 0) + 1
+
+    def draw(self, count=1):
+        """
+        Выдаёт count различных индексов пула.
+
+        Если в колоде осталось меньше count карт, она перемешивается заново,
+        чтобы внутри одной выдачи не было повторов.
+        """
+        size = self.data['size']
+        count = min(count, size)
+        if self.remaining < count:
+            self.reshuffle()
+
+        if self.data.get('seed') is None:
+            self.data['seed'] = RngProvider.new_seed()
+        swaps = self.data['swaps']
+        position = self.data['position']
+        rng = RngProvider.derive(self.data['seed'], self.data.get('shuffles', 0), position)
+        drawn = []
+        for i in range(position, position + count):
+            j = rng.randrange(i, size)
+            value_i = swaps.get(str(i), i)
+            value_j = swaps.get(str(j), j)
+            swaps[str(j)] = value_i
+            swaps.pop(str(i), None)
+            drawn.append(value_j)
+
+        self.data['position'] = position + count
+        return drawn
+
+    def draw_from(self, pool, count=1):
+        """Выдаёт count различных элементов пула."""
+        return [pool[index] for index in self.draw(count)]
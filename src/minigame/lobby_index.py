@@ -0,0 +1,158 @@
+import bisect
+import threading
+
+from src.services.client_callback import ClientCallback
+
+
+class LobbyIndex:
+    """
+    Общий для процесса индекс открытых комнат мини-игры (лобби).
+
+    Хранит краткие сведения о комнатах в статусе waiting, отсортированные
+    по времени создания (новые первыми). Индекс обновляется сервисом комнат
+    при каждом сохранении: пересчитываются сводки изменённых комнат, и подписчикам
+    рассылается только разница (added / updated / removed), поэтому
+    клиентам не нужно перечитывать и пересобирать список по таймеру.
+    Разница доставляется каждому подписчику в его собственном слоте и
+    контексте клиента (ClientCallback), после действия, которое её вызвало.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, game, summarize):
+        """
+        :param game: Название игры
+        :param summarize: Функция (room_id, room) -> сводка комнаты для лобби
+        """
+        self.game = game
+        self.summarize = summarize
+        self.version = 0
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._entries = {}
+        self._order = []  # [(-created_at, room_id)]
+        self._subscribers = []
+
+    @classmethod
+    def for_game(cls, game, summarize):
+        """Возвращает общий индекс лобби игры."""
+        with cls._instances_lock:
+            if game not in cls._instances:
+                cls._instances[game] = cls(game, summarize)
+            return cls._instances[game]
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    def subscribe(self, callback):
+        """
+        Подписывает текущий экран клиента на изменения лобби: callback(game, diff).
+
+        Вызывается из обработчика UI. Подписка снимается вместе с экраном.
+
+        :return: ClientCallback с методом cancel()
+        """
+        subscription = ClientCallback(callback)
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s.alive]
+            self._subscribers.append(subscription)
+        return subscription
+
+    def _notify(self, diff):
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s.alive]
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.call(self.game, diff)
+
+    @staticmethod
+    def _sort_key(room_id, summary):
+        return -summary.get("created_at", 0), room_id
+
+    def _discard(self, key):
+        index = bisect.bisect_left(self._order, key)
+        if index < len(self._order) and self._order[index] == key:
+            del self._order[index]
+
+    def sync(self, rooms, room_ids=None):
+        """
+        Приводит индекс к состоянию rooms и рассылает разницу подписчикам.
+
+        :param rooms: Словарь всех комнат игры после сохранения
+        :param room_ids: Комнаты, изменённые или удалённые сохранением; пересчитываются
+                         только они. None (и первая синхронизация) - все комнаты
+        :return: Разница {'added', 'updated', 'removed', 'version'} или None, если изменений нет
+        """
+        with self._lock:
+            added, updated, removed = [], [], []
+            if room_ids is None or not self._loaded:
+                room_ids = set(rooms) | set(self._entries)
+            for room_id in room_ids:
+                room = rooms.get(room_id)
+                previous = self._entries.get(room_id)
+                if room is None or room.get("status") != "waiting":
+                    if previous is not None:
+                        del self._entries[room_id]
+                        self._discard(self._sort_key(room_id, previous))
+                        removed.append(room_id)
+                    continue
+                summary = self.summarize(room_id, room)
+                if previous == summary:
+                    continue
+                if previous is not None:
+                    self._discard(self._sort_key(room_id, previous))
+                    updated.append(summary)
+                else:
+                    added.append(summary)
+                self._entries[room_id] = summary
+                bisect.insort(self._order, self._sort_key(room_id, summary))
+
+            was_loaded = self._loaded
+            self._loaded = True
+            if not (added or updated or removed):
+                return None
+            self.version += 1
+            diff = {"added": added, "updated": updated, "removed": removed, "version": self.version}
+
+        if was_loaded:
+            self._notify(diff)
+        return diff
+
+    def count(self):
+        return len(self._order)
+
+    def query(self, page=None, page_size=20):
+        """
+        Возвращает сводки открытых комнат (новые первыми).
+
+        :param page: Номер страницы с 1; None - все комнаты
+        :param page_size: Размер страницы
+        """
+        with self._lock:
+            if page is None:
+                keys = list(self._order)
+            else:
+                start = (max(page, 1) - 1) * page_size
+                keys = self._order[start:start + page_size]
+            return [dict(self._entries[room_id]) for _, room_id in keys]
+
+    def find_open_room(self, max_players=None, exclude_room_ids=()):
+        """
+        Подбирает комнату для быстрого входа: самую заполненную из неполных,
+        при равенстве - самую новую.
+
+        :return: ID комнаты или None
+        """
+        best_id, best_count = None, -1
+        with self._lock:
+            for _, room_id in self._order:
+                if room_id in exclude_room_ids:
+                    continue
+                player_count = self._entries[room_id].get("player_count", 0)
+                if max_players is not None and player_count >= max_players:
+                    continue
+                if player_count > best_count:
+                    best_id, best_count = room_id, player_count
+        return best_id
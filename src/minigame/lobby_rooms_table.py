@@ -0,0 +1,95 @@
+from datetime import datetime
+
+from nicegui import ui
+
+ROOMS_TABLE_BODY = '''
+    <q-tr :props="props">
+        <q-td v-for="col in props.cols" :key="col.name" :props="props" class="text-center">
+            <template v-if="col.name === 'action'">
+                <div class="flex justify-center">
+                    <q-btn color="primary" dense icon="login" size="md"
+                           @click="() => $parent.$emit('join', props.row.room_id)">
+                        Присоединиться
+                    </q-btn>
+                </div>
+            </template>
+            <template v-else>
+                <span>{{ col.value }}</span>
+            </template>
+        </q-td>
+    </q-tr>
+'''
+
+
+class LobbyRoomsTable:
+    """
+    Таблица доступных комнат мини-игры в меню.
+
+    Таблица и обработчик "Присоединиться" создаются один раз, в контексте
+    клиента, который открыл меню. Дальше изменения лобби (разница
+    LobbyIndex) применяются к строкам таблицы на месте: элементы и
+    обработчики не пересоздаются, а строки меняются только у затронутых комнат.
+    """
+
+    COLUMNS = [
+        {'name': 'room_id', 'label': 'ID комнаты', 'field': 'room_id', 'align': 'center'},
+        {'name': 'host_name', 'label': 'Создатель', 'field': 'host_name', 'align': 'center'},
+        {'name': 'player_count', 'label': 'Игроков', 'field': 'player_count', 'align': 'center'},
+    ]
+    TAIL_COLUMNS = [
+        {'name': 'created_at', 'label': 'Создана', 'field': 'created_at', 'align': 'center'},
+        {'name': 'action', 'label': 'Действие', 'field': 'action', 'align': 'center'},
+    ]
+
+    def __init__(self, room_service, on_join, extra_columns=()):
+        """
+        :param room_service: Сервис комнат игры (get_rooms_list и lobby)
+        :param on_join: Функция room_id -> None
+        :param extra_columns: Дополнительные колонки из сводки комнаты (например, team_count)
+        """
+        self._rows = {room['room_id']: self.row(room) for room in room_service.get_rooms_list()}
+        self.table = ui.table(
+            columns=self.COLUMNS + list(extra_columns) + self.TAIL_COLUMNS,
+            rows=self._sorted_rows(),
+            row_key='id',
+            column_defaults={'align': 'center', 'headerClasses': 'uppercase text-primary'}
+        ).classes('w-full')
+        self.table.add_slot('body', ROOMS_TABLE_BODY)
+        self.table.on('join', lambda e: on_join(e.args))
+
+        with ui.card().classes('w-full p-4 bg-gray-200 dark:bg-gray-700 rounded-lg') as self.empty_card:
+            with ui.row().classes('items-center justify-center text-gray-500 dark:text-gray-400'):
+                ui.icon('info').classes('text-xl mr-2')
+                ui.label('Нет доступных комнат').classes('text-center')
+        self._update_visibility()
+
+        self.subscription = room_service.lobby.subscribe(self.apply)
+
+    @staticmethod
+    def row(room):
+        return {
+            **room,
+            'id': room['room_id'],
+            'created_ts': room['created_at'],
+            'created_at': datetime.fromtimestamp(room['created_at']).strftime('%H:%M:%S'),
+        }
+
+    def _sorted_rows(self):
+        return sorted(self._rows.values(), key=lambda row: (-row['created_ts'], row['id']))
+
+    def _update_visibility(self):
+        self.table.set_visibility(bool(self._rows))
+        self.empty_card.set_visibility(not self._rows)
+
+    def apply(self, game, diff):
+        """Применяет разницу лобби {'added', 'updated', 'removed'} к строкам таблицы."""
+        for room_id in diff['removed']:
+            self._rows.pop(room_id, None)
+        for room in diff['added'] + diff['updated']:
+            self._rows[room['room_id']] = self.row(room)
+        self.table.rows = self._sorted_rows()
+        self._update_visibility()
+
+    def close(self):
+        """Отписывает таблицу от лобби (экран меню закрыт)."""
+        self.subscription.cancel()
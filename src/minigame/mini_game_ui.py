@@ -4,7 +4,7 @@ from src.minigame.chameleon.chameleon_game_ui import ChameleonGameUI
 from src.minigame.codenames.codenames_game_ui import CodenamesGameUI
 from src.minigame.spy.spy_game_ui import SpyGameUI
 from src.minigame.best_pairs.best_pairs_game_ui import BestPairsGameUI
-from src.services.log.log_services import LogService
+from src.services.service_container import ServiceContainer
 
 
 class MiniGamesUI:
@@ -12,12 +12,13 @@ class MiniGamesUI:
     UI для раздела мини-игр, включающего различные социальные и командные игры.
     """
 
-    def __init__(self):
-        self.log_service = LogService()
-        self.chameleon_game_ui = ChameleonGameUI()
-        self.spy_game_ui = SpyGameUI()
-        self.codenames_game_ui = CodenamesGameUI()
-        self.best_pairs_game_ui = BestPairsGameUI()
+    def __init__(self, services=None):
+        services = services or ServiceContainer.get()
+        self.log_service = services.log_service
+        self.chameleon_game_ui = ChameleonGameUI(services)
+        self.spy_game_ui = SpyGameUI(services)
+        self.codenames_game_ui = CodenamesGameUI(services)
+        self.best_pairs_game_ui = BestPairsGameUI(services)
         self.games_container = None
 
     def create_mini_games_ui(self):
@@ -0,0 +1,38 @@
+from nicegui import app, ui
+
+from src.services.room_reaper import RoomReaper
+
+
+def watch_room_eviction(screen, game):
+    """
+    Подписывает экран мини-игры на удаление его комнаты сборщиком неактивных комнат.
+
+    Обработчик выполняется в контексте клиента экрана: сбрасывает
+    <game>_room_id в app.storage.user и показывает сообщение с возвратом в меню.
+
+    :param screen: Экран игры (current_room_id, game_container, _cancel_timers, show_main_menu)
+    :param game: Название игры, как в RoomReaper.create_default
+    :return: Подписка с методом cancel()
+    """
+
+    def on_evicted(evicted_game, room_id, reason):
+        if evicted_game != game or room_id != screen.current_room_id:
+            return
+
+        screen._cancel_timers()
+        screen.current_room_id = None
+        app.storage.user.update({f'{game}_room_id': None})
+
+        container = screen.game_container
+        if container is None or container.is_deleted:
+            return
+        message = RoomReaper.REASON_MESSAGES.get(reason, RoomReaper.REASON_MESSAGES['idle'])
+        container.clear()
+        with container:
+            ui.notify(message, type='warning')
+            with ui.card().classes('w-full p-6 text-center'):
+                ui.label(message).classes('text-xl font-bold mb-4')
+                ui.button('Вернуться в меню', on_click=lambda: screen.show_main_menu()).classes(
+                    'bg-blue-500 text-white')
+
+    return RoomReaper.subscribe(on_evicted)
@@ -0,0 +1,91 @@
+import threading
+
+from src.services.rng_provider import RngProvider
+
+
+class RoomIdAllocator:
+    """
+    Выдача уникальных ID комнат мини-игр.
+
+    ID имеет вид "<префикс>_<код>", где код набирается из 31 символа без
+    похожих друг на друга (0/O, 1/I/L): при длине 5 это ~28,6 млн кодов
+    на игру. Уникальность проверяется по живому списку комнат и по уже
+    выданным, но ещё не сохранённым ID; выдача атомарна в пределах процесса.
+    """
+
+    ALPHABET = "23456789ABCDEFGHJKMNPQRSTUVWXYZ"
+    DEFAULT_CODE_LENGTH = 5
+    # Сколько случайных попыток делать, прежде чем удлинить код
+    MAX_ATTEMPTS = 32
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, prefix, code_length=DEFAULT_CODE_LENGTH):
+        self.prefix = prefix
+        self.code_length = code_length
+        self._lock = threading.Lock()
+        self._reserved = set()
+
+    @classmethod
+    def for_prefix(cls, prefix, code_length=DEFAULT_CODE_LENGTH):
+        """Возвращает общий для процесса аллокатор для префикса игры."""
+        with cls._instances_lock:
+            if prefix not in cls._instances:
+                cls._instances[prefix] = cls(prefix, code_length)
+            return cls._instances[prefix]
+
+    @property
+    def capacity(self):
+        """Количество возможных кодов текущей длины."""
+        return len(self.ALPHABET) ** self.code_length
+
+    def _generate(self, length):
+        source = RngProvider.token_source()
+        return f"{self.prefix}_{''.join(source.choice(self.ALPHABET) for _ in range(length))}"
+
+    def allocate(self, existing_ids):
+        """
+        Резервирует новый ID, которого нет среди existing_ids.
+
+        После сохранения комнаты (или при ошибке) ID нужно освободить
+        через release().
+
+        :param existing_ids: Живой индекс комнат (словарь комнат или набор ID)
+        """
+        with self._lock:
+            length = self.code_length
+            while True:
+                for _ in range(self.MAX_ATTEMPTS):
+                    room_id = self._generate(length)
+                    if room_id not in existing_ids and room_id not in self._reserved:
+                        self._reserved.add(room_id)
+                        return room_id
+                # Пространство кодов почти заполнено - удлиняем код
+                length += 1
+
+    def release(self, room_id):
+        """Снимает резерв с ID после сохранения комнаты."""
+        with self._lock:
+            self._reserved.discard(room_id)
+
+    def normalize(self, room_id):
+        """Приводит введённый пользователем ID к каноническому виду."""
+        room_id = (room_id or '').strip()
+        if '_' not in room_id:
+            return room_id
+        prefix, code = room_id.split('_', 1)
+        return f"{prefix.lower()}_{code.upper()}"
+
+    def usage(self, existing_ids):
+        """Возвращает заполненность пространства ID."""
+        in_use = sum(1 for room_id in existing_ids if str(room_id).startswith(f"{self.prefix}_"))
+        with self._lock:
+            reserved = len(self._reserved)
+        return {
+            "prefix": self.prefix,
+            "in_use": in_use,
+            "reserved": reserved,
+            "capacity": self.capacity,
+            "usage": (in_use + reserved) / self.capacity
+        }
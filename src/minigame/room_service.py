@@ -0,0 +1,226 @@
+import contextlib
+import json
+import os
+
+from src.services.log.log_services import LogService
+from src.services.metrics import timed_storage
+from src.models.minigame_room import MinigameRoom, room_to_dict
+from src.minigame.room_store import RoomStore, RoomsSnapshot
+from src.minigame.room_id_allocator import RoomIdAllocator
+from src.minigame.lobby_index import LobbyIndex
+
+
+class MinigameRoomService:
+    """
+    Общая часть сервисов комнат мини-игр: хранение комнат (файл или
+    RoomStore в памяти), блокировки комнат, выдача ID, индекс лобби и
+    удаление устаревших комнат.
+
+    Комнаты выдаются моделями MinigameRoom: доступ по ключу работает как у
+    комнаты в JSON-формате, а игроки хранятся в словаре по ID.
+
+    Наследник задаёт GAME, ROOM_ID_PREFIX, ACTION_PREFIX, GAME_TITLE и
+    ROOMS_FILE, сводку комнаты для лобби (lobby_summary) и правила игры.
+    Методы, изменяющие комнату, помечаются @room_transaction и загружают
+    комнаты через load_rooms(room_id).
+    """
+
+    GAME = None
+    ROOM_ID_PREFIX = None
+    # Префикс действий в логах, например SPY
+    ACTION_PREFIX = None
+    # Название игры в сообщениях об ошибках
+    GAME_TITLE = ''
+    ROOMS_FILE = None
+    # Игроков в комнате для быстрого входа; None - без ограничения
+    MAX_PLAYERS = None
+
+    def __init__(self, rooms_file=None, in_memory=None):
+        self.rooms_file = rooms_file or self.ROOMS_FILE
+        self.log_service = LogService()
+        self.store = None
+        self.lobby = LobbyIndex.for_game(self.GAME, self.lobby_summary)
+        self.id_allocator = RoomIdAllocator.for_prefix(self.ROOM_ID_PREFIX)
+        self.ensure_rooms_file_exists()
+        # Живые комнаты в памяти, на диск пишутся асинхронные снимки
+        if RoomStore.in_memory_enabled(in_memory):
+            self.store = RoomStore.for_file(self.rooms_file)
+
+    @staticmethod
+    def lobby_summary(room_id, room):
+        """Сводка комнаты для списка доступных комнат."""
+        raise NotImplementedError
+
+    def ensure_rooms_file_exists(self):
+        """Проверяет существование файла с данными о комнатах."""
+        directory = os.path.dirname(self.rooms_file)
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        if not os.path.exists(self.rooms_file):
+            self.save_rooms({})
+
+    def room_lock(self, room_id):
+        """Блокировка, под которой изменяется комната (см. room_transaction)."""
+        if self.store is not None:
+            return self.store.room_lock(room_id)
+        return RoomStore.file_lock(self.rooms_file)
+
+    def prepare_room(self, room):
+        """Подготавливает комнату, которую вызывающий метод изменяет (например, переводит старый формат)."""
+
+    @timed_storage
+    def load_rooms(self, room_id=None):
+        """
+        Загружает данные о комнатах из файла.
+
+        :param room_id: Комната, которую вызывающий метод изменяет под room_transaction
+        :return: RoomsSnapshot; изменяемая комната - копия, поэтому при
+                 сохранении известно, какие комнаты изменились
+        """
+        if self.store is not None:
+            rooms = self.store.load(room_id)
+        else:
+            try:
+                with open(self.rooms_file, 'r', encoding='utf-8') as file:
+                    rooms = RoomsSnapshot({room_id: MinigameRoom.from_dict(room)
+                                           for room_id, room in json.load(file).items()})
+                if room_id in rooms:
+                    rooms[room_id] = rooms[room_id].copy()
+            except Exception as e:
+                self.log_service.add_error_log(
+                    error_message=f"Ошибка загрузки данных о комнатах {self.GAME_TITLE}: {str(e)}",
+                    action=f"{self.ACTION_PREFIX}_ROOMS_LOAD"
+                )
+                return {}
+
+        if room_id in rooms:
+            self.prepare_room(rooms[room_id])
+        return rooms
+
+    @timed_storage
+    def save_rooms(self, rooms_data):
+        """
+        Сохраняет данные о комнатах в файл.
+
+        Индекс лобби пересчитывается только для комнат, изменённых
+        относительно load_rooms(); для обычного словаря - для всех комнат.
+        """
+        room_ids = None
+        if isinstance(rooms_data, RoomsSnapshot):
+            changed, removed = rooms_data.changes()
+            room_ids = list(changed) + removed
+        if self.store is not None:
+            success = self.store.commit(rooms_data)
+        else:
+            success = self._write_rooms_file(rooms_data)
+            if success and isinstance(rooms_data, RoomsSnapshot):
+                rooms_data.base = dict(rooms_data)
+        if success:
+            self.lobby.sync(self.store.rooms if self.store is not None else rooms_data, room_ids)
+        return success
+
+    def _write_rooms_file(self, rooms_data):
+        try:
+            directory = os.path.dirname(self.rooms_file)
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+
+            temp_file = f"{self.rooms_file}.tmp"
+            with open(temp_file, 'w', encoding='utf-8') as file:
+                json.dump({room_id: room_to_dict(room) for room_id, room in rooms_data.items()},
+                          file, indent=2, ensure_ascii=False)
+
+            os.replace(temp_file, self.rooms_file)
+            return True
+        except Exception as e:
+            self.log_service.add_error_log(
+                error_message=f"Ошибка сохранения данных о комнатах {self.GAME_TITLE}: {str(e)}",
+                action=f"{self.ACTION_PREFIX}_ROOMS_SAVE"
+            )
+            return False
+
+    def allocate_room_id(self):
+        """Резервирует ID новой комнаты; резерв снимает insert_room()."""
+        return self.id_allocator.allocate(self.store.rooms if self.store is not None else self.load_rooms())
+
+    def insert_room(self, room_id, room_data):
+        """
+        Сохраняет новую комнату с ID из allocate_room_id().
+
+        Загрузка и сохранение выполняются под блокировкой комнаты, как в
+        room_transaction: в файловом режиме это блокировка файла, поэтому
+        одновременные изменения других комнат не перезаписываются.
+
+        :return: True, если комната сохранена
+        """
+        try:
+            with self.room_lock(room_id):
+                rooms = self.load_rooms(room_id)
+                rooms[room_id] = MinigameRoom.from_dict(room_data)
+                return self.save_rooms(rooms)
+        finally:
+            self.id_allocator.release(room_id)
+
+    def evict_rooms(self, is_expired, before_save=None):
+        """
+        Удаляет комнаты, для которых is_expired(room) истинно.
+
+        Кандидаты выбираются без блокировок, затем под блокировками этих
+        комнат комнаты загружаются заново и проверяются ещё раз: комната,
+        которую успели изменить, не удаляется, а изменения других комнат
+        не перезаписываются.
+
+        :param before_save: Функция [(room_id, room)] -> None, вызывается до сохранения (архив)
+        :return: Список удалённых (room_id, room)
+        """
+        candidates = sorted(room_id for room_id, room in self.load_rooms().items() if is_expired(room))
+        if not candidates:
+            return []
+
+        with contextlib.ExitStack() as stack:
+            for room_id in candidates:
+                stack.enter_context(self.room_lock(room_id))
+            rooms = self.load_rooms()
+            evicted = [(room_id, rooms.pop(room_id)) for room_id in candidates
+                       if room_id in rooms and is_expired(rooms[room_id])]
+            if not evicted:
+                return []
+            if before_save is not None:
+                before_save(evicted)
+            if not self.save_rooms(rooms):
+                raise RuntimeError("не удалось сохранить комнаты")
+        return evicted
+
+    def get_room_id_usage(self):
+        """Возвращает заполненность пространства ID комнат."""
+        return self.id_allocator.usage(self.load_rooms())
+
+    def room_exists(self, room_id):
+        """Проверяет существование комнаты."""
+        rooms = self.load_rooms()
+        return room_id in rooms
+
+    def get_room(self, room_id):
+        """Получает копию данных о комнате."""
+        if self.store is not None:
+            return self.store.get(room_id)
+        rooms = self.load_rooms()
+        return rooms.get(room_id)
+
+    def get_rooms_list(self, page=None, page_size=20):
+        """
+        Возвращает список доступных комнат (новые первыми).
+
+        Список берётся из общего индекса лобби, который обновляется
+        при сохранении комнат.
+        """
+        if not self.lobby.loaded:
+            self.lobby.sync(self.load_rooms())
+        return self.lobby.query(page, page_size)
+
+    def find_open_room(self, exclude_room_ids=()):
+        """Подбирает открытую неполную (MAX_PLAYERS) комнату для быстрого входа."""
+        if not self.lobby.loaded:
+            self.lobby.sync(self.load_rooms())
+        return self.lobby.find_open_room(max_players=self.MAX_PLAYERS, exclude_room_ids=exclude_room_ids)
@@ -0,0 +1,295 @@
+import asyncio
+import atexit
+import functools
+import json
+import os
+import threading
+
+from src.services.log.log_services import LogService
+from src.models.minigame_room import MinigameRoom, room_to_dict
+
+
+def room_transaction(method):
+    """
+    Декоратор метода сервиса комнат, изменяющего комнату room_id (первый аргумент).
+
+    Метод целиком, от load_rooms(room_id) до save_rooms, выполняется под
+    блокировкой комнаты (service.room_lock), поэтому одновременные изменения
+    одной комнаты не теряются.
+    """
+
+    @functools.wraps(method)
+    def wrapper(service, room_id, *args, **kwargs):
+        with service.room_lock(room_id):
+            return method(service, room_id, *args, **kwargs)
+
+    return wrapper
+
+
+class RoomsSnapshot(dict):
+    """
+    Словарь комнат, выданный сервису хранилищем.
+
+    base - комнаты на момент выдачи. При сохранении в хранилище попадают
+    только комнаты, которые сервис заменил, добавил или удалил.
+    """
+
+    def __init__(self, rooms):
+        super().__init__(rooms)
+        self.base = dict(self)
+
+    def changes(self):
+        """
+        Изменения относительно base.
+
+        :return: ({room_id: комната} заменённых и добавленных комнат, [room_id удалённых])
+        """
+        changed = {room_id: room for room_id, room in self.items() if self.base.get(room_id) is not room}
+        removed = [room_id for room_id in self.base if room_id not in self]
+        return changed, removed
+
+
+class RoomStore:
+    """
+    Хранилище комнат мини-игры в памяти.
+
+    В режиме in-memory комнаты живут в памяти процесса и являются источником
+    истины, а на диск состояние сбрасывается снимками - не чаще одного раза
+    в snapshot_interval_ms и сразу после смены фазы игры (статус комнаты
+    или номер раунда). При запуске комнаты восстанавливаются из последнего
+    снимка; неудавшаяся запись снимка повторяется через интервал.
+
+    Комнаты хранятся моделями MinigameRoom. Сохранённые комнаты не
+    изменяются на месте: сервис получает копию комнаты (load(room_id) под блокировкой комнаты, get(room_id)), а commit
+    заменяет комнату целиком. Поэтому незавершённые изменения и изменения
+    копий в UI не попадают в состояние игры.
+
+    Режим включается переменной окружения MINIGAME_ROOMS_IN_MEMORY=1
+    или параметром in_memory=True у сервиса комнат.
+    """
+
+    DEFAULT_SNAPSHOT_INTERVAL_MS = 500
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+    _file_locks = {}
+
+    def __init__(self, rooms_file, snapshot_interval_ms=None):
+        self.rooms_file = rooms_file
+        if snapshot_interval_ms is None:
+            snapshot_interval_ms = int(os.environ.get(
+                "MINIGAME_SNAPSHOT_INTERVAL_MS", self.DEFAULT_SNAPSHOT_INTERVAL_MS))
+        self.snapshot_interval = snapshot_interval_ms / 1000
+        self.log_service = LogService()
+
+        self._room_locks = {}
+        self._room_locks_guard = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._flush_handle = None
+        self._loop = None
+        self._version = 0
+        self._written_version = 0
+        self._phases = {}
+
+        self.rooms = self._restore()
+        self._phases = {room_id: self._phase_of(room) for room_id, room in self.rooms.items()}
+        atexit.register(self.flush_now)
+
+    @staticmethod
+    def in_memory_enabled(in_memory=None):
+        """Определяет, включен ли режим хранения комнат в памяти."""
+        if in_memory is not None:
+            return in_memory
+        return os.environ.get("MINIGAME_ROOMS_IN_MEMORY", "").lower() in ("1", "true", "yes")
+
+    @classmethod
+    def for_file(cls, rooms_file, snapshot_interval_ms=None):
+        """Возвращает общее для процесса хранилище для файла комнат."""
+        key = os.path.abspath(rooms_file)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(rooms_file, snapshot_interval_ms)
+            return cls._instances[key]
+
+    @classmethod
+    def file_lock(cls, rooms_file):
+        """
+        Блокировка файла комнат для режима без хранилища в памяти.
+
+        Сервис перезаписывает файл целиком, поэтому изменения разных комнат
+        одного файла выполняются по очереди.
+        """
+        key = os.path.abspath(rooms_file)
+        with cls._instances_lock:
+            if key not in cls._file_locks:
+                cls._file_locks[key] = threading.RLock()
+            return cls._file_locks[key]
+
+    def _restore(self):
+        """Восстанавливает комнаты из последнего снимка на диске."""
+        try:
+            if os.path.exists(self.rooms_file):
+                with open(self.rooms_file, 'r', encoding='utf-8') as file:
+                    rooms = {room_id: MinigameRoom.from_dict(room) for room_id, room in json.load(file).items()}
+                self.log_service.add_log(
+                    level="SYSTEM",
+                    action="MINIGAME_ROOMS_RESTORE",
+                    message=f"Восстановлено {len(rooms)} комнат из {self.rooms_file}"
+                )
+                return rooms
+        except Exception as e:
+            self.log_service.add_error_log(
+                error_message=f"Ошибка восстановления комнат из снимка: {str(e)}",
+                action="MINIGAME_ROOMS_RESTORE",
+                metadata={"rooms_file": self.rooms_file}
+            )
+        return {}
+
+    @staticmethod
+    def _phase_of(room):
+        game_data = room.get("game_data") or {}
+        return room.get("status"), game_data.get("round")
+
+    def room_lock(self, room_id):
+        """Возвращает блокировку комнаты."""
+        with self._room_locks_guard:
+            lock = self._room_locks.get(room_id)
+            if lock is None:
+                lock = self._room_locks[room_id] = threading.RLock()
+            return lock
+
+    def load(self, room_id=None):
+        """
+        Возвращает словарь комнат для сервиса (RoomsSnapshot).
+
+        :param room_id: Комната, которую сервис изменяет; вызывается под её
+                        блокировкой (room_transaction), комната копируется
+        """
+        rooms = RoomsSnapshot(self.rooms)
+        if room_id in rooms:
+            rooms[room_id] = rooms[room_id].copy()
+        return rooms
+
+    def get(self, room_id):
+        """Возвращает копию комнаты или None."""
+        room = self.rooms.get(room_id)
+        return room.copy() if room is not None else None
+
+    def commit(self, rooms_data):
+        """
+        Фиксирует изменения комнат в памяти и планирует снимок.
+
+        :param rooms_data: RoomsSnapshot из load(): сохраняются только заменённые,
+                           добавленные и удалённые комнаты; обычный словарь
+                           заменяет все комнаты хранилища
+        :return: True
+        """
+        if isinstance(rooms_data, RoomsSnapshot):
+            changed, removed = rooms_data.changes()
+        else:
+            changed = dict(rooms_data)
+            removed = [room_id for room_id in self.rooms if room_id not in rooms_data]
+
+        # Смена фазы игры сохраняется без ожидания интервала
+        phase_changed = bool(removed)
+        for room_id, room in changed.items():
+            room = MinigameRoom.from_dict(room)
+            with self.room_lock(room_id):
+                self.rooms[room_id] = room
+            phase = self._phase_of(room)
+            if self._phases.get(room_id) != phase:
+                self._phases[room_id] = phase
+                phase_changed = True
+        for room_id in removed:
+            with self.room_lock(room_id):
+                self.rooms.pop(room_id, None)
+            self._phases.pop(room_id, None)
+            # Блокировка удалённой комнаты больше не нужна
+            with self._room_locks_guard:
+                self._room_locks.pop(room_id, None)
+
+        # Выданный словарь можно сохранить повторно: база - то, что уже сохранено
+        if isinstance(rooms_data, RoomsSnapshot):
+            rooms_data.base = dict(rooms_data)
+
+        self._version += 1
+        self._dirty = True
+        self._schedule_flush(immediate=phase_changed)
+        return True
+
+    def _schedule_flush(self, immediate=False):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Вне цикла событий (скрипты, миграции) пишем сразу
+            self.flush_now()
+            return
+
+        if immediate:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+            self._flush_handle = loop.call_soon(self._flush)
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.snapshot_interval, self._flush)
+
+    def _take_snapshot(self):
+        """
+        Состояние комнат для записи.
+
+        Сохранённые комнаты только заменяются (commit), но не изменяются на
+        месте, поэтому достаточно копии словаря. Блокировки комнат не берутся:
+        снимок пишется и из метода, который держит блокировку своей комнаты.
+        """
+        return dict(self.rooms)
+
+    def _flush(self):
+        """Снимает копию в цикле событий и записывает её в фоновом потоке."""
+        self._flush_handle = None
+        if not self._dirty:
+            return
+        self._dirty = False
+        version = self._version
+        snapshot = self._take_snapshot()
+        self._loop = asyncio.get_running_loop()
+        self._loop.run_in_executor(None, self._write_snapshot, version, snapshot)
+
+    def flush_now(self):
+        """Синхронно записывает текущее состояние комнат."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._dirty and self._written_version == self._version:
+            return True
+        self._dirty = False
+        return self._write_snapshot(self._version, self._take_snapshot())
+
+    def _write_snapshot(self, version, snapshot):
+        with self._write_lock:
+            # Более новый снимок уже записан
+            if version < self._written_version:
+                return True
+            try:
+                directory = os.path.dirname(self.rooms_file)
+                if directory and not os.path.exists(directory):
+                    os.makedirs(directory)
+
+                temp_file = f"{self.rooms_file}.tmp"
+                with open(temp_file, 'w', encoding='utf-8') as file:
+                    json.dump({room_id: room_to_dict(room) for room_id, room in snapshot.items()},
+                              file, indent=2, ensure_ascii=False)
+                os.replace(temp_file, self.rooms_file)
+                self._written_version = version
+                return True
+            except Exception as e:
+                self._dirty = True
+                self.log_service.add_error_log(
+                    error_message=f"Ошибка записи снимка комнат: {str(e)}",
+                    action="MINIGAME_ROOMS_SNAPSHOT",
+                    metadata={"rooms_file": self.rooms_file}
+                )
+                # Повторяем запись через интервал, не дожидаясь следующего изменения
+                loop = self._loop
+                if loop is not None and not loop.is_closed():
+                    loop.call_soon_threadsafe(self._schedule_flush)
+                return False
@@ -1,8 +1,12 @@
 # src/minigame/spy/__init__.py
 
-from .spy_data_service import SpyDataService
-from .spy_room_service import SpyRoomService
-from .spy_ui_components import SpyComponents
-from .spy_game_ui import SpyGameUI
+from src.lazy_exports import lazy_exports
 
-__all__ = ['SpyDataService', 'SpyRoomService', 'SpyComponents', 'SpyGameUI']
\ No newline at end of file
+__all__ = ['SpyDataService', 'SpyRoomService', 'SpyComponents', 'SpyGameUI']
+
+__getattr__ = lazy_exports(__name__, {
+    'SpyDataService': '.spy_data_service',
+    'SpyRoomService': '.spy_room_service',
+    'SpyComponents': '.spy_ui_components',
+    'SpyGameUI': '.spy_game_ui',
+})
@@ -1,21 +1,26 @@
 import os
 import json
-import random
+from src.minigame.content_catalog import ContentCatalog
+from src.minigame.content_deck import ContentDeck
 from src.services.log.log_services import LogService
+from src.services.rng_provider import RngProvider
 
 
 class SpyDataService:
     """
     Сервис для работы с данными игры Шпион.
     Отвечает за загрузку категорий и локаций из JSON файла.
+
+    Категории берутся из общего ContentCatalog, который обновляется
+    при изменении файла.
     """
 
-    def __init__(self, data_file='src/minigame/spy/categories.json'):
+    def __init__(self, data_file='src/minigame/spy/categories.json', rng=None):
         self.data_file = data_file
+        self.rng = rng or RngProvider.get()
         self.log_service = LogService()
-        self.categories = []
         self.ensure_data_file_exists()
-        self.load_categories()
+        self.catalog = ContentCatalog.for_file(self.data_file, self.index_categories, "SPY_DATA_LOAD")
 
     def ensure_data_file_exists(self):
         """Проверяет существование файла данных и создает его при необходимости."""
@@ -67,91 +72,65 @@ class SpyDataService:
                     action="SPY_DATA_CREATE"
                 )
 
+    @staticmethod
+    def index_categories(data):
+        """Строит таблицы категорий: названия, локации и описание по названию."""
+        categories = data.get('categories', [])
+        return {
+            'categories': categories,
+            'names': tuple(category['name'] for category in categories),
+            'locations': {category['name']: tuple(category.get('locations', [])) for category in categories},
+            'by_name': {category['name']: category for category in categories}
+        }
+
+    @property
+    def categories(self):
+        return self.catalog.tables['categories']
+
     def load_categories(self):
-        """Загружает категории и локации из JSON файла."""
-        try:
-            # Проверяем абсолютный путь
-            if not os.path.isabs(self.data_file):
-                # Создаем абсолютный путь от корня проекта
-                current_dir = os.getcwd()
-                abs_path = os.path.join(current_dir, self.data_file)
-            else:
-                abs_path = self.data_file
-
-            if not os.path.exists(abs_path):
-                self.log_service.add_error_log(
-                    error_message=f"Файл данных категорий не найден: {abs_path}",
-                    action="SPY_DATA_LOAD"
-                )
-                self.categories = []
-                return
-
-            with open(abs_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-                self.categories = data.get('categories', [])
-
-            self.log_service.add_log(
-                level="GAME",
-                action="SPY_DATA_LOAD",
-                message=f"Загружено {len(self.categories)} категорий для игры Шпион из {abs_path}"
-            )
-        except Exception as e:
-            self.log_service.add_error_log(
-                error_message=f"Ошибка загрузки категорий: {str(e)}",
-                action="SPY_DATA_LOAD"
-            )
-            self.categories = []
+        """Принудительно перечитывает категории и локации из JSON файла."""
+        return self.catalog.reload()
 
     def get_all_categories(self):
         """Возвращает список всех категорий."""
-        if not self.categories:
-            # Пытаемся перезагрузить данные
-            self.load_categories()
-
-        categories_list = [category['name'] for category in self.categories]
-
-        # Логируем для отладки
-        self.log_service.add_debug_log(
-            message=f"Возвращаем категории: {categories_list}",
-            metadata={"categories_count": len(categories_list)}
-        )
-
-        return categories_list
+        return list(self.catalog.tables['names'])
 
     def get_locations_for_category(self, category_name):
         """Возвращает список локаций для указанной категории."""
-        for category in self.categories:
-            if category['name'] == category_name:
-                return category['locations']
-        return []
+        return list(self.catalog.tables['locations'].get(category_name, ()))
 
     def get_random_category(self):
         """Возвращает случайную категорию."""
-        if not self.categories:
+        names = self.catalog.tables['names']
+        if not names:
             return None
-        return random.choice(self.categories)['name']
+        return self.rng.choice(names)
+
+    def get_random_location_from_category(self, category_name, decks=None):
+        """
+        Возвращает случайную локацию из указанной категории.
 
-    def get_random_location_from_category(self, category_name):
-        """Возвращает случайную локацию из указанной категории."""
-        locations = self.get_locations_for_category(category_name)
+        :param decks: Колоды комнаты - если переданы, локации не повторяются,
+                      пока не будут выданы все локации категории
+        """
+        locations = self.catalog.tables['locations'].get(category_name)
         if not locations:
             return None
-        return random.choice(locations)
+        if decks is not None:
+            return ContentDeck.of(decks, f"locations:{category_name}", len(locations)).draw_from(locations)[0]
+        return self.rng.choice(locations)
 
-    def get_random_category_and_location(self):
+    def get_random_category_and_location(self, decks=None):
         """Возвращает случайную категорию и локацию из неё."""
-        if not self.categories:
+        names = self.catalog.tables['names']
+        if not names:
             return None, None
-
-        category = random.choice(self.categories)
-        category_name = category['name']
-        location = random.choice(category['locations'])
-
-        return category_name, location
+        if decks is not None:
+            category_name = ContentDeck.of(decks, "categories", len(names)).draw_from(names)[0]
+        else:
+            category_name = self.rng.choice(names)
+        return category_name, self.get_random_location_from_category(category_name, decks)
 
     def get_category_info(self, category_name):
         """Возвращает полную информацию о категории."""
-        for category in self.categories:
-            if category['name'] == category_name:
-                return category
-        return None
\ No newline at end of file
+        return self.catalog.tables['by_name'].get(category_name)
@@ -1,12 +1,14 @@
 from nicegui import ui, app
 import random
 import time
-from datetime import datetime
 
-from src.minigame.spy.spy_data_service import SpyDataService
-from src.minigame.spy.spy_room_service import SpyRoomService
-from src.services.log.log_services import LogService
+from src.services.presence_service import PresenceService
+from src.services.room_ticker import RoomTicker
+from src.minigame.lobby_rooms_table import LobbyRoomsTable
+from src.minigame.room_eviction import watch_room_eviction
+from src.services.service_container import ServiceContainer
 from src.minigame.spy.spy_ui_components import SpyComponents
+from src.models.minigame_room import find_player
 
 
 class SpyGameUI:
@@ -15,10 +17,11 @@ class SpyGameUI:
     Гибридный режим: обсуждение происходит вживую, а интерфейс онлайн.
     """
 
-    def __init__(self):
-        self.log_service = LogService()
-        self.data_service = SpyDataService()
-        self.room_service = SpyRoomService()
+    def __init__(self, services=None):
+        services = services or ServiceContainer.get()
+        self.log_service = services.log_service
+        self.data_service = services.data_service('spy')
+        self.room_service = services.room_service('spy')
         self.components = SpyComponents()
 
         self.current_room_id = None
@@ -28,6 +31,14 @@ class SpyGameUI:
         self.update_timer = None
         self.rooms_update_timer = None
 
+        # Уведомления об удалении комнаты сборщиком неактивных комнат
+        self._eviction = watch_room_eviction(self, 'spy')
+        # Присутствие игроков в комнатах (только в памяти)
+        self.presence = PresenceService.get()
+        self.ticker = RoomTicker.get()
+        # Список комнат обновляется по изменениям индекса лобби, а не по таймеру
+        self._lobby_table = None
+
     def show_main_menu(self, container=None):
         """Показывает главное меню игры."""
         # Восстанавливаем сохраненный ID комнаты при перезагрузке
@@ -119,6 +130,8 @@ class SpyGameUI:
                         'flex-grow bg-red-600 hover:bg-red-700 text-white')
                     ui.button('Присоединиться к игре', icon='login', on_click=self.show_join_menu).classes(
                         'flex-grow bg-blue-600 hover:bg-blue-700 text-white')
+                    ui.button('Быстрая игра', icon='bolt', on_click=self.quick_join).classes(
+                        'flex-grow bg-indigo-600 hover:bg-indigo-700 text-white')
                     ui.button('Обновить список', icon='refresh', on_click=self.refresh_rooms_list).classes(
                         'bg-gray-200 dark:bg-gray-700 hover:bg-gray-300 dark:hover:bg-gray-600')
 
@@ -128,78 +141,36 @@ class SpyGameUI:
         """Creates and displays a list of available rooms using consistent styling"""
         with ui.card().classes('w-full p-6 mt-4 rounded-xl shadow-lg bg-gray-100 dark:bg-gray-800'):
             ui.label('Доступные комнаты:').classes('text-xl font-bold mb-4 text-red-600 dark:text-red-400')
-            rooms_container = ui.element('div').classes('w-full')
-
-            # Function to update the rooms list
-            def update_rooms_list():
-                rooms_container.clear()
-                with rooms_container:
-                    available_rooms = self.room_service.get_rooms_list()
-
-                    if available_rooms:
-                        # Create rows for the table
-                        rows = []
-                        for i, room in enumerate(available_rooms):
-                            rows.append({
-                                'id': room['room_id'],
-                                'room_id': room['room_id'],
-                                'host_name': room['host_name'],
-                                'player_count': room['player_count'],
-                                'created_at': datetime.fromtimestamp(room['created_at']).strftime('%H:%M:%S')
-                            })
-
-                        # Define columns in the same style as player table
-                        columns = [
-                            {'name': 'room_id', 'label': 'ID комнаты', 'field': 'room_id', 'align': 'center'},
-                            {'name': 'host_name', 'label': 'Создатель', 'field': 'host_name', 'align': 'center'},
-                            {'name': 'player_count', 'label': 'Игроков', 'field': 'player_count', 'align': 'center'},
-                            {'name': 'created_at', 'label': 'Создана', 'field': 'created_at', 'align': 'center'},
-                            {'name': 'action', 'label': 'Действие', 'field': 'action', 'align': 'center'},
-                        ]
-
-                        # Create the table with unified styling
-                        table = ui.table(
-                            columns=columns,
-                            rows=rows,
-                            row_key='id',
-                            column_defaults={'align': 'center', 'headerClasses': 'uppercase text-primary'}
-                        ).classes('w-full')
-
-                        # Add custom body slot for action buttons
-                        table.add_slot('body', '''
-                            <q-tr :props="props">
-                                <q-td v-for="col in props.cols" :key="col.name" :props="props" class="text-center">
-                                    <template v-if="col.name === 'action'">
-                                        <div class="flex justify-center">
-                                            <q-btn color="primary" dense icon="login" size="md"
-                                                   @click="() => $parent.$emit('join', props.row.room_id)">
-                                                Присоединиться
-                                            </q-btn>
-                                        </div>
-                                    </template>
-                                    <template v-else>
-                                        <span>{{ col.value }}</span>
-                                    </template>
-                                </q-td>
-                            </q-tr>
-                        ''')
-
-                        # Add handler for join event
-                        table.on('join', lambda e: self.join_game(e.args))
-                    else:
-                        with ui.card().classes('w-full p-4 bg-gray-200 dark:bg-gray-700 rounded-lg'):
-                            with ui.row().classes('items-center justify-center text-gray-500 dark:text-gray-400'):
-                                ui.icon('info').classes('text-xl mr-2')
-                                ui.label('Нет доступных комнат').classes('text-center')
-
-            # Update the rooms list
-            update_rooms_list()
+            # Таблица обновляется по разнице индекса лобби, без пересоздания элементов
+            self._lobby_table = LobbyRoomsTable(self.room_service, self.join_game)
 
-            # Start timer to update the rooms list (every 5 seconds)
-            self.rooms_update_timer = ui.timer(5.0, update_rooms_list)
+    def quick_join(self):
+        """Присоединяется к открытой комнате, где больше всего игроков."""
+        room_id = self.room_service.find_open_room()
+        if not room_id:
+            ui.notify('Нет открытых комнат, создайте новую', type='info')
+            return
+        self.join_game(room_id)
+
+    def _subscribe_room_tick(self, update, interval=1.0):
+        """Подписывает экран на общий тик текущей комнаты вместо собственного таймера."""
+        room_id = self.current_room_id
+        return self.ticker.subscribe(
+            'spy', room_id, self.room_service.get_room,
+            lambda room_data: update(room_data if room_id == self.current_room_id else None),
+            interval)
+
+    def _touch_presence(self):
+        """Сигнал присутствия игрока в текущей комнате."""
+        player_id = app.storage.user.get('user_id')
+        if self.current_room_id and player_id:
+            self.presence.heartbeat('spy', self.current_room_id, player_id, ui.context.client.id)
 
     def _cancel_timers(self):
         """Отменяет все активные таймеры"""
+        if self._lobby_table is not None:
+            self._lobby_table.close()
+            self._lobby_table = None
         if self.update_timer:
             try:
                 self.update_timer.cancel()
@@ -250,7 +221,7 @@ class SpyGameUI:
             room_id_input.props('outlined dense rounded')
 
             def join_room():
-                room_id = room_id_input.value.strip()
+                room_id = self.room_service.id_allocator.normalize(room_id_input.value)
                 if not room_id:
                     ui.notify('Введите ID комнаты', type='warning')
                     return
@@ -320,11 +291,11 @@ class SpyGameUI:
 
         # Запускаем таймер обновления
         self._cancel_timers()
-        self.update_timer = ui.timer(1.0, lambda: self.update_waiting_room())
+        self.update_timer = self._subscribe_room_tick(self.update_waiting_room, 1.0)
 
         # Получаем данные текущего игрока
         current_user_id = app.storage.user.get('user_id')
-        current_player = next((p for p in room_data["players"] if p["id"] == current_user_id), None)
+        current_player = find_player(room_data, current_user_id)
         is_host = current_player and current_player.get("is_host", False)
 
         with self.game_container:
@@ -377,8 +348,9 @@ class SpyGameUI:
                                     ui.notify('Выберите категорию', type='negative')
                                     return
 
-                                # Получаем случайную локацию из категории
-                                location = self.data_service.get_random_location_from_category(category_select.value)
+                                # Получаем случайную локацию из колоды категории комнаты (без повторов)
+                                decks = (self.room_service.get_room(self.current_room_id) or room_data).get("decks", {})
+                                location = self.data_service.get_random_location_from_category(category_select.value, decks)
                                 if not location:
                                     ui.notify('Не удалось получить локацию для категории', type='negative')
                                     return
@@ -392,7 +364,8 @@ class SpyGameUI:
                                 success = self.room_service.start_game(
                                     self.current_room_id,
                                     category_select.value,
-                                    location
+                                    location,
+                                    decks
                                 )
 
                                 if success:
@@ -418,13 +391,15 @@ class SpyGameUI:
                 ui.button('Выйти из игры', icon='exit_to_app', on_click=self.leave_game).classes(
                     'w-full bg-red-500 hover:bg-red-600 text-white mt-4')
 
-    def update_waiting_room(self):
+    def update_waiting_room(self, room_data=None):
         """Обновляет данные в комнате ожидания."""
+        self._touch_presence()
         if not self.current_room_id:
             self._cancel_timers()
             return
 
-        room_data = self.room_service.get_room(self.current_room_id)
+        if room_data is None:
+            room_data = self.room_service.get_room(self.current_room_id)
         if not room_data:
             self._cancel_timers()
             ui.notify('Комната была удалена', type='negative')
@@ -455,7 +430,7 @@ class SpyGameUI:
             return
 
         current_user_id = app.storage.user.get('user_id')
-        current_player = next((p for p in room_data["players"] if p["id"] == current_user_id), None)
+        current_player = find_player(room_data, current_user_id)
 
         if not current_player:
             return
@@ -490,7 +465,7 @@ class SpyGameUI:
 
         # Запускаем таймер обновления
         self._cancel_timers()
-        self.update_timer = ui.timer(1.0, lambda: self.update_game_screen())
+        self.update_timer = self._subscribe_room_tick(self.update_game_screen, 1.0)
 
         # Получаем данные текущего игрока
         current_user_id = app.storage.user.get('user_id')
@@ -525,7 +500,7 @@ class SpyGameUI:
                 if is_host and current_round == 1:
                     with ui.row().classes('w-full gap-2 mb-4'):
                         def start_voting():
-                            success = self.room_service.start_voting_round(self.current_room_id)
+                            success = self.room_service.start_voting_round(self.current_room_id, user_id=app.storage.user.get('user_id'))
                             if success:
                                 ui.notify('Переход к этапу голосования', type='positive')
                                 self.show_game_screen()
@@ -644,13 +619,15 @@ class SpyGameUI:
             ui.button('Выйти из игры', icon='exit_to_app', on_click=self.leave_game).classes(
                 'w-full bg-red-500 hover:bg-red-600 text-white mt-4')
 
-    def update_game_screen(self):
+    def update_game_screen(self, room_data=None):
         """Обновляет данные на экране игры."""
+        self._touch_presence()
         if not self.current_room_id:
             self._cancel_timers()
             return
 
-        room_data = self.room_service.get_room(self.current_room_id)
+        if room_data is None:
+            room_data = self.room_service.get_room(self.current_room_id)
         if not room_data:
             self._cancel_timers()
             ui.notify('Комната была удалена', type='negative')
@@ -721,7 +698,7 @@ class SpyGameUI:
         if not self.current_room_id:
             return
 
-        success = self.room_service.finish_game(self.current_room_id)
+        success = self.room_service.finish_game(self.current_room_id, user_id=app.storage.user.get('user_id'))
         if success:
             ui.notify('Игра завершена', type='positive')
             room_data = self.room_service.get_room(self.current_room_id)
@@ -735,7 +712,7 @@ class SpyGameUI:
         if not self.current_room_id:
             return
 
-        success = self.room_service.reset_game(self.current_room_id)
+        success = self.room_service.reset_game(self.current_room_id, user_id=app.storage.user.get('user_id'))
         if success:
             ui.notify('Игра сброшена', type='positive')
             self.show_waiting_room()
@@ -760,6 +737,7 @@ class SpyGameUI:
             self.current_room_id,
             app.storage.user.get('user_id')
         )
+        self.presence.leave('spy', self.current_room_id, app.storage.user.get('user_id'))
 
         if success:
             ui.notify('Вы покинули игру', type='positive')
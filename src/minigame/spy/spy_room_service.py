@@ -1,68 +1,27 @@
-import json
-import os
 import time
-import random
-from nicegui import app
-from src.services.log.log_services import LogService
+from src.services.rng_provider import RngProvider
+from src.minigame.room_store import room_transaction
+from src.minigame.room_service import MinigameRoomService
+from src.models.minigame_room import find_player, find_player_index, find_host_name
 
 
-class SpyRoomService:
+class SpyRoomService(MinigameRoomService):
     """
     Сервис для управления игровыми комнатами в игре Шпион.
     Отвечает за создание/удаление комнат, управление игроками,
     сохранение и загрузку состояний комнат.
     """
 
-    def __init__(self, rooms_file='src/minigame/spy/spy_rooms.json'):
-        self.rooms_file = rooms_file
-        self.log_service = LogService()
-        self.ensure_rooms_file_exists()
-
-    def ensure_rooms_file_exists(self):
-        """Проверяет существование файла с данными о комнатах."""
-        directory = os.path.dirname(self.rooms_file)
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-
-        if not os.path.exists(self.rooms_file):
-            self.save_rooms({})
-
-    def load_rooms(self):
-        """Загружает данные о комнатах из файла."""
-        try:
-            with open(self.rooms_file, 'r', encoding='utf-8') as file:
-                return json.load(file)
-        except Exception as e:
-            self.log_service.add_error_log(
-                error_message=f"Ошибка загрузки данных о комнатах Шпион: {str(e)}",
-                action="SPY_ROOMS_LOAD"
-            )
-            return {}
-
-    def save_rooms(self, rooms_data):
-        """Сохраняет данные о комнатах в файл."""
-        try:
-            directory = os.path.dirname(self.rooms_file)
-            if not os.path.exists(directory):
-                os.makedirs(directory)
-
-            temp_file = f"{self.rooms_file}.tmp"
-            with open(temp_file, 'w', encoding='utf-8') as file:
-                json.dump(rooms_data, file, indent=2, ensure_ascii=False)
-
-            os.replace(temp_file, self.rooms_file)
-            return True
-        except Exception as e:
-            self.log_service.add_error_log(
-                error_message=f"Ошибка сохранения данных о комнатах Шпион: {str(e)}",
-                action="SPY_ROOMS_SAVE"
-            )
-            return False
+    GAME = "spy"
+    ROOM_ID_PREFIX = "spy"
+    ACTION_PREFIX = "SPY"
+    GAME_TITLE = "Шпион"
+    ROOMS_FILE = 'src/minigame/spy/spy_rooms.json'
 
     def create_room(self, host_id, host_name):
         """Создает новую комнату."""
         # Генерируем уникальный ID комнаты
-        room_id = f"spy_{random.randint(1000, 9999)}"
+        room_id = self.allocate_room_id()
         current_time = int(time.time())
 
         # Создаем структуру данных комнаты
@@ -72,6 +31,7 @@ class SpyRoomService:
             "last_activity": current_time,
             "status": "waiting",  # waiting, playing, finished
             "host_id": host_id,
+            "rng_seed": RngProvider.new_seed(),
             "players": [
                 {
                     "id": host_id,
@@ -92,10 +52,8 @@ class SpyRoomService:
             }
         }
 
-        # Сохраняем комнату
-        rooms = self.load_rooms()
-        rooms[room_id] = room_data
-        success = self.save_rooms(rooms)
+        # Сохраняем комнату под её блокировкой
+        success = self.insert_room(room_id, room_data)
 
         if success:
             self.log_service.add_log(
@@ -108,9 +66,14 @@ class SpyRoomService:
 
         return room_id if success else None
 
-    def delete_room(self, room_id):
-        """Удаляет комнату."""
-        rooms = self.load_rooms()
+    @room_transaction
+    def delete_room(self, room_id, user_id=None):
+        """
+        Удаляет комнату.
+
+        :param user_id: Кто удаляет комнату; None - система (фоновые задачи)
+        """
+        rooms = self.load_rooms(room_id)
         if room_id in rooms:
             room_data = rooms.pop(room_id)
             success = self.save_rooms(rooms)
@@ -120,26 +83,17 @@ class SpyRoomService:
                     level="GAME",
                     action="SPY_ROOM_DELETE",
                     message=f"Удалена комната Шпион",
-                    user_id=app.storage.user.get('user_id'),
+                    user_id=user_id,
                     metadata={"room_id": room_id}
                 )
 
             return success
         return False
 
-    def room_exists(self, room_id):
-        """Проверяет существование комнаты."""
-        rooms = self.load_rooms()
-        return room_id in rooms
-
-    def get_room(self, room_id):
-        """Получает данные о комнате."""
-        rooms = self.load_rooms()
-        return rooms.get(room_id)
-
+    @room_transaction
     def add_player(self, room_id, player_id, player_name):
         """Добавляет игрока в комнату."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -147,7 +101,7 @@ class SpyRoomService:
         current_time = int(time.time())
 
         # Проверяем, не находится ли уже игрок в комнате
-        if any(player["id"] == player_id for player in room["players"]):
+        if find_player(room, player_id) is not None:
             return True
 
         # Добавляем игрока
@@ -174,9 +128,10 @@ class SpyRoomService:
 
         return success
 
+    @room_transaction
     def remove_player(self, room_id, player_id):
         """Удаляет игрока из комнаты."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -184,7 +139,7 @@ class SpyRoomService:
         current_time = int(time.time())
 
         # Находим игрока
-        player_index = next((i for i, p in enumerate(room["players"]) if p["id"] == player_id), -1)
+        player_index = find_player_index(room, player_id)
         if player_index == -1:
             return False
 
@@ -219,9 +174,10 @@ class SpyRoomService:
 
         return success
 
+    @room_transaction
     def set_player_ready(self, room_id, player_id, is_ready=True):
         """Устанавливает статус готовности игрока."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -229,7 +185,7 @@ class SpyRoomService:
         current_time = int(time.time())
 
         # Находим игрока
-        player = next((p for p in room["players"] if p["id"] == player_id), None)
+        player = find_player(room, player_id)
         if not player:
             return False
 
@@ -251,9 +207,10 @@ class SpyRoomService:
 
         return success
 
-    def start_game(self, room_id, category, location):
+    @room_transaction
+    def start_game(self, room_id, category, location, decks=None):
         """Начинает игру в комнате."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -265,7 +222,7 @@ class SpyRoomService:
             return False
 
         # Выбираем случайного игрока в качестве Шпиона
-        spy_index = random.randint(0, len(room["players"]) - 1)
+        spy_index = RngProvider.for_room(room).randint(0, len(room["players"]) - 1)
 
         # Обновляем данные игры
         room["status"] = "playing"
@@ -275,6 +232,9 @@ class SpyRoomService:
         room["game_data"]["votes"] = {}
         room["game_data"]["round"] = 1
         room["game_data"]["round_start_time"] = current_time
+        if decks is not None:
+            # Состояние колод контента комнаты (см. ContentDeck)
+            room["decks"] = decks
 
         room["last_activity"] = current_time
 
@@ -302,9 +262,10 @@ class SpyRoomService:
 
         return success
 
-    def start_voting_round(self, room_id):
+    @room_transaction
+    def start_voting_round(self, room_id, user_id=None):
         """Переводит игру в раунд голосования."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -326,15 +287,16 @@ class SpyRoomService:
                 level="GAME",
                 action="SPY_VOTING_START",
                 message=f"Начался раунд голосования",
-                user_id=app.storage.user.get('user_id'),
+                user_id=user_id,
                 metadata={"room_id": room_id}
             )
 
         return success
 
+    @room_transaction
     def add_vote(self, room_id, voter_id, voted_id):
         """Добавляет голос от игрока."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -346,12 +308,12 @@ class SpyRoomService:
             return False
 
         # Находим голосующего игрока
-        voter = next((p for p in room["players"] if p["id"] == voter_id), None)
+        voter = find_player(room, voter_id)
         if not voter:
             return False
 
         # Находим игрока, за которого голосуют
-        voted = next((p for p in room["players"] if p["id"] == voted_id), None)
+        voted = find_player(room, voted_id)
         if not voted:
             return False
 
@@ -422,9 +384,10 @@ class SpyRoomService:
             "spy_caught": spy_caught
         }
 
+    @room_transaction
     def check_spy_guess(self, room_id, spy_id, location_guess):
         """Проверяет догадку Шпиона о локации."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return None
 
@@ -477,9 +440,10 @@ class SpyRoomService:
             "actual_location": actual_location
         }
 
-    def finish_game(self, room_id):
+    @room_transaction
+    def finish_game(self, room_id, user_id=None):
         """Завершает игру."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -500,15 +464,16 @@ class SpyRoomService:
                 level="GAME",
                 action="SPY_GAME_END",
                 message=f"Игра Шпион завершена",
-                user_id=app.storage.user.get('user_id'),
+                user_id=user_id,
                 metadata={"room_id": room_id}
             )
 
         return success
 
-    def reset_game(self, room_id):
+    @room_transaction
+    def reset_game(self, room_id, user_id=None):
         """Сбрасывает игру для повторной игры."""
-        rooms = self.load_rooms()
+        rooms = self.load_rooms(room_id)
         if room_id not in rooms:
             return False
 
@@ -539,28 +504,18 @@ class SpyRoomService:
                 level="GAME",
                 action="SPY_GAME_RESET",
                 message=f"Игра Шпион сброшена",
-                user_id=app.storage.user.get('user_id'),
+                user_id=user_id,
                 metadata={"room_id": room_id}
             )
 
         return success
 
-    def get_rooms_list(self):
-        """Возвращает список доступных комнат."""
-        rooms = self.load_rooms()
-        rooms_list = []
-
-        for room_id, room_data in rooms.items():
-            # Добавляем только комнаты в состоянии ожидания
-            if room_data["status"] == "waiting":
-                rooms_list.append({
-                    "room_id": room_id,
-                    "host_name": next((p["name"] for p in room_data["players"] if p.get("is_host")), "Неизвестно"),
-                    "player_count": len(room_data["players"]),
-                    "created_at": room_data["created_at"]
-                })
-
-        # Сортируем по времени создания (новые первыми)
-        rooms_list.sort(key=lambda x: x["created_at"], reverse=True)
-
-        return rooms_list
\ No newline at end of file
+    @staticmethod
+    def lobby_summary(room_id, room):
+        """Сводка комнаты для списка доступных комнат."""
+        return {
+            "room_id": room_id,
+            "host_name": find_host_name(room),
+            "player_count": len(room["players"]),
+            "created_at": room["created_at"]
+        }
@@ -1,5 +1,6 @@
 # src/models/__init__.py
 
 from .user import User
+from .minigame_room import MinigameRoom, RoomPlayer
 
-__all__ = ['User']
\ No newline at end of file
+__all__ = ['User', 'MinigameRoom', 'RoomPlayer']
\ No newline at end of file
@@ -0,0 +1,378 @@
+import copy
+from collections.abc import MutableMapping, MutableSequence
+
+_MISSING = object()
+
+
+class RoomPlayer(MutableMapping):
+    """
+    Игрок комнаты мини-игры.
+
+    Известные поля хранятся в слотах, остальные (team, score, color и т.д.)
+    - в словаре extra, поэтому преобразование в JSON-словарь и обратно
+    не теряет данных. Доступ по ключу (player["name"], player.get(...))
+    работает как у словаря игрока.
+    """
+
+    FIELDS = ('id', 'name', 'is_host', 'joined_at', 'last_action', 'is_ready')
+    __slots__ = FIELDS + ('extra',)
+
+    def __init__(self, player_id, name=_MISSING, is_host=_MISSING, joined_at=_MISSING,
+                 last_action=_MISSING, is_ready=_MISSING, extra=None):
+        self.id = player_id
+        self.name = name
+        self.is_host = is_host
+        self.joined_at = joined_at
+        self.last_action = last_action
+        self.is_ready = is_ready
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, cls):
+            return data
+        extra = {key: value for key, value in data.items() if key not in cls.FIELDS}
+        return cls(
+            data['id'],
+            data.get('name', _MISSING),
+            data.get('is_host', _MISSING),
+            data.get('joined_at', _MISSING),
+            data.get('last_action', _MISSING),
+            data.get('is_ready', _MISSING),
+            extra or None
+        )
+
+    def to_dict(self):
+        data = {}
+        for field in self.FIELDS:
+            value = getattr(self, field)
+            if value is not _MISSING:
+                data[field] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def copy(self):
+        """Возвращает независимую копию игрока."""
+        return RoomPlayer(self.id, self.name, self.is_host, self.joined_at, self.last_action, self.is_ready,
+                          copy.deepcopy(self.extra) if self.extra else None)
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def get(self, key, default=None):
+        """Чтение поля по имени, как у словаря игрока."""
+        if key in self.FIELDS:
+            value = getattr(self, key)
+            return default if value is _MISSING else value
+        return (self.extra or {}).get(key, default)
+
+    def set(self, key, value):
+        """Запись поля по имени, как у словаря игрока."""
+        if key in self.FIELDS:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if key in self.FIELDS:
+            setattr(self, key, _MISSING)
+        else:
+            del self.extra[key]
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self):
+        for field in self.FIELDS:
+            if getattr(self, field) is not _MISSING:
+                yield field
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"RoomPlayer({self.to_dict()!r})"
+
+
+class RoomPlayers(MutableSequence):
+    """
+    Игроки комнаты в порядке входа, как список room["players"] JSON-формата.
+
+    Представление над словарём id -> RoomPlayer комнаты: изменения через
+    него (append, pop, присваивание room["players"] = [...]) меняют комнату.
+    Добавляемые словари игроков преобразуются в RoomPlayer.
+    """
+
+    __slots__ = ('_players',)
+
+    def __init__(self, players):
+        self._players = players
+
+    def _replace(self, players):
+        items = [RoomPlayer.from_dict(player) for player in players]
+        self._players.clear()
+        for player in items:
+            self._players[player.id] = player
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._players.values())[index]
+        if index == 0 and self._players:
+            return next(iter(self._players.values()))
+        return list(self._players.values())[index]
+
+    def __setitem__(self, index, value):
+        players = list(self._players.values())
+        players[index] = value
+        self._replace(players)
+
+    def __delitem__(self, index):
+        players = list(self._players.values())
+        del players[index]
+        self._replace(players)
+
+    def insert(self, index, value):
+        players = list(self._players.values())
+        players.insert(index, value)
+        self._replace(players)
+
+    def append(self, value):
+        player = RoomPlayer.from_dict(value)
+        self._players[player.id] = player
+
+    def pop(self, index=-1):
+        player = self[index]
+        del self._players[player.id]
+        return player
+
+    def __len__(self):
+        return len(self._players)
+
+    def __iter__(self):
+        return iter(self._players.values())
+
+    def __reversed__(self):
+        return reversed(list(self._players.values()))
+
+    def __eq__(self, other):
+        if isinstance(other, (RoomPlayers, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __deepcopy__(self, memo):
+        return [player.copy() for player in self]
+
+    def __repr__(self):
+        return f"RoomPlayers({list(self)!r})"
+
+
+class MinigameRoom(MutableMapping):
+    """
+    Комната мини-игры (Шпион, Хамелеон, Кодовые имена, Лучшие пары).
+
+    Игроки хранятся в словаре id -> RoomPlayer в порядке входа в комнату,
+    поэтому поиск игрока выполняется за O(1), а индексы игроков
+    (spy_index, chameleon_index) остаются прежними. game_data отличается
+    у разных игр и хранится как есть, остальные поля игры (teams, decks,
+    rng_seed и т.д.) - в словаре extra.
+
+    Доступ по ключу работает как у комнаты в JSON-формате: room["status"],
+    room.get("teams"), room["players"] (RoomPlayers - список игроков).
+    """
+
+    FIELDS = ('room_id', 'created_at', 'last_activity', 'status', 'host_id')
+    __slots__ = FIELDS + ('players', 'game_data', 'extra')
+
+    def __init__(self, room_id, created_at=_MISSING, last_activity=_MISSING, status=_MISSING,
+                 host_id=_MISSING, players=None, game_data=_MISSING, extra=None):
+        self.room_id = room_id
+        self.created_at = created_at
+        self.last_activity = last_activity
+        self.status = status
+        self.host_id = host_id
+        self.players = players if players is not None else {}
+        self.game_data = game_data
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data):
+        """Создаёт комнату из JSON-формата; MinigameRoom возвращается как есть."""
+        if isinstance(data, cls):
+            return data
+        extra = {key: value for key, value in data.items()
+                 if key not in cls.FIELDS and key not in ('players', 'game_data')}
+        players = {}
+        for player_data in data.get('players', []):
+            player = RoomPlayer.from_dict(player_data)
+            players[player.id] = player
+        return cls(
+            data.get('room_id', _MISSING),
+            data.get('created_at', _MISSING),
+            data.get('last_activity', _MISSING),
+            data.get('status', _MISSING),
+            data.get('host_id', _MISSING),
+            players,
+            data.get('game_data', _MISSING),
+            extra or None
+        )
+
+    def to_dict(self):
+        data = {}
+        for field in self.FIELDS:
+            value = getattr(self, field)
+            if value is not _MISSING:
+                data[field] = value
+        data['players'] = [player.to_dict() for player in self.players.values()]
+        if self.game_data is not _MISSING:
+            data['game_data'] = self.game_data
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def copy(self):
+        """Возвращает независимую копию комнаты (замена copy.deepcopy)."""
+        return MinigameRoom(
+            self.room_id, self.created_at, self.last_activity, self.status, self.host_id,
+            {player_id: player.copy() for player_id, player in self.players.items()},
+            copy.deepcopy(self.game_data),
+            copy.deepcopy(self.extra) if self.extra else None
+        )
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def get(self, key, default=None):
+        if key in self.FIELDS:
+            value = getattr(self, key)
+            return default if value is _MISSING else value
+        if key == 'players':
+            return RoomPlayers(self.players)
+        if key == 'game_data':
+            return default if self.game_data is _MISSING else self.game_data
+        return (self.extra or {}).get(key, default)
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self.FIELDS or key == 'game_data':
+            setattr(self, key, value)
+        elif key == 'players':
+            # Словарь заменяется на месте, чтобы выданные RoomPlayers оставались актуальными
+            RoomPlayers(self.players)._replace(value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if key == 'players':
+            self.players.clear()
+        elif key in self.FIELDS or key == 'game_data':
+            setattr(self, key, _MISSING)
+        else:
+            del self.extra[key]
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self):
+        for field in self.FIELDS:
+            if getattr(self, field) is not _MISSING:
+                yield field
+        yield 'players'
+        if self.game_data is not _MISSING:
+            yield 'game_data'
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"MinigameRoom({self.to_dict()!r})"
+
+    def get_player(self, player_id):
+        """Возвращает игрока по ID или None."""
+        return self.players.get(player_id)
+
+    def has_player(self, player_id):
+        return player_id in self.players
+
+    def player_index(self, player_id):
+        """Возвращает порядковый номер игрока или -1."""
+        if player_id not in self.players:
+            return -1
+        return list(self.players).index(player_id)
+
+    def player_at(self, index):
+        """Возвращает игрока по порядковому номеру или None."""
+        if 0 <= index < len(self.players):
+            return list(self.players.values())[index]
+        return None
+
+    def add_player(self, player):
+        player = RoomPlayer.from_dict(player)
+        self.players[player.id] = player
+        return player
+
+    def remove_player(self, player_id):
+        return self.players.pop(player_id, None)
+
+    @property
+    def host(self):
+        return next((player for player in self.players.values() if player.get('is_host')), None)
+
+
+def room_to_dict(room):
+    """Возвращает комнату в JSON-формате (для записи в файл и архив)."""
+    if isinstance(room, MinigameRoom):
+        return room.to_dict()
+    return room
+
+
+def find_player(room, player_id):
+    """
+    Находит игрока комнаты по ID.
+
+    Принимает как MinigameRoom (поиск за O(1)), так и комнату в JSON-формате.
+    """
+    if isinstance(room, MinigameRoom):
+        return room.get_player(player_id)
+    return next((player for player in room["players"] if player["id"] == player_id), None)
+
+
+def find_player_index(room, player_id):
+    """Возвращает порядковый номер игрока в комнате или -1."""
+    if isinstance(room, MinigameRoom):
+        return room.player_index(player_id)
+    return next((i for i, player in enumerate(room["players"]) if player["id"] == player_id), -1)
+
+
+def find_host_name(room, default="Неизвестно"):
+    """Возвращает имя хоста комнаты."""
+    if isinstance(room, MinigameRoom):
+        host = room.host
+        return host.get('name', default) if host else default
+    return next((player["name"] for player in room["players"] if player.get("is_host")), default)
@@ -1,5 +1,7 @@
 # src/services/__init__.py
 
-from src.services.user.user_service import UserService
+from src.lazy_exports import lazy_exports
 
-__all__ = ['UserService']
\ No newline at end of file
+__all__ = ['UserService']
+
+__getattr__ = lazy_exports(__name__, {'UserService': '.user.user_service'})
@@ -0,0 +1,65 @@
+import asyncio
+import contextvars
+
+from nicegui import ui
+
+from src.services.metrics import callable_name
+
+
+class ClientCallback:
+    """
+    Обработчик экрана клиента, который вызывает общий для процесса сервис
+    (индекс лобби, сборщик неактивных комнат).
+
+    При создании запоминаются слот UI, контекст клиента (его запрос и
+    app.storage.user) и цикл событий. call() выполняет обработчик позже в
+    цикле событий, в слоте и контексте подписавшегося клиента, а не в стеке
+    того, кто вызвал изменение: другого клиента или фоновой задачи.
+    Подписка снимается, когда слот удален вместе с экраном.
+    """
+
+    __slots__ = ('callback', 'slot', 'context', 'loop', 'active')
+
+    def __init__(self, callback):
+        """Вызывается из обработчика UI клиента: запоминаются текущий слот и контекст."""
+        self.callback = callback
+        self.slot = ui.context.slot
+        self.context = contextvars.copy_context()
+        try:
+            self.loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.loop = None
+        self.active = True
+
+    def cancel(self):
+        self.active = False
+        self.callback = None
+
+    @property
+    def alive(self):
+        """False, если подписка отменена или экран клиента удален."""
+        if self.active and self.slot.parent.is_deleted:
+            self.cancel()
+        return self.active
+
+    def call(self, *args):
+        """Ставит вызов обработчика в очередь цикла событий (можно вызывать из любого потока)."""
+        if not self.alive:
+            return
+        if self.loop is None or self.loop.is_closed():
+            self._run(*args)
+        else:
+            self.loop.call_soon_threadsafe(self._run, *args)
+
+    def _run(self, *args):
+        if not self.alive:
+            return
+        callback = self.callback
+        try:
+            self.context.run(self._invoke, callback, args)
+        except Exception as e:
+            print(f"❌ Error in client callback {callable_name(callback)}: {e}")
+
+    def _invoke(self, callback, args):
+        with self.slot:
+            callback(*args)
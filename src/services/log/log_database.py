@@ -4,15 +4,30 @@ import os, json
 from typing import Dict, List, Any, Optional, Union
 from datetime import datetime, timedelta
 
+from src.services.metrics import timed_storage
+
 class LogDatabase:
     """SQLite database handler for logs with connection pooling"""
 
+    _instances = {}
+    _instances_lock = threading.Lock()
+
     def __init__(self, db_path='data/logs/logs.db'):
         self.db_path = db_path
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         self.local = threading.local()
+        self.legacy_checked = False
         self.init_db()
 
+    @classmethod
+    def for_path(cls, db_path='data/logs/logs.db'):
+        """Return the process-wide database handler for db_path (schema is created once)."""
+        key = os.path.abspath(db_path)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(db_path)
+            return cls._instances[key]
+
     def get_connection(self):
         if not hasattr(self.local, 'connection'):
             self.local.connection = sqlite3.connect(self.db_path)
@@ -43,6 +58,7 @@ class LogDatabase:
             conn.execute('CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs (timestamp)')
             conn.commit()
 
+    @timed_storage
     def add_log(self, log_entry: Dict[str, Any]) -> bool:
         try:
             with self.get_connection() as conn:
@@ -75,6 +91,7 @@ class LogDatabase:
             print(f"❌ Error adding log to database: {e}")
             return False
 
+    @timed_storage
     def get_logs(self, date=None, level=None, action=None, user_id=None,
                  search_query=None, page=1, page_size=50) -> List[Dict[str, Any]]:
         """Get logs with pagination and various filters"""
@@ -136,6 +153,7 @@ class LogDatabase:
             print(f"❌ Error retrieving logs from database: {e}")
             return []
 
+    @timed_storage
     def count_logs(self, date=None, level=None, action=None, user_id=None, search_query=None) -> int:
         """Count logs matching the filters"""
         try:
@@ -5,6 +5,7 @@ from datetime import datetime
 from nicegui import ui
 from functools import lru_cache
 from src.services.log.log_database import LogDatabase
+from src.services.user.user_directory import UserDirectory
 
 
 class LogService:
@@ -13,7 +14,7 @@ class LogService:
         self.logs_directory = logs_directory
         self.users_file = users_file
         self.user_filter = None
-        self.available_users = {}
+        self.user_directory = UserDirectory.for_file(users_file)
         self.selected_date = datetime.now().date()
         self.level_filter = 'ALL'
         self.action_filter = 'ALL'
@@ -24,16 +25,17 @@ class LogService:
         self.page_size = 50
         self.total_logs = 0
 
-        # Initialize database
-        self.db = LogDatabase(db_path)
+        # Initialize database (shared per path, schema is created once per process)
+        self.db = LogDatabase.for_path(db_path)
 
-        # Ensure directories exist
-        os.makedirs(logs_directory, exist_ok=True)
-        os.makedirs(os.path.dirname(users_file), exist_ok=True)
+        if not self.db.legacy_checked:
+            # Ensure directories exist
+            os.makedirs(logs_directory, exist_ok=True)
+            os.makedirs(os.path.dirname(users_file), exist_ok=True)
 
-        # Load users and migrate legacy data if needed
-        self.load_users()
-        self.migrate_legacy_data_if_needed()
+            # Migrate legacy data if needed
+            self.migrate_legacy_data_if_needed()
+            self.db.legacy_checked = True
 
     def migrate_legacy_data_if_needed(self):
         """Check if we need to migrate from JSON files to SQLite"""
@@ -47,23 +49,14 @@ class LogService:
                     self.db.migrate_from_json(self.logs_directory)
                     print("✅ Migration completed")
 
-    def load_users(self):
-        """Load users from the specified file."""
-        if not os.path.exists(self.users_file) or os.stat(self.users_file).st_size == 0:
-            self.available_users = {}
-            return
-
-        try:
-            with open(self.users_file, 'r', encoding='utf-8') as file:
-                users = json.load(file).get("users", [])
-                self.available_users = {user["id"]: user["username"] for user in users}
-        except (json.JSONDecodeError, FileNotFoundError) as e:
-            print(f"❌ Error loading users: {str(e)}")
-            self.available_users = {}
+    @property
+    def available_users(self):
+        """Map of user ID to username from the shared user directory."""
+        return self.user_directory.usernames()
 
     def get_user_username(self, user_id):
         """Get username for a user ID"""
-        return self.available_users.get(user_id, f"User {user_id}")
+        return self.user_directory.get_username(user_id, f"User {user_id}")
 
     @lru_cache(maxsize=32)
     def get_available_actions(self, date_str=None):
@@ -122,8 +115,6 @@ class LogService:
         # Define function to render a page of logs
         def render_logs_page():
             try:
-                self.load_users()  # Refresh user data
-
                 # Get date as string
                 date_str = self.selected_date.strftime('%Y-%m-%d')
 
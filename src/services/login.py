@@ -4,22 +4,21 @@ import time
 from fastapi import Request
 from fastapi.responses import RedirectResponse
 from starlette.middleware.base import BaseHTTPMiddleware
-from src.services.user.user_service import UserService
 from src.services.auth_service import AuthService
 from src.services.login_security import LoginSecurity
-from src.services.password_service import PasswordService
-from src.services.log.log_services import LogService
+from src.services.metrics import Metrics
 from src.services.registration import Registration
-from src.services.email_service import EmailService
+from src.services.service_container import ServiceContainer
 
 from nicegui import app, ui
 
 UNRESTRICTED_PAGE_ROUTES = {'/login', '/register', '/reset-password', '/confirm-reset'}
 
-log_service = LogService()
-auth_service = AuthService(UserService())
+services = ServiceContainer.get()
+log_service = services.log_service
+auth_service = AuthService(services.user_service)
 login_security = LoginSecurity()
-password_service = PasswordService()
+password_service = services.password_service
 
 # Временное хранилище для кодов восстановления
 # В продакшене заменить на базу данных
@@ -35,7 +34,7 @@ class AuthMiddleware(BaseHTTPMiddleware):
             if token:
                 user_id = auth_service.validate_token(token)
                 if user_id:
-                    user = UserService().get_user_by_id(user_id)
+                    user = services.user_service.get_user_by_id(user_id)
                     if user:
                         app.storage.user.update({
                             'username': user['username'],
@@ -48,7 +47,10 @@ class AuthMiddleware(BaseHTTPMiddleware):
 
         # Перенаправление на логин при необходимости
         if not app.storage.user.get('authenticated', False):
-            if not request.url.path.startswith('/_nicegui') and request.url.path not in UNRESTRICTED_PAGE_ROUTES:
+            # Сборщик метрик входит без сессии: эндпоинт сам проверяет токен
+            metrics_scrape = request.url.path == Metrics.PATH and Metrics.access_configured()
+            if not request.url.path.startswith('/_nicegui') and request.url.path not in UNRESTRICTED_PAGE_ROUTES \
+                    and not metrics_scrape:
                 return RedirectResponse(f'/login?redirect_to={request.url.path}')
         return await call_next(request)
 
@@ -76,7 +78,7 @@ def login(redirect_to: str = '/', error: str = None) -> Optional[RedirectRespons
             return
 
         # Поиск пользователя
-        user = UserService().get_user_by_username(entered_username)
+        user = services.user_service.get_user_by_username(entered_username)
 
         # Проверка пароля
         if user and password_service.verify_password(user['password'], entered_password):
@@ -191,6 +193,9 @@ def logout():
 @ui.page('/reset-password')
 def reset_password():
     """Страница восстановления пароля"""
+    # Почта (smtplib, email.mime) нужна только этой странице и загружается при первом открытии
+    from src.services.email_service import EmailService
+
     reset_container = ui.element('div').classes('w-full max-w-md mx-auto mt-10')
     email_service = EmailService()
 
@@ -202,7 +207,7 @@ def reset_password():
             return
 
         # Поиск пользователя
-        user = UserService().get_user_by_username(username)
+        user = services.user_service.get_user_by_username(username)
 
         if user:
             # Проверяем наличие email
@@ -292,7 +297,7 @@ def confirm_reset(username: str = ''):
         # Хешируем и сохраняем новый пароль
         user_id = reset_data['user_id']
         hashed_password = password_service.hash_password(new_password.value)
-        UserService().edit_user(user_id, {'password': hashed_password})
+        services.user_service.edit_user(user_id, {'password': hashed_password})
 
         # Удаляем использованный код
         del reset_codes[username]
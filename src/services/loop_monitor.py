@@ -0,0 +1,202 @@
+import asyncio
+import functools
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+from nicegui import app
+
+from src.services.log.log_services import LogService
+from src.services.metrics import Metrics
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Модули, которые только передают вызов обработчику экрана
+DISPATCH_FILES = {os.path.join(SRC_DIR, 'services', name) for name in ('room_ticker.py', 'metrics.py')}
+
+
+def short_path(path):
+    """Путь файла для стека: от корня проекта или от site-packages."""
+    root = os.path.dirname(SRC_DIR)
+    if path.startswith(root + os.sep):
+        return os.path.relpath(path, root)
+    head, marker, tail = path.rpartition('site-packages' + os.sep)
+    return tail if marker else os.path.basename(path)
+
+
+def frame_name(frame):
+    code = frame.f_code
+    return getattr(code, 'co_qualname', code.co_name)
+
+
+def attribute_stack(frame):
+    """
+    Определяет по стеку потока цикла, чей колбэк занял цикл.
+
+    :return: (обработчик, место блокировки, строки стека): обработчик -
+        внешний кадр приложения (например, CodenamesGameUI.update_game_screen),
+        место блокировки - внутренний кадр приложения (например,
+        CodenamesRoomService.save_rooms)
+    """
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+
+    own = [f for f in frames if f.f_code.co_filename.startswith(SRC_DIR)]
+    handlers = [f for f in own
+                if f.f_code.co_filename not in DISPATCH_FILES and f.f_code.co_name != '<lambda>']
+    handler = frame_name(handlers[0]) if handlers else (frame_name(frames[-1]) if frames else 'unknown')
+    blocked_in = frame_name(own[-1]) if own else handler
+    stack = [f'{short_path(f.f_code.co_filename)}:{f.f_lineno} {frame_name(f)}'
+             for f in frames[-LoopMonitor.STACK_DEPTH:]]
+    return handler, blocked_in, stack
+
+
+class LoopMonitor:
+    """
+    Монитор задержки цикла событий.
+
+    Проба в цикле засыпает на PROBE_INTERVAL и замеряет, насколько позже
+    она проснулась: это задержка, которую в этот момент получают все
+    клиенты. Сторожевой поток следит за сроком пробуждения пробы и, пока
+    цикл занят, снимает стек потока цикла - не позже, чем задержка дойдёт
+    до того же порога, по которому пишется отчёт. После разблокировки в лог
+    (в фоновом потоке, а не в цикле) пишется запись LOOP_STALL с
+    обработчиком, местом блокировки и стеком.
+    Скользящие перцентили задержки доступны через stats() и на /metrics.
+    """
+
+    PROBE_INTERVAL = 0.1
+    SLOW_THRESHOLD = 0.1  # секунд задержки, после которых колбэк считается медленным
+    WATCHDOG_INTERVAL = 0.02
+    WINDOW = 3000  # замеров в скользящем окне (около 5 минут)
+    STACK_DEPTH = 25
+    RECENT_STALLS = 50
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, threshold=None):
+        self.threshold = threshold or self.SLOW_THRESHOLD
+        self.log_service = LogService()
+        self._lock = threading.Lock()
+        self._lags = deque(maxlen=self.WINDOW)
+        self._lag_sum = 0.0
+        self._lag_count = 0
+        self.stalls = deque(maxlen=self.RECENT_STALLS)
+        # Когда проба должна проснуться (time.monotonic)
+        self._deadline = time.monotonic()
+        self._snapshot = None
+        self._loop_thread = None
+        self._task = None
+        self._watchdog = None
+        self._running = False
+
+    @classmethod
+    def get(cls):
+        """Возвращает общий для процесса монитор."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def _record(self, lag):
+        with self._lock:
+            self._lags.append(lag)
+            self._lag_sum += lag
+            self._lag_count += 1
+
+    def stats(self):
+        """Перцентили задержки цикла по скользящему окну, в миллисекундах."""
+        with self._lock:
+            lags = sorted(self._lags)
+        if not lags:
+            return {'samples': 0}
+
+        def percentile(p):
+            return round(lags[min(len(lags) - 1, int(len(lags) * p))] * 1000, 2)
+
+        return {'samples': len(lags), 'p50_ms': percentile(0.5), 'p90_ms': percentile(0.9),
+                'p99_ms': percentile(0.99), 'max_ms': round(lags[-1] * 1000, 2)}
+
+    def _watch(self):
+        """
+        Сторожевой поток: снимает стек цикла, пока проба опаздывает.
+
+        Стек снимается, когда до порога отчёта остаётся не больше одного
+        интервала сторожа: задержка, дошедшая до порога, к этому моменту
+        уже застала цикл занятым.
+        """
+        while self._running:
+            time.sleep(self.WATCHDOG_INTERVAL)
+            if self._snapshot is not None:
+                continue
+            if time.monotonic() - self._deadline < self.threshold - self.WATCHDOG_INTERVAL:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is not None:
+                self._snapshot = attribute_stack(frame)
+
+    def _report(self, lag):
+        snapshot, self._snapshot = self._snapshot, None
+        handler, blocked_in, stack = snapshot or ('unknown', 'unknown', [])
+        stall = {'at': int(time.time()), 'lag_ms': round(lag * 1000, 1),
+                 'handler': handler, 'blocked_in': blocked_in}
+        self.stalls.append(stall)
+        # Запись в SQLite не должна сама задерживать цикл
+        asyncio.get_running_loop().run_in_executor(None, functools.partial(
+            self.log_service.add_log,
+            level="WARNING",
+            action="LOOP_STALL",
+            message=f"Цикл событий занят {stall['lag_ms']} мс: {handler}",
+            metadata={**stall, 'stack': stack, 'lag': self.stats()}
+        ))
+
+    async def _probe(self):
+        loop = asyncio.get_running_loop()
+        while self._running:
+            expected = loop.time() + self.PROBE_INTERVAL
+            self._deadline = time.monotonic() + self.PROBE_INTERVAL
+            await asyncio.sleep(self.PROBE_INTERVAL)
+            lag = max(0.0, loop.time() - expected)
+            self._record(lag)
+            if lag >= self.threshold:
+                self._report(lag)
+            else:
+                self._snapshot = None
+
+    def collect(self):
+        """Строки /metrics: сводка задержки цикла по скользящему окну."""
+        name = 'detective_event_loop_lag_seconds'
+        with self._lock:
+            lags = sorted(self._lags)
+            total, count = self._lag_sum, self._lag_count
+        lines = [f'# HELP {name} Задержка цикла событий (скользящее окно)', f'# TYPE {name} summary']
+        for quantile in (0.5, 0.9, 0.99):
+            value = lags[min(len(lags) - 1, int(len(lags) * quantile))] if lags else 0.0
+            lines.append(f'{name}{{quantile="{quantile}"}} {value:.6f}')
+        lines.append(f'{name}_sum {total:.6f}')
+        lines.append(f'{name}_count {count}')
+        return lines
+
+    def start(self):
+        """Запускает пробу в цикле событий и сторожевой поток при старте приложения."""
+
+        def _start():
+            self._running = True
+            self._loop_thread = threading.get_ident()
+            self._deadline = time.monotonic() + self.PROBE_INTERVAL
+            self._task = asyncio.get_running_loop().create_task(self._probe())
+            self._watchdog = threading.Thread(target=self._watch, name='loop-monitor', daemon=True)
+            self._watchdog.start()
+
+        def _stop():
+            self._running = False
+
+        Metrics.get().add_collector(self.collect)
+        app.on_startup(_start)
+        app.on_shutdown(_stop)
+        return self
@@ -0,0 +1,267 @@
+import functools
+import hmac
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from fastapi import Request
+from fastapi.responses import PlainTextResponse, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+from nicegui import app
+
+HTTP_METRIC = 'detective_http_request_seconds'
+EVENT_METRIC = 'detective_event_handler_seconds'
+TIMER_METRIC = 'detective_timer_callback_seconds'
+STORAGE_METRIC = 'detective_storage_seconds'
+
+
+def _qualname(handler):
+    return getattr(handler, '__qualname__', type(handler).__name__)
+
+
+def _is_nicegui(handler):
+    return (getattr(handler, '__module__', '') or '').startswith('nicegui')
+
+
+def callable_name(handler, depth=2):
+    """
+    Имя обработчика для меток метрик.
+
+    lambda и обёртки NiceGUI (например, lambda внутри ui.button) заменяются
+    именованным колбэком приложения из их замыкания, например
+    CodenamesGameUI.update_game_screen; если его нет - первым колбэком
+    приложения.
+    """
+    candidates = [handler]
+    frontier = [handler]
+    for _ in range(depth):
+        nested = []
+        for candidate in frontier:
+            for cell in getattr(candidate, '__closure__', None) or ():
+                try:
+                    value = cell.cell_contents
+                except ValueError:
+                    continue
+                if callable(value):
+                    nested.append(value)
+        candidates.extend(nested)
+        frontier = nested
+    for candidate in candidates:
+        if not _is_nicegui(candidate) and getattr(candidate, '__name__', '') != '<lambda>':
+            return _qualname(candidate)
+    for candidate in candidates:
+        if not _is_nicegui(candidate):
+            return _qualname(candidate)
+    return _qualname(handler)
+
+
+class Histogram:
+    """Гистограмма длительностей в формате Prometheus (накопительные корзины)."""
+
+    BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name, description, label_names, buckets=None):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets or self.BUCKETS)
+        # значения меток -> [счётчики корзин..., сумма, количество]
+        self._series = {}
+
+    def observe(self, seconds, labels):
+        key = tuple(str(labels.get(name, '')) for name in self.label_names)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+        for index, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                series[index] += 1
+        series[-2] += seconds
+        series[-1] += 1
+
+    @staticmethod
+    def _escape(value):
+        return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+    @staticmethod
+    def _bound(bound):
+        return 'le="%s"' % bound
+
+    def _labels(self, key, extra=None):
+        pairs = [f'{name}="{self._escape(value)}"' for name, value in zip(self.label_names, key)]
+        if extra:
+            pairs.append(extra)
+        return '{' + ','.join(pairs) + '}' if pairs else ''
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.description}', f'# TYPE {self.name} histogram']
+        for key, series in sorted(self._series.items()):
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{self._labels(key, self._bound(bound))} {count}')
+            lines.append(f'{self.name}_bucket{self._labels(key, self._bound("+Inf"))} {series[-1]}')
+            lines.append(f'{self.name}_sum{self._labels(key)} {series[-2]:.6f}')
+            lines.append(f'{self.name}_count{self._labels(key)} {series[-1]}')
+        return lines
+
+
+class Metrics:
+    """
+    Метрики задержек процесса: HTTP-запросы, обработчики событий NiceGUI,
+    периодические колбэки (ui.timer и тик комнаты) и вызовы хранилища.
+
+    Данные хранятся в памяти процесса и отдаются на /metrics в текстовом
+    формате Prometheus. Эндпоинт требует заголовок "Authorization: Bearer
+    <токен>" с токеном из переменной окружения METRICS_TOKEN. Без токена
+    метрики отдаются только если открытый доступ явно разрешен
+    (METRICS_PUBLIC=1), иначе эндпоинт отвечает 403.
+    """
+
+    PATH = '/metrics'
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self.histogram(HTTP_METRIC, 'Длительность HTTP-запросов', ('method', 'route', 'status'))
+        self.histogram(EVENT_METRIC, 'Длительность обработчиков событий NiceGUI', ('element', 'event', 'handler'))
+        self.histogram(TIMER_METRIC, 'Длительность периодических колбэков UI', ('source', 'callback'))
+        self.histogram(STORAGE_METRIC, 'Длительность вызовов хранилища', ('service', 'method'))
+        self._collectors = []
+        self._installed = False
+
+    @classmethod
+    def get(cls):
+        """Возвращает общий для процесса набор метрик."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def histogram(self, name, description, label_names, buckets=None):
+        """Регистрирует гистограмму (повторная регистрация возвращает существующую)."""
+        with self._lock:
+            if name not in self._histograms:
+                self._histograms[name] = Histogram(name, description, label_names, buckets)
+            return self._histograms[name]
+
+    def add_collector(self, collect):
+        """Добавляет источник метрик: функция () -> строки в формате Prometheus."""
+        self._collectors.append(collect)
+
+    def observe(self, name, seconds, **labels):
+        with self._lock:
+            self._histograms[name].observe(seconds, labels)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Замеряет длительность блока with."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def render(self):
+        """Все метрики в текстовом формате Prometheus."""
+        with self._lock:
+            lines = [line for histogram in self._histograms.values() for line in histogram.render()]
+        for collect in self._collectors:
+            lines.extend(collect())
+        return '\n'.join(lines) + '\n'
+
+    def _instrument_events(self):
+        """Замер обработчиков событий элементов (синхронная часть обработчика)."""
+        from nicegui.element import Element
+
+        original = Element._handle_event
+        metrics = self
+
+        def _handle_event(element, msg):
+            start = time.perf_counter()
+            try:
+                original(element, msg)
+            finally:
+                listener = element._event_listeners.get(msg.get('listener_id'))
+                metrics.observe(EVENT_METRIC, time.perf_counter() - start,
+                                element=type(element).__name__,
+                                event=listener.type if listener else '',
+                                handler=callable_name(listener.handler) if listener else '')
+
+        Element._handle_event = _handle_event
+
+    def _instrument_timers(self):
+        """Замер колбэков ui.timer (включая ожидание корутины)."""
+        from nicegui.timer import Timer
+
+        original = Timer._invoke_callback
+        metrics = self
+
+        async def _invoke_callback(timer):
+            name = callable_name(timer.callback) if timer.callback else ''
+            start = time.perf_counter()
+            try:
+                await original(timer)
+            finally:
+                metrics.observe(TIMER_METRIC, time.perf_counter() - start, source='ui.timer', callback=name)
+
+        Timer._invoke_callback = _invoke_callback
+
+    @staticmethod
+    def access_configured():
+        """Задан ли доступ к /metrics: токен или явно разрешенный открытый доступ."""
+        return bool(os.getenv('METRICS_TOKEN')) or os.getenv('METRICS_PUBLIC') == '1'
+
+    def endpoint(self, request: Request):
+        token = os.getenv('METRICS_TOKEN')
+        if token:
+            authorization = request.headers.get('authorization', '')
+            if not hmac.compare_digest(authorization, f'Bearer {token}'):
+                return Response(status_code=401)
+        elif not self.access_configured():
+            return Response(status_code=403)
+        return PlainTextResponse(self.render(), media_type='text/plain; version=0.0.4; charset=utf-8')
+
+    def start(self):
+        """Подключает middleware, замеры обработчиков и таймеров и эндпоинт /metrics."""
+        if self._installed:
+            return self
+        self._installed = True
+        app.add_middleware(MetricsMiddleware)
+        self._instrument_events()
+        self._instrument_timers()
+        app.add_api_route(self.PATH, self.endpoint, methods=['GET'], include_in_schema=False)
+        return self
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """Длительность HTTP-запросов по шаблону маршрута (а не по полному пути)."""
+
+    async def dispatch(self, request: Request, call_next):
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = request.scope.get('route')
+            Metrics.get().observe(HTTP_METRIC, time.perf_counter() - start, method=request.method,
+                                  route=getattr(route, 'path', '<unmatched>'), status=status)
+
+
+def timed_storage(method):
+    """Декоратор методов хранилища: длительность вызова по классу сервиса и методу."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            Metrics.get().observe(STORAGE_METRIC, time.perf_counter() - start,
+                                  service=type(self).__name__, method=method.__name__)
+
+    return wrapper
@@ -0,0 +1,47 @@
+class PollPolicy:
+    """
+    Адаптивный интервал опроса комнаты.
+
+    Сразу после активности (изменение комнаты или действие игрока) опрос
+    идёт с базовым интервалом в течение нескольких тиков, затем при
+    отсутствии изменений интервал растёт экспоненциально до max_interval.
+    Пока страница скрыта, опрос не чаще hidden_interval. Любая активность
+    возвращает базовый интервал.
+    """
+
+    BACKOFF_FACTOR = 2.0
+    MAX_INTERVAL = 8.0
+    HIDDEN_INTERVAL = 30.0
+    FAST_TICKS = 5  # тиков с базовым интервалом после активности
+
+    def __init__(self, base_interval=1.0, max_interval=None, hidden_interval=None, factor=None):
+        self.base_interval = base_interval
+        self.max_interval = max(max_interval or self.MAX_INTERVAL, base_interval)
+        self.hidden_interval = max(hidden_interval or self.HIDDEN_INTERVAL, base_interval)
+        self.factor = factor or self.BACKOFF_FACTOR
+        self.interval = base_interval
+        self._fast_ticks = self.FAST_TICKS
+
+    def activity(self):
+        """Сбрасывает интервал к базовому (изменения или действие игрока)."""
+        self.interval = self.base_interval
+        self._fast_ticks = self.FAST_TICKS
+
+    def idle(self):
+        """Тик без изменений: после периода быстрого опроса увеличивает интервал."""
+        if self._fast_ticks > 0:
+            self._fast_ticks -= 1
+            return
+        self.interval = min(self.interval * self.factor, self.max_interval)
+
+    def observe(self, changed):
+        if changed:
+            self.activity()
+        else:
+            self.idle()
+
+    def next_interval(self, hidden=False):
+        """Интервал до следующего тика; hidden - страница скрыта у всех подписчиков."""
+        if hidden:
+            return max(self.interval, self.hidden_interval)
+        return self.interval
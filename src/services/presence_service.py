@@ -0,0 +1,180 @@
+import asyncio
+import threading
+import time
+
+from nicegui import app
+
+
+class PresenceService:
+    """
+    Отслеживание присутствия игроков в комнатах мини-игр.
+
+    Присутствие хранится только в памяти процесса и никогда не пишется
+    на диск. Источники: вход игрока в комнату (join), лёгкие сигналы
+    активности из таймеров обновления UI (heartbeat) и события NiceGUI
+    об отключении клиента. Если игрок отключился или перестал присылать
+    сигналы дольше льготного периода, он удаляется из комнаты через
+    зарегистрированный обработчик игры.
+    """
+
+    GRACE_PERIOD = 60  # секунд после отключения до удаления из комнаты
+    HEARTBEAT_TIMEOUT = 120  # секунд без сигналов до удаления из комнаты
+    SWEEP_INTERVAL = 15
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, grace_period=None, heartbeat_timeout=None):
+        self.grace_period = grace_period or self.GRACE_PERIOD
+        self.heartbeat_timeout = heartbeat_timeout or self.HEARTBEAT_TIMEOUT
+        self._lock = threading.RLock()
+        # (игра, ID комнаты) -> {ID игрока: {'clients', 'last_seen', 'disconnected_at'}}
+        self._rooms = {}
+        # ID клиента NiceGUI -> {(игра, ID комнаты, ID игрока)}
+        self._clients = {}
+        self._removers = {}
+        self._task = None
+
+    @classmethod
+    def get(cls):
+        """Возвращает общий для процесса сервис присутствия."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def register_game(self, game, remove_player):
+        """
+        Регистрирует обработчик удаления игрока из комнаты игры.
+
+        :param remove_player: Функция (room_id, player_id) -> bool
+        """
+        self._removers[game] = remove_player
+
+    def join(self, game, room_id, player_id, client_id=None):
+        """Отмечает игрока присутствующим в комнате (в том числе после переподключения)."""
+        now = time.time()
+        with self._lock:
+            players = self._rooms.setdefault((game, room_id), {})
+            entry = players.setdefault(player_id, {'clients': set(), 'last_seen': now, 'disconnected_at': None})
+            entry['last_seen'] = now
+            entry['disconnected_at'] = None
+            if client_id is not None:
+                entry['clients'].add(client_id)
+                self._clients.setdefault(client_id, set()).add((game, room_id, player_id))
+
+    def heartbeat(self, game, room_id, player_id, client_id=None):
+        """Сигнал активности игрока; вызывается из таймеров обновления UI."""
+        with self._lock:
+            entry = self._rooms.get((game, room_id), {}).get(player_id)
+            if entry is None or (client_id is not None and client_id not in entry['clients']):
+                self.join(game, room_id, player_id, client_id)
+                return
+            entry['last_seen'] = time.time()
+            entry['disconnected_at'] = None
+
+    def leave(self, game, room_id, player_id):
+        """Убирает игрока из отслеживания (игрок сам вышел из комнаты)."""
+        with self._lock:
+            players = self._rooms.get((game, room_id))
+            if not players or player_id not in players:
+                return
+            for client_id in players.pop(player_id)['clients']:
+                bindings = self._clients.get(client_id)
+                if bindings:
+                    bindings.discard((game, room_id, player_id))
+                    if not bindings:
+                        del self._clients[client_id]
+            if not players:
+                del self._rooms[(game, room_id)]
+
+    def forget_room(self, game, room_id):
+        """Забывает комнату целиком (комната удалена)."""
+        with self._lock:
+            for player_id in list(self._rooms.get((game, room_id), {})):
+                self.leave(game, room_id, player_id)
+
+    def handle_disconnect(self, client=None):
+        """Обработчик отключения клиента NiceGUI (после таймаута переподключения)."""
+        client_id = getattr(client, 'id', client)
+        now = time.time()
+        with self._lock:
+            for game, room_id, player_id in self._clients.pop(client_id, set()):
+                entry = self._rooms.get((game, room_id), {}).get(player_id)
+                if entry is None:
+                    continue
+                entry['clients'].discard(client_id)
+                if not entry['clients']:
+                    entry['disconnected_at'] = now
+
+    def is_online(self, game, room_id, player_id):
+        with self._lock:
+            entry = self._rooms.get((game, room_id), {}).get(player_id)
+            return entry is not None and entry['disconnected_at'] is None
+
+    def room_presence(self, game, room_id):
+        """Возвращает {ID игрока: {'online', 'last_seen'}} для комнаты."""
+        with self._lock:
+            return {
+                player_id: {'online': entry['disconnected_at'] is None, 'last_seen': int(entry['last_seen'])}
+                for player_id, entry in self._rooms.get((game, room_id), {}).items()
+            }
+
+    def expired(self, now=None):
+        """Возвращает [(игра, ID комнаты, ID игрока)], чей льготный период истёк."""
+        now = now or time.time()
+        result = []
+        with self._lock:
+            for (game, room_id), players in self._rooms.items():
+                for player_id, entry in players.items():
+                    disconnected_at = entry['disconnected_at']
+                    if disconnected_at is not None and now - disconnected_at >= self.grace_period:
+                        result.append((game, room_id, player_id))
+                    elif now - entry['last_seen'] >= self.heartbeat_timeout:
+                        result.append((game, room_id, player_id))
+        return result
+
+    def sweep(self, now=None):
+        """
+        Удаляет из комнат игроков с истёкшим льготным периодом.
+
+        :return: Количество удалённых игроков
+        """
+        removed = 0
+        for game, room_id, player_id in self.expired(now):
+            self.leave(game, room_id, player_id)
+            remove_player = self._removers.get(game)
+            if remove_player is None:
+                continue
+            try:
+                if remove_player(room_id, player_id):
+                    removed += 1
+            except Exception as e:
+                print(f"❌ Error removing absent player {player_id} from {game} room {room_id}: {e}")
+        return removed
+
+    async def _run_forever(self):
+        while True:
+            await asyncio.sleep(self.SWEEP_INTERVAL)
+            self.sweep()
+
+    def start(self):
+        """Подписывается на отключения клиентов и запускает периодическую очистку."""
+        app.on_disconnect(self.handle_disconnect)
+
+        def _start():
+            self._task = asyncio.get_running_loop().create_task(self._run_forever())
+
+        app.on_startup(_start)
+
+    @classmethod
+    def start_default(cls):
+        """Запускает сервис присутствия для всех мини-игр."""
+        from src.services.service_container import ServiceContainer
+
+        services = ServiceContainer.get()
+        presence = cls.get()
+        for game in ('spy', 'chameleon', 'codenames', 'best_pairs'):
+            presence.register_game(game, services.room_service(game).remove_player)
+        presence.start()
+        return presence
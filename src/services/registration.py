@@ -1,17 +1,16 @@
 from nicegui import ui
-from src.services.user.user_service import UserService
-from src.services.log.log_services import LogService
-from src.services.password_service import PasswordService
-import random
+from src.services.rng_provider import RngProvider
+from src.services.service_container import ServiceContainer
 import string
 
 
 class Registration:
-    def __init__(self, user_table=None):
-        # Initialize services
-        self.user_service = UserService()
-        self.log_service = LogService()
-        self.password_service = PasswordService()
+    def __init__(self, user_table=None, services=None):
+        # Shared process-wide services
+        services = services or ServiceContainer.get()
+        self.user_service = services.user_service
+        self.log_service = services.log_service
+        self.password_service = services.password_service
         self.user_table = user_table
         self.avatar_url = self.generate_avatar()
 
@@ -98,7 +97,7 @@ class Registration:
     def generate_avatar(self):
         # Generate a random avatar URL
         chars = string.ascii_uppercase + string.digits
-        avatar_url = f'https://robohash.org/{"".join(random.choice(chars) for _ in range(5))}'
+        avatar_url = f'https://robohash.org/{"".join(RngProvider.get().choice(chars) for _ in range(5))}'
         return avatar_url
 
     def refresh_avatar(self):
@@ -0,0 +1,102 @@
+import os
+import random
+import secrets
+import threading
+
+
+class RngProvider:
+    """
+    Общий источник случайности для сервисов игр.
+
+    По умолчанию используется random.Random с системным зерном. Если задана
+    переменная окружения GAME_RNG_SEED (или вызван RngProvider.seed()),
+    все выборы становятся детерминированными: одинаковая последовательность
+    действий даёт одинаковые комнаты, роли и карточки, что позволяет
+    воспроизводить бенчмарки и нагрузочные прогоны.
+
+    Комната получает собственное зерно при создании (rng_seed) и счётчик
+    использований (rng_step); случайные решения сервиса комнаты берутся из
+    генератора, производного от этой пары, поэтому сессию комнаты можно
+    повторить по сохранённому зерну.
+
+    Для секретов (токены, коды подтверждения) провайдер не используется.
+    """
+
+    _lock = threading.RLock()
+    _seed = None
+    _rng = None
+
+    @classmethod
+    def get(cls):
+        """Возвращает общий для процесса генератор."""
+        if cls._rng is None:
+            with cls._lock:
+                if cls._rng is None:
+                    env_seed = os.environ.get("GAME_RNG_SEED")
+                    cls._seed = int(env_seed) if env_seed not in (None, "") else None
+                    cls._rng = random.Random(cls._seed)
+        return cls._rng
+
+    @classmethod
+    def seed(cls, value):
+        """Задаёт зерно общего генератора (None - системное зерно)."""
+        with cls._lock:
+            cls.get().seed(value)
+            cls._seed = value
+
+    @classmethod
+    def is_seeded(cls):
+        cls.get()
+        return cls._seed is not None
+
+    @classmethod
+    def new_seed(cls):
+        """Выдаёт новое 64-битное зерно из общего генератора."""
+        with cls._lock:
+            return cls.get().getrandbits(64)
+
+    @staticmethod
+    def derive(*parts):
+        """Возвращает генератор, однозначно определяемый набором значений parts."""
+        return random.Random(":".join(str(part) for part in parts))
+
+    @classmethod
+    def for_room(cls, room):
+        """
+        Возвращает генератор для очередного случайного решения в комнате.
+
+        Зерно комнаты создаётся при первом обращении, счётчик rng_step
+        увеличивается на каждый вызов; оба поля сохраняются вместе с комнатой.
+        """
+        if room.get("rng_seed") is None:
+            room["rng_seed"] = cls.new_seed()
+        step = room.get("rng_step", 0)
+        room["rng_step"] = step + 1
+        return cls.derive(room["rng_seed"], step)
+
+    @classmethod
+    def for_room_content(cls, room, purpose):
+        """
+        Возвращает генератор для подготовки контента комнаты перед её изменением
+        (поле Codenames, сетка слов Хамелеона).
+
+        Генератор определяется зерном комнаты, текущим rng_step и назначением
+        purpose; комната не изменяется, поэтому подходит и копия из get_room.
+        """
+        seed = room.get("rng_seed")
+        if seed is None:
+            # Комната создана до появления зерна
+            seed = cls.new_seed()
+        return cls.derive(seed, room.get("rng_step", 0), purpose)
+
+    @classmethod
+    def token_source(cls):
+        """
+        Источник для публичных идентификаторов (ID комнат).
+
+        В детерминированном режиме - общий генератор, иначе - системный
+        криптографический генератор.
+        """
+        if cls.is_seeded():
+            return cls.get()
+        return secrets.SystemRandom()
@@ -0,0 +1,215 @@
+import asyncio
+import gzip
+import json
+import os
+import threading
+import time
+
+from nicegui import app
+
+from src.services.client_callback import ClientCallback
+from src.services.log.log_services import LogService
+from src.models.minigame_room import room_to_dict
+
+
+class RoomReaper:
+    """
+    Фоновая очистка неактивных и завершённых комнат.
+
+    Комнаты удаляются по времени последней активности с отдельным TTL для
+    каждого статуса. Завершённые комнаты перед удалением переносятся в
+    холодный архив (data/archive/<игра>.jsonl.gz). Подписанные UI получают
+    уведомление об удалении комнаты, в которой находится игрок.
+    """
+
+    RUN_INTERVAL = 300  # секунд между проходами
+
+    # TTL в секундах по статусу комнаты; статусы без TTL не удаляются
+    MINIGAME_TTLS = {
+        'waiting': 2 * 3600,
+        'playing': 6 * 3600,
+        'finished': 30 * 60
+    }
+    # Комнаты детектива создаются администратором, поэтому удаляются только завершённые
+    DETECTIVE_TTLS = {
+        'finished': 30 * 24 * 3600
+    }
+
+    # Сообщения для игрока по причине удаления комнаты
+    REASON_MESSAGES = {
+        'finished': 'Игра завершена, комната закрыта',
+        'idle': 'Комната закрыта из-за неактивности'
+    }
+
+    _subscribers = []
+    _subscribers_lock = threading.Lock()
+
+    def __init__(self, archive_directory='data/archive', run_interval=None):
+        self.archive_directory = archive_directory
+        self.run_interval = run_interval or self.RUN_INTERVAL
+        self.log_service = LogService()
+        self.targets = []
+        self.last_report = None
+        self._task = None
+
+    @classmethod
+    def create_default(cls):
+        """Создаёт сборщик для всех хранилищ комнат приложения."""
+        from src.services.service_container import ServiceContainer
+
+        services = ServiceContainer.get()
+        reaper = cls()
+        for name in ('spy', 'chameleon', 'codenames', 'best_pairs'):
+            service = services.room_service(name)
+            # Удаление под блокировками комнат (MinigameRoomService.evict_rooms)
+            reaper.register(name, service.evict_rooms, 'last_activity', cls.MINIGAME_TTLS)
+
+        room_management = services.room_management
+        reaper.register('detective', cls.evict_with(room_management.load, room_management.save),
+                        'last_visited_at', cls.DETECTIVE_TTLS)
+        return reaper
+
+    @staticmethod
+    def evict_with(load, save):
+        """
+        Функция удаления комнат для хранилища с одними load/save (без блокировок комнат).
+
+        :return: Функция evict(is_expired, before_save=None) -> [(room_id, room)]
+        """
+        def evict(is_expired, before_save=None):
+            rooms = load()
+            evicted = [(room_id, room) for room_id, room in rooms.items() if is_expired(room)]
+            if not evicted:
+                return []
+            for room_id, _ in evicted:
+                rooms.pop(room_id)
+            if before_save is not None:
+                before_save(evicted)
+            if not save(rooms):
+                raise RuntimeError("не удалось сохранить комнаты")
+            return evicted
+        return evict
+
+    def register(self, name, evict, activity_key, ttls):
+        """
+        Регистрирует хранилище комнат.
+
+        :param name: Название игры (используется в архиве и уведомлениях)
+        :param evict: Функция evict(is_expired, before_save) -> [(room_id, room)],
+            удаляющая и сохраняющая комнаты, для которых is_expired(room) истинно
+        :param activity_key: Поле с временем последней активности
+        :param ttls: {статус: TTL в секундах}
+        """
+        self.targets.append({
+            'name': name,
+            'evict': evict,
+            'activity_key': activity_key,
+            'ttls': ttls
+        })
+
+    @classmethod
+    def subscribe(cls, callback):
+        """
+        Подписывает текущий экран клиента на удаление комнат: callback(game, room_id, reason).
+
+        Вызывается из обработчика UI: обработчик выполняется в слоте и контексте
+        этого клиента (ClientCallback), а не в фоновой задаче сборщика.
+        Подписки удаленных экранов снимаются при каждой подписке и рассылке.
+
+        :return: ClientCallback с методом cancel()
+        """
+        subscription = ClientCallback(callback)
+        with cls._subscribers_lock:
+            cls._subscribers[:] = [s for s in cls._subscribers if s.alive]
+            cls._subscribers.append(subscription)
+        return subscription
+
+    @classmethod
+    def _notify(cls, game, room_id, reason):
+        with cls._subscribers_lock:
+            cls._subscribers[:] = [s for s in cls._subscribers if s.alive]
+            subscribers = list(cls._subscribers)
+        for subscription in subscribers:
+            subscription.call(game, room_id, reason)
+
+    def _archive(self, name, evicted):
+        """Дописывает удаляемые комнаты в сжатый архив игры."""
+        os.makedirs(self.archive_directory, exist_ok=True)
+        archive_file = os.path.join(self.archive_directory, f"{name}.jsonl.gz")
+        archived_at = int(time.time())
+        with gzip.open(archive_file, 'at', encoding='utf-8') as file:
+            for room_id, room in evicted:
+                file.write(json.dumps({'room_id': room_id, 'archived_at': archived_at, 'room': room_to_dict(room)},
+                                      ensure_ascii=False) + '\n')
+
+    def run_once(self, now=None):
+        """
+        Выполняет один проход очистки.
+
+        :return: Отчёт {игра: {'evicted', 'archived', 'bytes'}}
+        """
+        now = now or int(time.time())
+        report = {}
+
+        for target in self.targets:
+            name = target['name']
+            stats = {'evicted': 0, 'archived': 0, 'bytes': 0}
+            report[name] = stats
+            try:
+                def is_expired(room):
+                    ttl = target['ttls'].get(room.get('status'))
+                    if ttl is None:
+                        return False
+                    last_activity = room.get(target['activity_key']) or room.get('created_at') or 0
+                    return now - last_activity >= ttl
+
+                finished = []
+
+                def archive_finished(evicted):
+                    finished.extend((room_id, room) for room_id, room in evicted
+                                    if room.get('status') == 'finished')
+                    if finished:
+                        self._archive(name, finished)
+
+                evicted = target['evict'](is_expired, before_save=archive_finished)
+                if not evicted:
+                    continue
+
+                stats['evicted'] = len(evicted)
+                stats['archived'] = len(finished)
+                stats['bytes'] = sum(len(json.dumps(room_to_dict(room), ensure_ascii=False).encode('utf-8'))
+                                     for _, room in evicted)
+
+                for room_id, room in evicted:
+                    reason = 'finished' if room.get('status') == 'finished' else 'idle'
+                    self._notify(name, room_id, reason)
+            except Exception as e:
+                self.log_service.add_error_log(
+                    error_message=f"Ошибка очистки комнат {name}: {str(e)}",
+                    action="ROOM_REAPER_RUN",
+                    metadata={"game": name}
+                )
+
+        total_evicted = sum(stats['evicted'] for stats in report.values())
+        total_bytes = sum(stats['bytes'] for stats in report.values())
+        if total_evicted:
+            self.log_service.add_log(
+                level="SYSTEM",
+                action="ROOM_REAPER_RUN",
+                message=f"Удалено комнат: {total_evicted}, освобождено {total_bytes} байт",
+                metadata={"report": report}
+            )
+        self.last_report = report
+        return report
+
+    async def _run_forever(self):
+        while True:
+            self.run_once()
+            await asyncio.sleep(self.run_interval)
+
+    def start(self):
+        """Запускает периодическую очистку после старта приложения."""
+        def _start():
+            self._task = asyncio.get_running_loop().create_task(self._run_forever())
+
+        app.on_startup(_start)
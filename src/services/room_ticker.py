@@ -0,0 +1,262 @@
+import asyncio
+import contextvars
+import threading
+import time
+import weakref
+
+from nicegui import ui
+
+from src.services.metrics import Metrics, TIMER_METRIC, callable_name
+from src.services.poll_policy import PollPolicy
+from src.services.timer_registry import TimerRegistry
+
+
+# Отслеживание видимости страницы и действий игрока в браузере
+PAGE_ACTIVITY_JS = """
+(() => {
+  if (window.__roomTickerHooks) return;
+  window.__roomTickerHooks = true;
+  document.addEventListener('visibilitychange', () => emitEvent('page_visibility', document.hidden));
+  let last = 0;
+  const onAction = () => {
+    const now = Date.now();
+    if (now - last < 1000) return;
+    last = now;
+    emitEvent('page_activity');
+  };
+  ['pointerdown', 'keydown'].forEach(type => document.addEventListener(type, onAction, {capture: true, passive: true}));
+})();
+"""
+
+
+class RoomSubscription:
+    """Подписка экрана клиента на общий тик комнаты."""
+
+    __slots__ = ('callback', 'slot', 'context', 'client', 'active', 'last_delivery', 'wake')
+
+    def __init__(self, callback, slot, context):
+        self.callback = callback
+        self.slot = slot
+        self.context = context
+        self.client = slot.parent.client
+        self.active = True
+        self.last_delivery = time.time()
+        # Событие тика комнаты: отмена будит тик, чтобы он сразу проверил подписчиков
+        self.wake = None
+
+    def cancel(self):
+        """Отписывает экран от тика (совместимо с ui.timer.cancel)."""
+        self.active = False
+        self.callback = None
+        if self.wake is not None:
+            self.wake.set()
+
+    @property
+    def is_deleted(self):
+        return not self.active
+
+    def _deliver(self, room_data):
+        """:return: True, если обработчик был вызван"""
+        if not self.active:
+            return False
+        parent = self.slot.parent
+        if parent.is_deleted:
+            self.cancel()
+            return False
+        if not parent.client.has_socket_connection:
+            return False
+        self.last_delivery = time.time()
+        with Metrics.get().timer(TIMER_METRIC, source='room_tick', callback=callable_name(self.callback)):
+            self.context.run(self._invoke, room_data)
+        return True
+
+    def _invoke(self, room_data):
+        with self.slot:
+            self.callback(room_data)
+
+
+class RoomTicker:
+    """
+    Общий планировщик обновлений экранов комнат.
+
+    Вместо отдельного ui.timer у каждого клиента на каждую активную комнату
+    работает один тик: комната загружается один раз за тик, и один и тот же
+    снимок передаётся всем подписанным клиентам. Нагрузка на хранилище
+    растёт с числом комнат, а не с числом подключённых игроков.
+
+    Интервал тика адаптивный (PollPolicy): быстрый опрос после изменений
+    комнаты, экспоненциальное замедление, пока ничего не меняется, редкий
+    опрос, пока страница скрыта у всех подписчиков. Действие игрока
+    (клик, клавиша) или возврат на страницу сразу возвращают быстрый
+    опрос и запускают внеочередной тик.
+
+    Обработчик вызывается в контексте клиента, который подписался
+    (слот UI и app.storage.user), как и колбэк ui.timer. Снимок общий
+    для всех подписчиков, поэтому изменять его нельзя. Подписки
+    регистрируются в TimerRegistry под типом страницы game.
+    """
+
+    # Поля комнаты, по которым определяется, что комната изменилась
+    CHANGE_FIELDS = ('status', 'last_activity', 'last_visited_at', 'move')
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        # (игра, ID комнаты, интервал) -> {'loader', 'subscribers', 'policy', 'wake', 'task'}
+        self._ticks = {}
+        # клиент NiceGUI -> {'hidden', 'ticks', 'fixed_rate_ticks'}
+        self._pages = weakref.WeakKeyDictionary()
+        self.loads = 0
+        self.fixed_rate_loads = 0.0
+
+    @classmethod
+    def get(cls):
+        """Возвращает общий для процесса планировщик."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def subscribe(self, game, room_id, loader, callback, interval=1.0):
+        """
+        Подписывает текущий экран клиента на тик комнаты.
+
+        Вызывается из обработчика UI: запоминаются текущий слот и контекст клиента.
+
+        :param loader: Функция room_id -> данные комнаты (или None)
+        :param callback: Функция room_data -> None
+        :param interval: Базовый (минимальный) интервал тика в секундах
+        :return: RoomSubscription с методом cancel()
+        """
+        subscription = RoomSubscription(callback, ui.context.slot, contextvars.copy_context())
+        self._watch_page(subscription.client)
+        key = (game, room_id, interval)
+        tick = self._ticks.get(key)
+        if tick is None:
+            tick = {'loader': loader, 'subscribers': [], 'policy': PollPolicy(interval),
+                    'wake': asyncio.Event()}
+            self._ticks[key] = tick
+            tick['task'] = asyncio.get_running_loop().create_task(self._run(key, tick))
+        subscription.wake = tick['wake']
+        tick['subscribers'].append(subscription)
+        return TimerRegistry.get().register(game, subscription, client=subscription.client)
+
+    def _watch_page(self, client):
+        """Подключает к странице клиента отслеживание видимости и действий игрока."""
+        if client in self._pages:
+            return
+        self._pages[client] = {'hidden': False, 'ticks': 0, 'fixed_rate_ticks': 0.0}
+        ui.on('page_visibility', lambda e, client=client: self.set_hidden(client, bool(e.args)))
+        ui.on('page_activity', lambda e, client=client: self.poke(client))
+        if client.has_socket_connection:
+            client.run_javascript(PAGE_ACTIVITY_JS)
+        else:
+            ui.add_head_html(f'<script>{PAGE_ACTIVITY_JS}</script>')
+
+    def set_hidden(self, client, hidden):
+        """Отмечает страницу клиента скрытой или видимой."""
+        page = self._pages.get(client)
+        if page is None:
+            return
+        page['hidden'] = hidden
+        if not hidden:
+            self.poke(client)
+
+    def poke(self, client):
+        """Действие игрока: быстрый опрос и внеочередной тик для его комнат."""
+        for tick in list(self._ticks.values()):
+            if any(s.active and s.client is client for s in tick['subscribers']):
+                tick['policy'].activity()
+                tick['wake'].set()
+
+    def _is_hidden(self, subscription):
+        page = self._pages.get(subscription.client)
+        return page is not None and page['hidden']
+
+    @classmethod
+    def fingerprint(cls, room_data):
+        if not room_data:
+            return None
+        return tuple(room_data.get(field) for field in cls.CHANGE_FIELDS)
+
+    def active_rooms(self):
+        """Возвращает количество комнат с активным тиком."""
+        return len(self._ticks)
+
+    def client_stats(self):
+        """
+        Счётчики тиков по клиентам.
+
+        :return: {ID клиента: {'ticks', 'fixed_rate_ticks', 'saved'}}, где fixed_rate_ticks -
+                 сколько срабатываний дал бы таймер с фиксированным базовым интервалом
+        """
+        stats = {}
+        for client, page in list(self._pages.items()):
+            fixed = int(page['fixed_rate_ticks'])
+            stats[client.id] = {
+                'ticks': page['ticks'],
+                'fixed_rate_ticks': fixed,
+                'saved': round(1 - page['ticks'] / fixed, 3) if fixed else 0.0,
+                'hidden': page['hidden'],
+            }
+        return stats
+
+    async def _run(self, key, tick):
+        game, room_id, interval = key
+        policy = tick['policy']
+        wake = tick['wake']
+        last_fingerprint = None
+        last_tick = time.time()
+        try:
+            while True:
+                # Без подписчиков тик завершается сразу, а не спит интервал скрытой страницы
+                # (all() по пустому списку - True)
+                tick['subscribers'] = [s for s in tick['subscribers'] if s.active]
+                if not tick['subscribers']:
+                    return
+                all_hidden = all(self._is_hidden(s) for s in tick['subscribers'])
+                try:
+                    await asyncio.wait_for(wake.wait(), policy.next_interval(all_hidden))
+                except asyncio.TimeoutError:
+                    pass
+                wake.clear()
+
+                # Проверка и удаление выполняются без await, поэтому подписка,
+                # добавленная в другом обработчике, не теряется
+                tick['subscribers'] = [s for s in tick['subscribers'] if s.active]
+                if not tick['subscribers']:
+                    return
+
+                now = time.time()
+                elapsed = now - last_tick
+                last_tick = now
+                self.fixed_rate_loads += elapsed / interval
+
+                try:
+                    room_data = tick['loader'](room_id)
+                except Exception as e:
+                    print(f"❌ Error loading {game} room {room_id} for tick: {e}")
+                    continue
+                self.loads += 1
+
+                fingerprint = self.fingerprint(room_data)
+                policy.observe(fingerprint != last_fingerprint)
+                last_fingerprint = fingerprint
+
+                for subscription in list(tick['subscribers']):
+                    page = self._pages.get(subscription.client)
+                    if page is not None:
+                        page['fixed_rate_ticks'] += elapsed / interval
+                    # Скрытая страница обновляется редко: только чтобы не потерять присутствие
+                    if page is not None and page['hidden'] and \
+                            now - subscription.last_delivery < policy.hidden_interval:
+                        continue
+                    try:
+                        if subscription._deliver(room_data) and page is not None:
+                            page['ticks'] += 1
+                    except Exception as e:
+                        print(f"❌ Error updating {game} room {room_id} screen: {e}")
+        finally:
+            if self._ticks.get(key) is tick:
+                del self._ticks[key]
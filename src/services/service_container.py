@@ -0,0 +1,98 @@
+import threading
+
+from src.services.log.log_services import LogService
+from src.services.password_service import PasswordService
+from src.services.user.user_service import UserService
+
+
+class ServiceContainer:
+    """
+    Общие для процесса сервисы, не хранящие состояние клиента.
+
+    Раньше каждая страница (и каждый экран внутри неё) создавали свои
+    UserService, LogService, GameRoomManagement и сервисы мини-игр: на один
+    UserUI приходилось три десятка LogService с проверкой схемы SQLite.
+    Контейнер создаёт каждый сервис один раз при первом обращении;
+    экраны получают их через параметр services (по умолчанию - get()).
+
+    Сервисы с состоянием клиента (фильтры просмотра логов, черновики
+    редактирования, таймеры экранов) в контейнер не входят.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._services = {}
+
+    @classmethod
+    def get(cls):
+        """Возвращает общий для процесса контейнер."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def _service(self, name, build):
+        with self._lock:
+            if name not in self._services:
+                self._services[name] = build()
+            return self._services[name]
+
+    @property
+    def log_service(self):
+        """LogService для записи логов (не для просмотра: фильтры у каждого клиента свои)."""
+        return self._service('log_service', LogService)
+
+    @property
+    def password_service(self):
+        return self._service('password_service', PasswordService)
+
+    @property
+    def user_service(self):
+        return self._service('user_service', lambda: UserService(log_service=self.log_service,
+                                                                 password_service=self.password_service))
+
+    @property
+    def game_state_service(self):
+        # Импорт внутри метода: пакет src.game импортирует экраны, которые импортируют контейнер
+        from src.game.game_state_service import GameStateService
+        return self._service('game_state_service', GameStateService)
+
+    @property
+    def room_management(self):
+        from src.game.game_room_management import GameRoomManagement
+        return self._service('room_management', lambda: GameRoomManagement(
+            user_service=self.user_service,
+            game_state_service=self.game_state_service,
+            log_service=self.log_service))
+
+    @staticmethod
+    def _minigame_classes(game):
+        """(сервис данных, сервис комнат) мини-игры."""
+        if game == 'spy':
+            from src.minigame.spy.spy_data_service import SpyDataService
+            from src.minigame.spy.spy_room_service import SpyRoomService
+            return SpyDataService, SpyRoomService
+        if game == 'chameleon':
+            from src.minigame.chameleon.chameleon_data_service import ChameleonDataService
+            from src.minigame.chameleon.chameleon_room_service import ChameleonRoomService
+            return ChameleonDataService, ChameleonRoomService
+        if game == 'codenames':
+            from src.minigame.codenames.codenames_data_service import CodenamesDataService
+            from src.minigame.codenames.codenames_room_service import CodenamesRoomService
+            return CodenamesDataService, CodenamesRoomService
+        if game == 'best_pairs':
+            from src.minigame.best_pairs.best_pairs_data_service import BestPairsDataService
+            from src.minigame.best_pairs.best_pairs_room_service import BestPairsRoomService
+            return BestPairsDataService, BestPairsRoomService
+        raise ValueError(f"Неизвестная мини-игра: {game}")
+
+    def data_service(self, game):
+        """Сервис данных мини-игры (spy, chameleon, codenames, best_pairs)."""
+        return self._service(f'{game}_data', lambda: self._minigame_classes(game)[0]())
+
+    def room_service(self, game):
+        """Сервис комнат мини-игры (spy, chameleon, codenames, best_pairs)."""
+        return self._service(f'{game}_rooms', lambda: self._minigame_classes(game)[1]())
@@ -0,0 +1,142 @@
+import asyncio
+import threading
+
+from nicegui import app, ui
+from nicegui.client import Client
+
+from src.services.log.log_services import LogService
+
+
+class TimerRegistry:
+    """
+    Реестр всех периодических колбэков UI (ui.timer и подписки на тик комнаты).
+
+    Колбэк регистрируется на клиента NiceGUI и тип страницы. На каждое
+    место (страница, имя) у клиента приходится один колбэк: регистрация
+    нового отменяет предыдущий, даже если UI забыл его отменить. При
+    отключении клиента отменяются все его колбэки, а периодическая проверка
+    отменяет колбэки клиентов, которых уже нет, и пишет об этом в лог.
+    """
+
+    SWEEP_INTERVAL = 60
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self.log_service = LogService()
+        self._lock = threading.RLock()
+        # ID клиента -> {(страница, имя): колбэк}
+        self._timers = {}
+        self._task = None
+
+    @classmethod
+    def get(cls):
+        """Возвращает общий для процесса реестр."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def register(self, page, handle, name='update', client=None):
+        """
+        Регистрирует периодический колбэк текущего клиента.
+
+        :param page: Тип страницы (например, "spy" или "detective")
+        :param handle: Объект с методом cancel() и свойством is_deleted
+        :param name: Имя места на странице; предыдущий колбэк на этом месте отменяется
+        :return: handle
+        """
+        client_id = (client or ui.context.client).id
+        with self._lock:
+            timers = self._timers.setdefault(client_id, {})
+            previous = timers.get((page, name))
+            timers[(page, name)] = handle
+        if previous is not None and previous is not handle:
+            self._cancel(previous)
+        return handle
+
+    def timer(self, page, interval, callback, name='update', **kwargs):
+        """Создаёт ui.timer и регистрирует его."""
+        return self.register(page, ui.timer(interval, callback, **kwargs), name)
+
+    @staticmethod
+    def _cancel(handle):
+        try:
+            handle.cancel()
+        except Exception as e:
+            print(f"❌ Error cancelling timer: {e}")
+
+    @staticmethod
+    def is_alive(handle):
+        return not handle.is_deleted
+
+    def cancel_client(self, client_id):
+        """
+        Отменяет все колбэки клиента.
+
+        :return: Количество отменённых колбэков
+        """
+        with self._lock:
+            timers = self._timers.pop(client_id, {})
+        alive = [handle for handle in timers.values() if self.is_alive(handle)]
+        for handle in alive:
+            self._cancel(handle)
+        return len(alive)
+
+    def handle_disconnect(self, client=None):
+        """Обработчик отключения клиента NiceGUI."""
+        self.cancel_client(getattr(client, 'id', client))
+
+    def _prune(self):
+        with self._lock:
+            for client_id in list(self._timers):
+                timers = {key: handle for key, handle in self._timers[client_id].items() if self.is_alive(handle)}
+                if timers:
+                    self._timers[client_id] = timers
+                else:
+                    del self._timers[client_id]
+
+    def live_counts(self):
+        """Возвращает {тип страницы: количество живых колбэков}."""
+        self._prune()
+        counts = {}
+        with self._lock:
+            for timers in self._timers.values():
+                for page, _ in timers:
+                    counts[page] = counts.get(page, 0) + 1
+        return counts
+
+    def sweep(self):
+        """
+        Отменяет колбэки клиентов, которых больше нет.
+
+        :return: Количество отменённых колбэков
+        """
+        self._prune()
+        with self._lock:
+            lost = [client_id for client_id in self._timers if client_id not in Client.instances]
+        cancelled = sum(self.cancel_client(client_id) for client_id in lost)
+        if cancelled:
+            self.log_service.add_log(
+                level="WARNING",
+                action="TIMER_LEAK",
+                message=f"Отменено таймеров отключённых клиентов: {cancelled}",
+                metadata={"clients": len(lost), "live": self.live_counts()}
+            )
+        return cancelled
+
+    async def _run_forever(self):
+        while True:
+            await asyncio.sleep(self.SWEEP_INTERVAL)
+            self.sweep()
+
+    def start(self):
+        """Подписывается на отключения клиентов и запускает периодическую проверку."""
+        app.on_disconnect(self.handle_disconnect)
+
+        def _start():
+            self._task = asyncio.get_running_loop().create_task(self._run_forever())
+
+        app.on_startup(_start)
+        return self
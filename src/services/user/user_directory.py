@@ -0,0 +1,121 @@
+import copy
+import json
+import os
+import threading
+
+
+class UserDirectory:
+    """
+    Общий для процесса справочник пользователей.
+
+    Файл пользователей читается один раз, дальше справочник обновляется
+    из UserService.write_data() при каждой записи. Поиск имени по ID и
+    ID по имени выполняется в памяти без обращения к диску.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, users_file):
+        self.users_file = users_file
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._users = {}
+        self._ids_by_username = {}
+
+    @classmethod
+    def for_file(cls, users_file='data/data.json'):
+        """Возвращает общий справочник для указанного файла пользователей."""
+        key = os.path.abspath(users_file)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(users_file)
+            return cls._instances[key]
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        users = []
+        try:
+            if os.path.exists(self.users_file) and os.stat(self.users_file).st_size > 0:
+                with open(self.users_file, 'r', encoding='utf-8') as file:
+                    users = json.load(file).get("users", [])
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"❌ Error loading users for directory: {str(e)}")
+        self.replace(users)
+
+    def replace(self, users):
+        """Заменяет содержимое справочника списком пользователей из файла."""
+        by_id = {}
+        ids_by_username = {}
+        for user in users:
+            entry = copy.deepcopy(user)
+            by_id[entry['id']] = entry
+            ids_by_username[entry.get('username')] = entry['id']
+
+        with self._lock:
+            self._users = by_id
+            self._ids_by_username = ids_by_username
+            self._loaded = True
+
+    def invalidate(self):
+        """Сбрасывает справочник; следующее обращение перечитает файл."""
+        with self._lock:
+            self._loaded = False
+
+    def get(self, user_id):
+        """Возвращает копию данных пользователя или None."""
+        self._ensure_loaded()
+        user = self._users.get(user_id)
+        return copy.deepcopy(user) if user else None
+
+    def get_by_username(self, username):
+        """Возвращает копию данных пользователя по логину или None."""
+        self._ensure_loaded()
+        return self.get(self._ids_by_username.get(username))
+
+    def username_exists(self, username):
+        self._ensure_loaded()
+        return username in self._ids_by_username
+
+    def get_username(self, user_id, default=None):
+        """Возвращает логин пользователя по ID."""
+        self._ensure_loaded()
+        user = self._users.get(user_id)
+        if user is None:
+            return default
+        return user.get('username', default)
+
+    def get_usernames(self, user_ids, default=None):
+        """Возвращает {user_id: логин} для набора ID."""
+        return {user_id: self.get_username(user_id, default) for user_id in user_ids}
+
+    def get_display_name(self, user_id, default=None):
+        """Возвращает отображаемое имя: имя и фамилию, либо логин."""
+        self._ensure_loaded()
+        user = self._users.get(user_id)
+        if user is None:
+            return default
+        full_name = f"{user.get('name', '')} {user.get('surname', '')}".strip()
+        return full_name or user.get('username', default)
+
+    def get_avatar(self, user_id, default=None):
+        self._ensure_loaded()
+        user = self._users.get(user_id)
+        if user is None:
+            return default
+        return user.get('avatar') or default
+
+    def usernames(self):
+        """Возвращает {user_id: логин} для всех пользователей."""
+        self._ensure_loaded()
+        return {user_id: user.get('username') for user_id, user in self._users.items()}
+
+    def all_users(self):
+        """Возвращает копии данных всех пользователей."""
+        self._ensure_loaded()
+        return [copy.deepcopy(user) for user in self._users.values()]
+
+    def __len__(self):
+        self._ensure_loaded()
+        return len(self._users)
@@ -1,23 +1,21 @@
 from nicegui import ui
-import random
 import string
 from datetime import datetime
 
-from src.services.user.user_service import UserService
-from src.services.log.log_services import LogService
-from src.services.password_service import PasswordService
-from src.game.game_room_management import GameRoomManagement
+from src.services.rng_provider import RngProvider
+from src.services.service_container import ServiceContainer
 
 
 class UserProfile:
     """Улучшенный профиль пользователя с расширенной функциональностью и современным интерфейсом."""
 
-    def __init__(self):
-        # Инициализация сервисов
-        self.user_service = UserService()
-        self.log_service = LogService()
-        self.password_service = PasswordService()
-        self.game_room_management = GameRoomManagement()
+    def __init__(self, services=None):
+        # Общие сервисы процесса
+        services = services or ServiceContainer.get()
+        self.user_service = services.user_service
+        self.log_service = services.log_service
+        self.password_service = services.password_service
+        self.game_room_management = services.room_management
 
         # Данные пользователя
         self.current_user_id = None
@@ -359,7 +357,7 @@ class UserProfile:
     def generate_new_avatar(self):
         """Генерирует новый случайный аватар и обновляет предпросмотр."""
         chars = string.ascii_uppercase + string.digits
-        new_avatar_url = f'https://robohash.org/{"".join(random.choice(chars) for _ in range(5))}'
+        new_avatar_url = f'https://robohash.org/{"".join(RngProvider.get().choice(chars) for _ in range(5))}'
 
         # Обновляем URL аватара в форме
         if 'avatar' in self.form_elements and hasattr(self.form_elements['avatar']['edit'], 'value'):
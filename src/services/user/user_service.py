@@ -3,15 +3,20 @@ import os
 import uuid
 from src.models.user import User
 from src.services.log.log_services import LogService
+from src.services.metrics import timed_storage
 from src.services.password_service import PasswordService
+from src.services.user.user_directory import UserDirectory
 
 
 class UserService:
-    def __init__(self, file_name='data/data.json'):
+    def __init__(self, file_name='data/data.json', log_service=None, password_service=None):
         self.file_name = file_name
-        self.log_service = LogService()
-        self.password_service = PasswordService()
+        self.log_service = log_service or LogService()
+        self.password_service = password_service or PasswordService()
+        # Общий справочник пользователей, обновляется при каждой записи
+        self.directory = UserDirectory.for_file(file_name)
 
+    @timed_storage
     def load_data(self):
         directory = os.path.dirname(self.file_name)
         if not os.path.exists(directory):
@@ -31,6 +36,7 @@ class UserService:
             )
             return []
 
+    @timed_storage
     def write_data(self, users):
         """Записывает данные пользователей в файл."""
         try:
@@ -60,8 +66,10 @@ class UserService:
 
             # Проверяем, что файл действительно обновлен
             if not os.path.exists(self.file_name) or os.path.getsize(self.file_name) == 0:
+                self.directory.invalidate()
                 return False
 
+            self.directory.replace(users)
             return True
 
         except Exception as e:
@@ -93,6 +101,7 @@ class UserService:
         # Хешируем пароль перед сохранением
         hashed_password = self.password_service.hash_password(password)
 
+        # ID пользователя - не игровая случайность: не зависит от GAME_RNG_SEED
         user_id = str(uuid.uuid4())
         new_user = User(user_id, name, surname, username, hashed_password, avatar, email).to_dict()
         users.append(new_user)
@@ -158,22 +167,13 @@ class UserService:
             return False
 
     def is_username_available(self, username):
-        users = self.load_data()
-        return not any(user['username'] == username for user in users)
+        return not self.directory.username_exists(username)
 
     def get_user_by_username(self, username):
-        users = self.load_data()
-        for user in users:
-            if user['username'] == username:
-                return user
-        return None
+        return self.directory.get_by_username(username)
 
     def get_user_by_id(self, user_id):
-        users = self.load_data()
-        for user in users:
-            if user['id'] == user_id:
-                return user
-        return None
+        return self.directory.get(user_id)
 
     def migrate_passwords(self):
         """Мигрирует все пароли из открытого текста в хешированный формат"""
@@ -1,6 +1,7 @@
 # src/ui/__init__.py
 
-from .user_ui import UserUI
-from .components.user_table import UserTable
+from src.lazy_exports import lazy_exports
 
-__all__ = ['UserUI', 'UserTable']
\ No newline at end of file
+__all__ = ['UserUI', 'UserTable']
+
+__getattr__ = lazy_exports(__name__, {'UserUI': '.user_ui', 'UserTable': '.components.user_table'})
@@ -1,5 +1,6 @@
 # src/ui/components/__init__.py
 
 from .user_table import UserTable
+from .lazy_tab_panels import LazyTabPanels
 
-__all__ = ['UserTable']
\ No newline at end of file
+__all__ = ['UserTable', 'LazyTabPanels']
\ No newline at end of file
@@ -0,0 +1,53 @@
+from nicegui import ui
+
+
+class LazyTabPanels:
+    """
+    Панели вкладок, содержимое которых строится при первом открытии вкладки.
+
+    При загрузке страницы строится только видимая вкладка. Вкладки,
+    добавленные с keep_alive=False, очищаются при переключении на другую
+    вкладку (вместе с их таймерами и подписками) и строятся заново при
+    следующем открытии.
+    """
+
+    def __init__(self, tabs, value):
+        self.panels = ui.tab_panels(tabs, value=value, on_change=lambda e: self.show(e.value))
+        # имя вкладки -> {'panel', 'build', 'keep_alive', 'built'}
+        self._tabs = {}
+
+    @staticmethod
+    def tab_name(value):
+        return value.props['name'] if isinstance(value, (ui.tab, ui.tab_panel)) else value
+
+    def add(self, tab, build, keep_alive=True):
+        """
+        Добавляет панель вкладки.
+
+        :param tab: ui.tab или имя вкладки
+        :param build: Функция без аргументов, строящая содержимое панели
+        :param keep_alive: Сохранять содержимое, когда вкладка скрыта
+        """
+        with self.panels:
+            panel = ui.tab_panel(tab)
+        self._tabs[self.tab_name(tab)] = {'panel': panel, 'build': build, 'keep_alive': keep_alive, 'built': False}
+        if self.tab_name(self.panels.value) == self.tab_name(tab):
+            self._build(self._tabs[self.tab_name(tab)])
+        return panel
+
+    @staticmethod
+    def _build(entry):
+        entry['built'] = True
+        with entry['panel']:
+            entry['build']()
+
+    def show(self, value):
+        """Строит содержимое открытой вкладки и очищает скрытые вкладки без keep_alive."""
+        name = self.tab_name(value)
+        for tab_name, entry in self._tabs.items():
+            if tab_name != name and entry['built'] and not entry['keep_alive']:
+                entry['panel'].clear()
+                entry['built'] = False
+        entry = self._tabs.get(name)
+        if entry is not None and not entry['built']:
+            self._build(entry)
@@ -1,14 +1,15 @@
 from nicegui import ui, events
 from src.services.user.user_service import UserService
-from src.services.password_service import PasswordService
-from src.services.log.log_services import LogService
+from src.services.service_container import ServiceContainer
 
 
 class UserTable:
-    def __init__(self, user_service: UserService):
+    def __init__(self, user_service: UserService, services=None):
+        services = services or ServiceContainer.get()
         self.user_service = user_service
-        self.password_service = PasswordService()
-        self.log_service = LogService()
+        self.password_service = services.password_service
+        self.log_service = services.log_service
+        self.table = None
 
     def init_table(self):
         self.columns = [
@@ -72,7 +73,11 @@ class UserTable:
         self.update_table()
 
     def update_table(self):
-        users = self.user_service.load_data()
+        # Таблица строится при открытии вкладки и может быть ещё не создана
+        if self.table is None:
+            return
+        # Данные берутся из справочника пользователей, без чтения файла
+        users = self.user_service.directory.all_users()
         self.table.rows.clear()
         for user in users:
             self.table.rows.append({
@@ -1,33 +1,47 @@
+from functools import cached_property
+
 from nicegui import app, ui
 
-from src.game.game_room_management import GameRoomManagement
-from src.game.admin_game_ui import AdminGameUI
-from src.game.game_room_management_ui import GameRoomManagementUI
 from src.game.game_ui import GameUI
-from src.minigame.mini_game_ui import MiniGamesUI
 from src.services.log.log_services import LogService
 from src.services.user.user_profile import UserProfile
 from src.ui.components.user_table import UserTable
+from src.ui.components.lazy_tab_panels import LazyTabPanels
 from src.services.registration import Registration
-from src.services.user.user_service import UserService
+from src.services.service_container import ServiceContainer
 
 
 class UserUI:
-    def __init__(self):
-        # Initialize user service and user table
-        self.user_service = UserService()
-        self.user_table = UserTable(self.user_service)
-        self.user_profile = UserProfile()
-        self.admin_game_ui = AdminGameUI()
-        self.game_ui = GameUI()
-        self.log_services = LogService()
-        self.game_room_management = GameRoomManagement(game_ui=self.game_ui)
-        self.game_room_management_ui = GameRoomManagementUI()
-        self.mini_games_ui = MiniGamesUI()
+    def __init__(self, services=None):
+        # Общие сервисы процесса; экраны страницы получают их же
+        self.services = services or ServiceContainer.get()
+        self.user_service = self.services.user_service
+        self.user_table = UserTable(self.user_service, self.services)
+        self.user_profile = UserProfile(self.services)
+        self.game_ui = GameUI(self.services)
+        self.log_services = self.services.log_service
+        self.game_room_management = self.services.room_management
         self.game_data = {}  # Store game data at class level
         self.switch_dark_mode(app.storage.user.get('dark_mode'))
         self.setup_ui()
 
+    # Экраны администратора и мини-игр (и их модули) загружаются при первом открытии вкладки
+
+    @cached_property
+    def admin_game_ui(self):
+        from src.game.admin_game_ui import AdminGameUI
+        return AdminGameUI(self.services)
+
+    @cached_property
+    def game_room_management_ui(self):
+        from src.game.game_room_management_ui import GameRoomManagementUI
+        return GameRoomManagementUI(self.services)
+
+    @cached_property
+    def mini_games_ui(self):
+        from src.minigame.mini_game_ui import MiniGamesUI
+        return MiniGamesUI(self.services)
+
     def setup_ui(self):
         # Добавить фоновое изображение для всего приложения
         ui.element('div').style(
@@ -57,26 +71,21 @@ class UserUI:
                     'text-xl font-semibold text-primary text-center')
                 ui.button(on_click=self.logout, icon='logout').props('outline round')
 
-            # Define content for each tab
-            with ui.tab_panels(tabs, value=six).classes('max-w-6xl flex justify-center items-center'):
-                if app.storage.user.get('username') == 'lucky_illia':
-                    with ui.tab_panel(one):
-                        reg = Registration(self.user_table)
-                    with ui.tab_panel(two):
-                        self.user_table.init_table()
-                    with ui.tab_panel(three):
-                        self.log_services.log_interface()
-                    with ui.tab_panel(four):
-                        self.admin_game_ui.create_ui()
-                    with ui.tab_panel(five):
-                        self.game_room_management_ui.create_ui()
-
-                with ui.tab_panel(six):
-                    self.game_ui.show_game_interface
-                with ui.tab_panel(eight):
-                    self.mini_games_ui.create_mini_games_ui()
-                with ui.tab_panel(seven):
-                    self.user_profile.show_profile_ui(app.storage.user.get('user_id'))
+            # Содержимое вкладки строится при первом открытии; тяжёлые списки
+            # администратора очищаются, когда вкладка скрыта
+            panels = LazyTabPanels(tabs, value=six)
+            panels.panels.classes('max-w-6xl flex justify-center items-center')
+            if app.storage.user.get('username') == 'lucky_illia':
+                panels.add(one, lambda: Registration(self.user_table, self.services))
+                panels.add(two, self.user_table.init_table, keep_alive=False)
+                # Просмотр логов хранит фильтры и страницу, поэтому у вкладки свой LogService
+                panels.add(three, lambda: LogService().log_interface(), keep_alive=False)
+                panels.add(four, lambda: self.admin_game_ui.create_ui())
+                panels.add(five, lambda: self.game_room_management_ui.create_ui(), keep_alive=False)
+
+            panels.add(six, lambda: self.game_ui.show_game_interface)
+            panels.add(eight, lambda: self.mini_games_ui.create_mini_games_ui())
+            panels.add(seven, lambda: self.user_profile.show_profile_ui(app.storage.user.get('user_id')))
             self.check_and_request_email()
 
 